@@ -3,6 +3,7 @@ import traceback
 import json
 from typing import List, Optional, Dict, Any
 
+import torch
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -10,6 +11,7 @@ from google import genai
 from pydantic import BaseModel, Field
 
 from core.config.config import settings
+from backend.config.config import settings as backend_settings
 from core.utils.minio_client import MinIOClient
 from core.vector_store.qdrant_client import QdrantClient
 from core.utils.gemini_utils import load_gemini_client
@@ -37,6 +39,7 @@ from core.agents.scorer_agent import ScorerOutput
 
 from backend.routers.v1.base import router as api_v1_router 
 from backend.database.database import create_db_and_tables
+from backend.jobs import IndexJobManager
 
 # Global constants 
 ACTION_VOCABULARY_FILE_PATH = "./data/action_vocabulary.json"
@@ -64,6 +67,7 @@ app.add_middleware(
 app.state.models = {}
 app.state.clients = {}
 app.state.retrievers = {}
+app.state.index_job_manager = None
 
 class PipelineInput(BaseModel):
     rubric_question: str = Field(..., min_length=5, description="The rubric question to assess.")
@@ -91,6 +95,11 @@ async def startup_event():
     
     create_db_and_tables()
 
+    # Process-wide PyTorch thread budget, shared by all the models loaded below
+    if settings.inference.torch_num_threads > 0:
+        torch.set_num_threads(settings.inference.torch_num_threads)
+        print(f"PyTorch intra-op threads: {settings.inference.torch_num_threads}")
+
     try:
         # General Clients
         app.state.clients["minio"] = MinIOClient()
@@ -103,13 +112,23 @@ async def startup_event():
         app.state.clients["gemini"] = load_gemini_client() # Your existing function
 
         # Models for Keyframe Processing
-        app.state.models["resnet_model"], app.state.models["resnet_transform"] = get_resnet_feature_extractor()
-        app.state.models["clip_model"], app.state.models["clip_processor"] = load_clip_model_and_processor()
+        if backend_settings.keyframe_extraction.embedding_method == "resnet":
+            app.state.models["resnet_model"], app.state.models["resnet_transform"] = get_resnet_feature_extractor(
+                backend=settings.inference.backend
+            )
+        else:
+            # Keyframes are clustered with the CLIP embeddings, so ResNet does not need to stay resident
+            app.state.models["resnet_model"], app.state.models["resnet_transform"] = None, None
+        app.state.models["clip_model"], app.state.models["clip_processor"] = load_clip_model_and_processor(
+            backend=settings.inference.backend
+        )
         app.state.models["clap_model"], app.state.models["clap_processor"] = load_clap_model_and_processor()
         app.state.models["whisper_model"] = load_whisper_model()
         app.state.models["diarization_model"] = load_diarization_model()
         app.state.models["audio_emotion_classification_model"] = load_audio_emotion_classification_model()
-        app.state.models["sentence_transformer"] = load_sentence_transformer_model()
+        app.state.models["sentence_transformer"] = load_sentence_transformer_model(
+            backend=settings.inference.backend
+        )
 
         # Retrievers (depend on Qdrant client)
         app.state.retrievers["video_keyframe"] = VideoKeyframeRetriever(
@@ -119,6 +138,10 @@ async def startup_event():
             client=app.state.clients["qdrant"]
         )
 
+        # Background workers for video indexing jobs (depend on the models, clients and retrievers)
+        app.state.index_job_manager = IndexJobManager(app_state=app.state)
+        app.state.index_job_manager.fail_interrupted_jobs()
+
         global global_action_vocabulary
         try:
             if os.path.exists(ACTION_VOCABULARY_FILE_PATH):
@@ -140,6 +163,14 @@ async def startup_event():
         app.state.action_vocabulary = None 
         traceback.print_exc()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Stop the index job workers when the application shuts down.
+    """
+    if app.state.index_job_manager is not None:
+        app.state.index_job_manager.shutdown(wait=False)
+
 app.include_router(api_v1_router, prefix="/api/v1", tags=["V1"])
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+import os
+import glob
+import pickle
+import shutil
+from typing import Any, Optional
+
+from backend.config.config import settings
+
+SOURCE_VIDEO_BASENAME = "source_video"
+_CHECKPOINT_SUFFIX = ".pkl"
+
+class IndexingCheckpoint:
+    """
+    Per-job store of the outputs of completed indexing stages (selected keyframes, captions, embeddings,
+    transcript/diarization segments, upload receipts, ...) together with the uploaded source video,
+    so that a failed index job can be resumed from the first incomplete stage. Checkpoints are keyed by job ID,
+    not video ID: concurrent jobs for the same video ID never share (or clear) each other's checkpoint.
+
+    Layout: `<checkpoint_dir>/<job_id>/<key>.pkl` and `<checkpoint_dir>/<job_id>/source_video<ext>`.
+    """
+    def __init__(
+        self,
+        job_id: str,
+        checkpoint_dir: str = settings.index_jobs.checkpoint_dir
+    ):
+        """
+        Args:
+            job_id (str): The index job ID the checkpoint belongs to.
+            checkpoint_dir (str): Root directory of the per-job checkpoints.
+        """
+        self.job_id = job_id
+        self.job_checkpoint_dir = os.path.join(checkpoint_dir, job_id)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.job_checkpoint_dir, f"{key}{_CHECKPOINT_SUFFIX}")
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self._get_path(key))
+
+    def load(self, key: str) -> Any:
+        with open(self._get_path(key), "rb") as f:
+            return pickle.load(f)
+
+    def save(self, key: str, value: Any):
+        """Persists a stage output atomically (a crash mid-write never leaves a truncated checkpoint)."""
+        os.makedirs(self.job_checkpoint_dir, exist_ok=True)
+        path = self._get_path(key)
+        temp_path = f"{path}.tmp"
+
+        with open(temp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def store_file(self, file_path: str, basename: str) -> str:
+        """Moves a file (e.g. the uploaded video or the extracted audio) into the checkpoint and returns its new path."""
+        os.makedirs(self.job_checkpoint_dir, exist_ok=True)
+        stored_path = os.path.join(self.job_checkpoint_dir, basename + os.path.splitext(file_path)[1])
+
+        if os.path.abspath(file_path) != os.path.abspath(stored_path):
+            shutil.move(file_path, stored_path)
+
+        return stored_path
+
+    def store_source_video(self, video_file_path: str) -> str:
+        return self.store_file(video_file_path, SOURCE_VIDEO_BASENAME)
+
+    def get_source_video_path(self) -> Optional[str]:
+        """Returns the path of the stored source video, or None if the checkpoint has none (i.e. cannot be resumed)."""
+        paths = glob.glob(os.path.join(self.job_checkpoint_dir, f"{SOURCE_VIDEO_BASENAME}.*"))
+        return paths[0] if paths else None
+
+    def clear(self):
+        if os.path.exists(self.job_checkpoint_dir):
+            shutil.rmtree(self.job_checkpoint_dir, ignore_errors=True)
@@ -1,9 +1,40 @@
-from pydantic_settings import BaseSettings 
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict 
 
 class DatabaseSettings(BaseSettings):
     url: str = "sqlite:///./osce_assessment_app_backend.db"
 
+class IndexJobSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="INDEX_JOBS_")
+
+    max_workers: int = 2 # Number of videos that can be indexed in parallel
+    # Per-job stage outputs of unfinished jobs (removed once a job completes; failed jobs resume from here)
+    checkpoint_dir: str = "./data/index_checkpoints"
+    # Decoded audio of the videos being indexed, memory-mapped from disk (None: the system temp dir; avoid tmpfs)
+    audio_scratch_dir: Optional[str] = None
+
+class KeyframeExtractionSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="KEYFRAME_EXTRACTION_")
+
+    # 'clip': cluster with CLIP embeddings and index the selected rows directly (single vision model pass).
+    # 'resnet': cluster with ResNet embeddings, then run CLIP again over the selected keyframes.
+    embedding_method: str = "clip"
+    selector: str = "auto" # 'auto', 'kmeans', 'minibatch_kmeans' or 'temporal_segmentation'
+
+    # Shot-boundary / near-duplicate pre-filter applied to the sampled frames before embedding
+    prefilter_enabled: bool = True
+    prefilter_duplicate_threshold: float = 0.02
+    prefilter_shot_threshold: float = 0.3
+    prefilter_max_gap_seconds: float = 30.0
+
+    # Per-video cache of the sampled frames' embeddings (re-clustering a video skips decoding and embedding)
+    frame_embedding_cache_enabled: bool = True
+    frame_embedding_cache_dir: str = "./data/frame_embedding_cache"
+
 class Settings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()
+    index_jobs: IndexJobSettings = IndexJobSettings()
+    keyframe_extraction: KeyframeExtractionSettings = KeyframeExtractionSettings()
 
 settings = Settings()
\ No newline at end of file
@@ -1 +1,31 @@
-DEFAULT_NUM_KEYFRAMES_TO_EXTRACT = 50
\ No newline at end of file
+from enum import Enum 
+
+DEFAULT_NUM_KEYFRAMES_TO_EXTRACT = 50
+
+class IndexJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class IndexJobStageStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+# Stages of the video indexing pipeline (used for job progress reporting); the keyframe and audio stages run concurrently
+INDEX_JOB_STAGES = [
+    "keyframe_extraction",
+    "keyframe_captioning",
+    "keyframe_embedding",
+    "keyframe_indexing",
+    "audio_extraction",
+    "audio_track_upload",
+    "audio_processing",
+    "audio_embedding",
+    "audio_indexing",
+    "video_upload",
+    "persistence"
+]
\ No newline at end of file
@@ -7,7 +7,11 @@ from sqlalchemy import (
     String, 
     Float, 
     Integer, 
-    DateTime
+    DateTime,
+    Text,
+    JSON,
+    inspect,
+    text
 )
 from sqlalchemy.orm import sessionmaker 
 from sqlalchemy.ext.declarative import declarative_base 
@@ -40,15 +44,67 @@ class VideoModel(Base):
     size_bytes = Column(Integer, nullable=True)
     minio_video_path = Column(String, unique=True, nullable=False)
     minio_audio_path = Column(String, unique=True, nullable=True)
+    content_hash = Column(String, index=True, nullable=True) # SHA-256 of the uploaded file, used to deduplicate uploads
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"Filename: {self.filename}\nID: {self.id}\nDuration: {self.duration_seconds} seconds\nCreated At: {self.created_at}"
+
+class IndexJobModel(Base):
+    __tablename__ = "index_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    video_id = Column(String, index=True, nullable=False)
+    filename = Column(String, nullable=False)
+    content_hash = Column(String, index=True, nullable=True)
+    num_keyframes_requested = Column(Integer, nullable=True)
+    status = Column(String, index=True, nullable=False, default="queued")
+    current_stage = Column(String, nullable=True)
+    stages = Column(JSON, nullable=False, default=dict) # Stage name -> {status, started_at, completed_at, duration_seconds}
+    progress = Column(Float, nullable=False, default=0.0) # Fraction of finished stages (0.0 - 1.0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"Index Job: {self.id}\nVideo ID: {self.video_id}\nStatus: {self.status}\nStage: {self.current_stage}"
     
+def _add_missing_columns():
+    """
+    Adds nullable columns introduced after a table was first created (`create_all` only creates missing tables),
+    together with their indexes.
+    """
+    inspector = inspect(engine)
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            missing_columns = [column for column in table.columns if column.name not in existing_columns]
+
+            for column in missing_columns:
+                if not column.nullable:
+                    print(f"Warning: Cannot add non-nullable column '{table.name}.{column.name}' to an existing table.")
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"Added missing column '{table.name}.{column.name}'.")
+
+            if missing_columns:
+                for index in table.indexes:
+                    index.create(bind=connection, checkfirst=True)
+
 # Function to create database tables 
 def create_db_and_tables():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
 
 # Dependency for the DB session 
 def get_db():
@@ -5,6 +5,7 @@ from core.utils.minio_client import MinIOClient
 from core.vector_store.qdrant_client import QdrantClient 
 from core.vector_store.retrievers.video_keyframe_retriever import VideoKeyframeRetriever
 from core.vector_store.retrievers.audio_segment_retriever import AudioSegmentRetriever
+from backend.jobs import IndexJobManager
 
 def get_minio_client_dependency(request: Request) -> MinIOClient:
     """FastAPI dependency to get the initialized MinIO Client instance."""
@@ -69,4 +70,17 @@ def get_audio_segment_retriever_dependency(request: Request) -> AudioSegmentRetr
             detail="AudioSegmentRetriever service could not be initialized."
         )
     
-    return audio_segment_retriever
\ No newline at end of file
+    return audio_segment_retriever
+
+def get_index_job_manager_dependency(request: Request) -> IndexJobManager:
+    """FastAPI dependency to get the initialized IndexJobManager instance."""
+    index_job_manager = getattr(request.app.state, "index_job_manager", None)
+
+    if not index_job_manager:
+        print("ERROR: IndexJobManager not found in the application state.")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, 
+            detail="Index job workers could not be initialized."
+        )
+    
+    return index_job_manager
\ No newline at end of file
@@ -1,37 +1,75 @@
-import io 
+import os 
+import shutil 
+import hashlib
 import traceback 
 from pathlib import Path
-from typing import Optional 
+from tempfile import mkdtemp
+from typing import Optional, Tuple 
 
 from sqlalchemy.orm import Session 
-from fastapi import HTTPException 
+from fastapi import HTTPException, UploadFile 
 
 from core.utils.minio_client import MinIOClient
 from core.utils.video_processor import VideoMetadata
 from backend.schemas.video import VideoCreate
 from backend.database.database import VideoModel
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024 
+
+def save_upload_to_temp_dir(video_file: UploadFile) -> Tuple[str, str, str, str]:
+    """
+    Copies an uploaded video into a fresh temporary directory, hashing it (SHA-256) while it streams to disk.
+    Returns (temp_dir, video_file_path, original_filename, content_hash). The caller owns `temp_dir`.
+    """
+    temp_dir = mkdtemp()
+    # Ensure filename from UploadFile is sanitized or use a fixed name for robustness
+    original_filename = video_file.filename if video_file.filename else "uploaded_video"
+    base, ext = os.path.splitext(original_filename)
+    safe_filename = "".join(c if c.isalnum() or c in ['.', '_'] else '_' for c in base) + (ext if ext else ".mp4")
+    video_file_path = os.path.join(temp_dir, safe_filename)
+
+    try:
+        print(f"Saving uploaded video to: {video_file_path}")
+        sha256 = hashlib.sha256()
+        with open(video_file_path, "wb") as buffer:
+            for chunk in iter(lambda: video_file.file.read(UPLOAD_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+                buffer.write(chunk)
+        content_hash = sha256.hexdigest()
+        print(f"Video saved successfully (sha256: {content_hash}).")
+
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    finally:
+        if hasattr(video_file, 'file') and not video_file.file.closed:
+            video_file.file.close()
+
+    return temp_dir, video_file_path, original_filename, content_hash
+
+def find_video_by_content_hash(db: Session, content_hash: str) -> Optional[VideoModel]:
+    """Returns the most recently indexed video with the given content hash, if any."""
+    return db.query(VideoModel).filter(
+        VideoModel.content_hash == content_hash
+    ).order_by(VideoModel.created_at.desc()).first()
+
 def save_video_to_minio(
     video_file_path: str, 
     video_filename: str, 
     minio_client: MinIOClient 
 ):
     try:
-        with open(video_file_path, "rb") as f_vid_stream_handle: 
-            video_content_bytes = f_vid_stream_handle.read()
-            video_stream_for_minio = io.BytesIO(video_content_bytes)
-            video_data_length = len(video_content_bytes)
-
-            minio_original_video_path = minio_client.store_original_video(
-                video_data_stream=video_stream_for_minio, 
-                video_data_length=video_data_length, 
-                original_filename=video_filename
-            )
-
-            if not minio_original_video_path:
-                raise Exception("Failed to store video file in MinIO.")
-            
-            return minio_original_video_path
+        # Streamed from disk in parts, without reading the whole video into memory
+        minio_original_video_path = minio_client.store_original_video_file(
+            video_file_path=video_file_path, 
+            original_filename=video_filename
+        )
+
+        if not minio_original_video_path:
+            raise Exception("Failed to store video file in MinIO.")
+        
+        return minio_original_video_path
         
     except Exception as e:
         print(f"An error occurred: {str(e)}")
@@ -44,19 +82,13 @@ def save_audio_to_minio(
     minio_client: MinIOClient 
 ): 
     try: 
-        with open(audio_file_path, "rb") as f_audio_stream_handle: 
-            audio_content_bytes = f_audio_stream_handle.read()
-            audio_stream_for_minio = io.BytesIO(audio_content_bytes)
-            audio_data_length = len(audio_content_bytes)
-
         extracted_audio_format = Path(audio_file_path).suffix.lstrip(".").lower()
         
         if not extracted_audio_format:
             extracted_audio_format = "wav"
 
-        minio_extracted_audio_path = minio_client.store_extracted_audio(
-            audio_data_stream=audio_stream_for_minio, 
-            audio_data_length=audio_data_length, 
+        minio_extracted_audio_path = minio_client.store_extracted_audio_file(
+            audio_file_path=audio_file_path, 
             video_id=video_id, 
             original_video_filename=video_filename, 
             audio_format=extracted_audio_format
@@ -77,7 +109,8 @@ def save_video_in_db(
     video_metadata: VideoMetadata, 
     video_filename: str, 
     minio_video_path: str, 
-    minio_audio_path: Optional[str]
+    minio_audio_path: Optional[str],
+    content_hash: Optional[str] = None
 ):
     db_video_data = VideoCreate(
         id=video_id, 
@@ -88,7 +121,8 @@ def save_video_in_db(
         resolution_width=video_metadata["resolution_width"], 
         size_bytes=video_metadata["size_bytes"], 
         minio_video_path=minio_video_path, 
-        minio_audio_path=minio_audio_path
+        minio_audio_path=minio_audio_path,
+        content_hash=content_hash
     )
     db_video_data_dict = db_video_data.model_dump(exclude_none=True)
 
@@ -0,0 +1,507 @@
+import os
+import time
+import tempfile
+from typing import List, Optional, Dict, Any, Tuple, Callable
+
+import numpy as np
+from PIL import Image
+from google import genai
+from sqlalchemy.orm import Session
+
+from core.utils.minio_client import MinIOClient
+from core.utils.cache_manager import FrameEmbeddingCache
+from core.utils.video_processor import (
+    extract_keyframes_and_embeddings_by_clustering,
+    get_video_metadata,
+    FramePrefilter,
+    VideoMetadata
+)
+from core.tools.grounding.keyframe_captioner import KeyframeDescriptionOutput
+from core.utils.gemini_utils import GeminiImageBatchProcessor, GeminiRequestPriority
+from core.utils.audio_ingestion import DecodedAudio, decode_audio
+from core.utils.audio_track import AudioTrackIndex, encode_flac_track_file
+from core.utils.audio_processor import (
+    process_audio_segments,
+    ProcessedAudioSegment,
+    DEFAULT_SAMPLING_RATE,
+    CLAP_SAMPLING_RATE
+)
+from core.utils.embedding_utils import (
+    generate_clip_image_embeddings_batch,
+    generate_sentence_embeddings_batch,
+    generate_clap_audio_embeddings_batch
+)
+from core.vector_store.retrievers.video_keyframe_retriever import VideoKeyframeRetriever
+from core.vector_store.retrievers.audio_segment_retriever import AudioSegmentRetriever
+from core.vector_store.utils import (
+    index_keyframes,
+    index_audio_segments
+)
+from core.prompts.gemini import OSCE_KEYFRAME_CAPTIONER_PROMPT
+from core.pipeline.dag import PipelineDAG, Stage, StageSkipped, StageStatus
+
+from backend.config.config import settings
+from core.config.config import settings as core_settings
+from backend.constants import IndexJobStageStatus
+from backend.checkpoints import IndexingCheckpoint
+from backend.helpers import (
+    save_video_to_minio,
+    save_video_in_db
+)
+
+# Callback invoked as `on_stage_update(stage_name, stage_status)` whenever a pipeline stage changes state
+StageUpdateCallback = Callable[[str, IndexJobStageStatus], None]
+
+# Keyframe branch
+
+def _extract_keyframes_stage(
+    video_file_path: str,
+    num_keyframes_to_extract: int,
+    keyframe_embedding_method: str,
+    content_hash: Optional[str],
+    models: Dict[str, Any]
+) -> Tuple[List[Tuple[Image.Image, float]], Optional[np.ndarray]]:
+    print(f"\n--- Extracting Keyframes from '{video_file_path}' ---")
+    frame_embedding_cache = None
+    if settings.keyframe_extraction.frame_embedding_cache_enabled:
+        frame_embedding_cache = FrameEmbeddingCache(settings.keyframe_extraction.frame_embedding_cache_dir)
+
+    frame_prefilter = None
+    if settings.keyframe_extraction.prefilter_enabled:
+        frame_prefilter = FramePrefilter(
+            duplicate_threshold=settings.keyframe_extraction.prefilter_duplicate_threshold,
+            shot_threshold=settings.keyframe_extraction.prefilter_shot_threshold,
+            max_gap_seconds=settings.keyframe_extraction.prefilter_max_gap_seconds
+        )
+
+    extracted_keyframes_data, keyframe_embeddings = extract_keyframes_and_embeddings_by_clustering(
+        video_path=video_file_path,
+        num_keyframes=num_keyframes_to_extract,
+        clip_model=models["clip_model"],
+        clip_processor=models["clip_processor"],
+        resnet_model=models.get("resnet_model"),
+        resnet_transform=models.get("resnet_transform"),
+        frame_sample_rate=1,
+        batch_size=64,
+        embedding_method=keyframe_embedding_method,
+        keyframe_selector=settings.keyframe_extraction.selector,
+        frame_prefilter=frame_prefilter,
+        frame_embedding_cache=frame_embedding_cache,
+        video_sha256=content_hash,
+        inference_backend=core_settings.inference.backend
+    )
+    print(f"Successfully extracted {len(extracted_keyframes_data)} keyframes.")
+
+    return extracted_keyframes_data, keyframe_embeddings
+
+def _caption_keyframes_stage(
+    keyframes: List[Tuple[Image.Image, float]],
+    gemini_client: genai.Client
+) -> List[Dict[str, Any]]:
+    if not keyframes:
+        raise StageSkipped("No keyframes extracted. Skipping keyframe indexing.")
+
+    print("Generating keyframe descriptions with Gemini...")
+    gemini_image_processor = GeminiImageBatchProcessor(
+        client=gemini_client,
+        prompt_template=OSCE_KEYFRAME_CAPTIONER_PROMPT,
+        output_schema=KeyframeDescriptionOutput,
+        max_retries=5,
+        max_backoff=120,
+        max_workers=4,
+        priority=GeminiRequestPriority.BACKGROUND, # Yield to the interactive assessment calls
+    )
+    keyframe_descriptions_raw = gemini_image_processor.process_batch([pil_image for (pil_image, _) in keyframes])
+    keyframe_descriptions = []
+    for desc_data in keyframe_descriptions_raw:
+        if isinstance(desc_data, dict): keyframe_descriptions.append(desc_data)
+        elif hasattr(desc_data, 'model_dump'): keyframe_descriptions.append(desc_data.model_dump())
+        else: keyframe_descriptions.append({"description": str(desc_data)})
+
+    return keyframe_descriptions
+
+def _embed_keyframes_stage(
+    keyframes: List[Tuple[Image.Image, float]],
+    keyframe_embeddings: Optional[np.ndarray],
+    keyframe_descriptions: List[Dict[str, Any]],
+    keyframe_embedding_method: str,
+    models: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    if keyframe_embedding_method == "clip" and keyframe_embeddings is not None:
+        # The CLIP embeddings used for clustering are reused as the keyframe image embeddings
+        print("Reusing the CLIP embeddings computed during keyframe extraction.")
+        keyframe_images_clip_embeddings = keyframe_embeddings
+    else:
+        print("Generating CLIP embeddings for keyframes...")
+        keyframe_images_clip_embeddings = generate_clip_image_embeddings_batch(
+            pil_images=[pil_image for (pil_image, _) in keyframes], model=models["clip_model"], processor=models["clip_processor"],
+        )
+
+    print("Generating Sentence embeddings for keyframe descriptions...")
+    keyframe_descriptions_sent_embeddings = generate_sentence_embeddings_batch(
+        texts=[d.get("description", "") for d in keyframe_descriptions], model=models["sentence_transformer"]
+    )
+
+    return keyframe_images_clip_embeddings, keyframe_descriptions_sent_embeddings
+
+def _index_keyframes_stage(
+    video_id: str,
+    keyframes: List[Tuple[Image.Image, float]],
+    keyframe_image_embeddings: np.ndarray,
+    keyframe_description_embeddings: np.ndarray,
+    keyframe_descriptions: List[Dict[str, Any]],
+    minio_client: MinIOClient,
+    video_keyframe_retriever: VideoKeyframeRetriever
+) -> Dict[str, Any]:
+    print("Indexing keyframes...")
+    indexed = index_keyframes(
+        video_id=video_id,
+        extracted_keyframes_data=keyframes,
+        keyframe_images_clip_embeddings=keyframe_image_embeddings,
+        keyframe_descriptions_sent_embeddings=keyframe_description_embeddings,
+        keyframe_descriptions=keyframe_descriptions,
+        minio_client=minio_client,
+        video_keyframe_retriever=video_keyframe_retriever
+    )
+    if not indexed:
+        raise RuntimeError(f"Failed to index the keyframes of video_id: {video_id}")
+
+    return {"num_keyframes": len(keyframes), "indexed": indexed}
+
+# Audio branch
+
+def _extract_audio_stage(
+    video_file_path: str,
+    audio_dir: str
+) -> DecodedAudio:
+    print(f"\n--- Extracting and Processing Audio from '{video_file_path}' ---")
+    # One ffmpeg pass: 16 kHz for transcription, diarization and emotion, 48 kHz for CLAP. The PCM is memory-mapped
+    # from `audio_dir`, so that memory use does not grow with the length of the recording.
+    decoded_audio = decode_audio(
+        video_file_path,
+        sampling_rates=[DEFAULT_SAMPLING_RATE, CLAP_SAMPLING_RATE],
+        output_dir=audio_dir
+    )
+
+    if decoded_audio is None:
+        raise StageSkipped("Audio extraction failed. Skipping audio indexing.", failed=True)
+
+    return decoded_audio
+
+def _upload_audio_track_stage(
+    video_id: str,
+    original_filename: str,
+    decoded_audio: DecodedAudio,
+    audio_dir: str,
+    minio_client: MinIOClient
+) -> AudioTrackIndex:
+    """Stores the audio track as one 16 kHz FLAC object; the audio segments are indexed as byte ranges of it."""
+    flac_file_path = os.path.join(audio_dir, "audio_track.flac")
+    audio_track = encode_flac_track_file(
+        decoded_audio.waveform(DEFAULT_SAMPLING_RATE),
+        DEFAULT_SAMPLING_RATE,
+        flac_file_path
+    )
+
+    minio_audio_path = minio_client.store_extracted_audio_file(
+        audio_file_path=flac_file_path,
+        video_id=video_id,
+        original_video_filename=original_filename,
+        audio_format="flac"
+    )
+    if not minio_audio_path:
+        raise RuntimeError("Failed to store the audio track in MinIO.")
+
+    audio_track.minio_path = minio_audio_path
+    print(f"Stored the audio track ({os.path.getsize(flac_file_path) / 1e6:.1f} MB, {audio_track.num_frames} FLAC frames) at: {minio_audio_path}")
+    return audio_track
+
+def _process_audio_stage(
+    decoded_audio: DecodedAudio,
+    models: Dict[str, Any]
+) -> List[ProcessedAudioSegment]:
+    print("Processing audio segments (transcription, diarization, emotion)...")
+    return process_audio_segments(
+        audio=decoded_audio,
+        whisper_model=models["whisper_model"],
+        diarization_model=models["diarization_model"],
+        audio_emotion_classification_model=models["audio_emotion_classification_model"],
+        sampling_rate=DEFAULT_SAMPLING_RATE
+    )
+
+def _embed_audio_segments_stage(
+    audio_segments: List[ProcessedAudioSegment],
+    decoded_audio: DecodedAudio,
+    models: Dict[str, Any]
+) -> Tuple[Any, Any]:
+    if not audio_segments:
+        raise StageSkipped("No audio segments processed. Skipping audio indexing.")
+
+    print(f"Successfully processed {len(audio_segments)} audio segments.")
+    print("Generating CLAP embeddings for audio segments...")
+
+    # Slice the segments out of the 48 kHz decode when available, so CLAP needs no resampling. The slices are
+    # views (of memory-mapped PCM): the audio is only read batch by batch, inside the CLAP processor.
+    clap_audio_sampling_rate = (
+        CLAP_SAMPLING_RATE if decoded_audio.has_sampling_rate(CLAP_SAMPLING_RATE) else DEFAULT_SAMPLING_RATE
+    )
+    clap_audio_data_list = [
+        decoded_audio.segment(segment["start"], segment["end"], clap_audio_sampling_rate)
+        for segment in audio_segments
+    ]
+
+    audio_segments_clap_embeddings = generate_clap_audio_embeddings_batch(
+        audio_data_list=clap_audio_data_list,
+        model=models["clap_model"],
+        processor=models["clap_processor"],
+        original_sampling_rate=clap_audio_sampling_rate
+    )
+
+    print("Generating Sentence embeddings for audio transcripts...")
+    audio_segments_transcript_sentence_embeddings = generate_sentence_embeddings_batch(
+        texts=[segment.get("transcript", "") for segment in audio_segments], model=models["sentence_transformer"],
+    )
+
+    return audio_segments_clap_embeddings, audio_segments_transcript_sentence_embeddings
+
+def _index_audio_segments_stage(
+    video_id: str,
+    audio_segments: List[ProcessedAudioSegment],
+    audio_clap_embeddings: Any,
+    audio_transcript_embeddings: Any,
+    audio_track: AudioTrackIndex,
+    minio_client: MinIOClient,
+    audio_segment_retriever: AudioSegmentRetriever
+) -> Dict[str, Any]:
+    clap_embeddings_exist = audio_clap_embeddings is not None and len(audio_clap_embeddings) > 0
+    transcript_embeddings_exist = audio_transcript_embeddings is not None and len(audio_transcript_embeddings) > 0
+
+    if not (clap_embeddings_exist or transcript_embeddings_exist):
+        reasons = []
+        if not clap_embeddings_exist:
+            reasons.append("CLAP embeddings are missing or empty")
+        if not transcript_embeddings_exist:
+            reasons.append("transcript sentence embeddings are missing or empty")
+        raise StageSkipped(f"Skipping audio segment indexing as no embeddings were generated ({'; '.join(reasons)}).")
+
+    print("Indexing audio segments...")
+    indexed = index_audio_segments(
+        video_id=video_id,
+        processed_audio_segments=audio_segments,
+        audio_segments_clap_embeddings=audio_clap_embeddings if clap_embeddings_exist else [],
+        audio_segments_transcript_sentence_embeddings=audio_transcript_embeddings if transcript_embeddings_exist else [],
+        minio_client=minio_client,
+        audio_segment_retriever=audio_segment_retriever,
+        audio_track=audio_track
+    )
+    if not indexed:
+        raise RuntimeError(f"Failed to index the audio segments of video_id: {video_id}")
+
+    return {"num_segments": len(audio_segments), "indexed": indexed}
+
+# Persistence
+
+def _upload_video_stage(
+    video_file_path: str,
+    original_filename: str,
+    minio_client: MinIOClient
+) -> str:
+    minio_video_path = save_video_to_minio(
+        video_file_path=video_file_path,
+        video_filename=original_filename,
+        minio_client=minio_client
+    )
+    if not minio_video_path:
+        raise RuntimeError("Failed to store video file in MinIO.")
+
+    return minio_video_path
+
+def _persist_video_stage(
+    video_id: str,
+    original_filename: str,
+    video_metadata: VideoMetadata,
+    content_hash: Optional[str],
+    minio_video_path: str,
+    db: Session,
+    audio_track: Optional[AudioTrackIndex],
+    keyframe_index_receipt: Optional[Dict[str, Any]],
+    audio_index_receipt: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    minio_audio_path = audio_track.minio_path if audio_track is not None else None
+
+    saved_video = save_video_in_db(
+        db=db,
+        video_id=video_id,
+        video_metadata=video_metadata,
+        video_filename=original_filename,
+        minio_video_path=minio_video_path,
+        minio_audio_path=minio_audio_path,
+        content_hash=content_hash
+    )
+
+    return saved_video
+
+# The keyframe branch and the audio branch share no data and run concurrently; the original video is uploaded
+# to MinIO alongside both. `max_concurrency` limits apply across all the videos being indexed at once.
+# The indexing stages write to Qdrant and MinIO, so they have no stage timeout (an abandoned attempt would keep
+# writing after the failure); their clients' own request timeouts bound them instead.
+VIDEO_INDEXING_PIPELINE = PipelineDAG([
+    Stage(
+        "keyframe_extraction", _extract_keyframes_stage,
+        inputs=["video_file_path", "num_keyframes_to_extract", "keyframe_embedding_method", "content_hash", "models"],
+        outputs=["keyframes", "keyframe_embeddings"],
+        max_concurrency=1
+    ),
+    Stage(
+        "keyframe_captioning", _caption_keyframes_stage,
+        inputs=["keyframes", "gemini_client"],
+        outputs=["keyframe_descriptions"]
+    ),
+    Stage(
+        "keyframe_embedding", _embed_keyframes_stage,
+        inputs=["keyframes", "keyframe_descriptions", "keyframe_embedding_method", "models"],
+        optional_inputs=["keyframe_embeddings"],
+        outputs=["keyframe_image_embeddings", "keyframe_description_embeddings"]
+    ),
+    Stage(
+        "keyframe_indexing", _index_keyframes_stage,
+        inputs=[
+            "video_id", "keyframes", "keyframe_image_embeddings", "keyframe_description_embeddings",
+            "keyframe_descriptions", "minio_client", "video_keyframe_retriever"
+        ],
+        outputs=["keyframe_index_receipt"],
+        max_retries=2
+    ),
+    Stage(
+        "audio_extraction", _extract_audio_stage,
+        inputs=["video_file_path", "audio_dir"],
+        outputs=["decoded_audio"],
+        # The decoded PCM is large and re-decoding is a single fast ffmpeg pass, so it is not checkpointed
+        checkpointed=False
+    ),
+    Stage(
+        "audio_track_upload", _upload_audio_track_stage,
+        inputs=["video_id", "original_filename", "decoded_audio", "audio_dir", "minio_client"],
+        outputs=["audio_track"],
+        max_retries=2
+    ),
+    Stage(
+        "audio_processing", _process_audio_stage,
+        inputs=["decoded_audio", "models"],
+        outputs=["audio_segments"],
+        max_concurrency=1
+    ),
+    Stage(
+        "audio_embedding", _embed_audio_segments_stage,
+        inputs=["audio_segments", "decoded_audio", "models"],
+        outputs=["audio_clap_embeddings", "audio_transcript_embeddings"]
+    ),
+    Stage(
+        "audio_indexing", _index_audio_segments_stage,
+        inputs=[
+            "video_id", "audio_segments", "audio_clap_embeddings", "audio_transcript_embeddings",
+            "audio_track", "minio_client", "audio_segment_retriever"
+        ],
+        outputs=["audio_index_receipt"],
+        max_retries=2
+    ),
+    Stage(
+        "video_upload", _upload_video_stage,
+        inputs=["video_file_path", "original_filename", "minio_client"],
+        outputs=["minio_video_path"],
+        max_retries=2
+    ),
+    Stage(
+        "persistence", _persist_video_stage,
+        inputs=["video_id", "original_filename", "video_metadata", "content_hash", "minio_video_path", "db"],
+        # Waits for both branches to finish, whether or not they were skipped
+        optional_inputs=["audio_track", "keyframe_index_receipt", "audio_index_receipt"],
+        outputs=["saved_video"],
+        checkpointed=False
+    ),
+])
+
+def run_video_indexing_pipeline(
+    video_file_path: str,
+    original_filename: str,
+    video_id: str,
+    num_keyframes_to_extract: int,
+    models: Dict[str, Any],
+    db: Session,
+    minio_client: MinIOClient,
+    gemini_client: genai.Client,
+    audio_segment_retriever: AudioSegmentRetriever,
+    video_keyframe_retriever: VideoKeyframeRetriever,
+    on_stage_update: Optional[StageUpdateCallback] = None,
+    keyframe_embedding_method: str = settings.keyframe_extraction.embedding_method,
+    content_hash: Optional[str] = None,
+    checkpoint: Optional[IndexingCheckpoint] = None
+) -> Dict[str, Any]:
+    """
+    Runs the full (blocking) indexing pipeline (`VIDEO_INDEXING_PIPELINE`) for a video file that is already on local disk.
+    The keyframe branch (extraction, captioning, embedding and indexing) and the audio branch (extraction,
+    transcription/diarization, embedding and indexing) run concurrently with the upload of the original video,
+    followed by persistence to MinIO and the database.
+
+    This function must not be called from the event loop; it is executed by the index job workers.
+
+    Args:
+        video_file_path (str): Path to the local copy of the uploaded video.
+        original_filename (str): Original filename of the uploaded video.
+        video_id (str): The video ID to index the video under.
+        num_keyframes_to_extract (int): Number of keyframes to extract.
+        models (Dict[str, Any]): The loaded models (i.e. `app.state.models`).
+        db (Session): Database session used for persisting the video metadata.
+        on_stage_update (Optional[StageUpdateCallback]): Callback for reporting per-stage progress (called from worker threads).
+        keyframe_embedding_method (str): 'clip' to cluster with CLIP embeddings and index them directly,
+            or 'resnet' to cluster with ResNet embeddings and compute CLIP embeddings for the keyframes afterwards.
+        content_hash (Optional[str]): SHA-256 of the uploaded file (stored with the video for upload deduplication).
+        checkpoint (Optional[IndexingCheckpoint]): If set, the output of every completed stage is persisted in it,
+            and stages already present in it are loaded instead of recomputed (i.e. resuming a failed job).
+
+    Returns:
+        Dict[str, Any]: Summary of the indexing run.
+    """
+    start_time_total = time.time()
+    print(f"\n--- Starting Video Indexing for video_id: {video_id} ---")
+    print(f"Number of keyframes to extract: {num_keyframes_to_extract}")
+
+    def report_stage(stage: str, stage_status: StageStatus):
+        if on_stage_update is not None:
+            on_stage_update(stage, IndexJobStageStatus(stage_status.value))
+
+    # Scratch space for the decoded (memory-mapped) PCM and the encoded audio track, removed once the pipeline ends
+    with tempfile.TemporaryDirectory(prefix=f"audio-{video_id}-", dir=settings.index_jobs.audio_scratch_dir) as audio_dir:
+        values = VIDEO_INDEXING_PIPELINE.run(
+            inputs={
+                "video_file_path": video_file_path,
+                "original_filename": original_filename,
+                "video_id": video_id,
+                "num_keyframes_to_extract": num_keyframes_to_extract,
+                "keyframe_embedding_method": keyframe_embedding_method,
+                "content_hash": content_hash,
+                "video_metadata": get_video_metadata(video_file_path),
+                "models": models,
+                "db": db,
+                "minio_client": minio_client,
+                "gemini_client": gemini_client,
+                "audio_segment_retriever": audio_segment_retriever,
+                "video_keyframe_retriever": video_keyframe_retriever,
+                "audio_dir": audio_dir
+            },
+            on_stage_update=report_stage,
+            checkpoint=checkpoint
+        )
+
+    total_processing_time = time.time() - start_time_total
+    print(f"--- Video Indexing for '{video_id}' completed in {total_processing_time:.2f} seconds ---")
+
+    extracted_keyframes_data = values["keyframes"]
+    return {
+        "video_id": video_id,
+        "message": "Video processed and indexed successfully.",
+        "video": values["saved_video"],
+        "num_keyframes_extracted_actual": len(extracted_keyframes_data) if extracted_keyframes_data else 0,
+        "num_keyframes_requested": num_keyframes_to_extract,
+        "processing_time_seconds": round(total_processing_time, 2)
+    }
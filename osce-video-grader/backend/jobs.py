@@ -0,0 +1,331 @@
+import os
+import shutil
+import threading
+import traceback
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, Callable
+
+from sqlalchemy.orm import Session
+
+from backend.config.config import settings
+from backend.constants import IndexJobStatus, IndexJobStageStatus, INDEX_JOB_STAGES
+from backend.database.database import SessionLocal, IndexJobModel
+from backend.indexing import run_video_indexing_pipeline
+from backend.checkpoints import IndexingCheckpoint
+
+_FINISHED_STAGE_STATUSES = (
+    IndexJobStageStatus.COMPLETED.value,
+    IndexJobStageStatus.SKIPPED.value,
+    IndexJobStageStatus.FAILED.value
+)
+
+class IndexJobManager:
+    """
+    Runs video indexing jobs on a bounded pool of worker threads, outside of the FastAPI event loop.
+    Job state and per-stage progress are persisted in the `index_jobs` table so they can be polled.
+    """
+    def __init__(
+        self,
+        app_state: Any,
+        max_workers: int = settings.index_jobs.max_workers,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        """
+        Args:
+            app_state: The FastAPI application state holding the loaded models, clients and retrievers.
+            max_workers (int): Maximum number of videos indexed concurrently.
+            session_factory: Factory for database sessions used by the worker threads.
+        """
+        self.app_state = app_state
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="index-job-worker"
+        )
+        self._lock = threading.Lock()
+        self._stage_update_lock = threading.Lock() # Stages of concurrent pipeline branches update the same JSON column
+        self._futures: Dict[str, Future] = {}
+
+    def create_job(
+        self,
+        db: Session,
+        video_id: str,
+        filename: str,
+        num_keyframes_requested: int,
+        content_hash: Optional[str] = None
+    ) -> IndexJobModel:
+        """Creates a new queued index job row."""
+        db_job = IndexJobModel(
+            video_id=video_id,
+            filename=filename,
+            content_hash=content_hash,
+            num_keyframes_requested=num_keyframes_requested,
+            status=IndexJobStatus.QUEUED.value,
+            stages={stage: {"status": IndexJobStageStatus.PENDING.value} for stage in INDEX_JOB_STAGES},
+            progress=0.0
+        )
+
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        print(f"Created index job '{db_job.id}' for video_id: {video_id}")
+
+        return db_job
+
+    def submit(
+        self,
+        job_id: str,
+        video_file_path: str,
+        temp_dir: Optional[str],
+        original_filename: str,
+        video_id: str,
+        num_keyframes_to_extract: int,
+        content_hash: Optional[str] = None
+    ) -> Future:
+        """
+        Schedules an index job on the worker pool.
+        The job takes ownership of `temp_dir` and removes it once it finishes. The video file is moved into the 
+        job's checkpoint, which is kept if the job fails so that it can be resumed (by submitting the same job again).
+        """
+        future = self._executor.submit(
+            self._run_job,
+            job_id,
+            video_file_path,
+            temp_dir,
+            original_filename,
+            video_id,
+            num_keyframes_to_extract,
+            content_hash
+        )
+
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+
+        return future
+
+    def find_active_job_by_content_hash(self, db: Session, content_hash: str) -> Optional[IndexJobModel]:
+        """Returns a queued or running job indexing a file with the given content hash, if any."""
+        return db.query(IndexJobModel).filter(
+            IndexJobModel.content_hash == content_hash,
+            IndexJobModel.status.in_([IndexJobStatus.QUEUED.value, IndexJobStatus.RUNNING.value])
+        ).order_by(IndexJobModel.created_at.desc()).first()
+
+    def get_future(self, job_id: str) -> Optional[Future]:
+        """Returns the future of a queued or running job, if any."""
+        with self._lock:
+            return self._futures.get(job_id)
+
+    def reset_job_for_resume(self, db: Session, db_job: IndexJobModel) -> IndexJobModel:
+        """
+        Re-queues a failed job: completed and skipped stages are kept (their outputs are loaded from the 
+        checkpoint), the other stages are reset to pending.
+        """
+        stages = {}
+        for stage in INDEX_JOB_STAGES:
+            stage_info = dict((db_job.stages or {}).get(stage, {}))
+            if stage_info.get("status") not in (IndexJobStageStatus.COMPLETED.value, IndexJobStageStatus.SKIPPED.value):
+                stage_info = {"status": IndexJobStageStatus.PENDING.value}
+            stages[stage] = stage_info
+
+        num_finished = sum(1 for info in stages.values() if info["status"] in _FINISHED_STAGE_STATUSES)
+
+        db_job.stages = stages
+        db_job.progress = round(num_finished / len(stages), 3)
+        db_job.status = IndexJobStatus.QUEUED.value
+        db_job.current_stage = None
+        db_job.error = None
+        db_job.completed_at = None
+
+        db.commit()
+        db.refresh(db_job)
+        print(f"Resuming index job '{db_job.id}' for video_id: {db_job.video_id}")
+
+        return db_job
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def fail_interrupted_jobs(self):
+        """Marks jobs left queued or running by a previous process as failed (their uploads are gone)."""
+        db = self.session_factory()
+
+        try:
+            interrupted_jobs = db.query(IndexJobModel).filter(
+                IndexJobModel.status.in_([IndexJobStatus.QUEUED.value, IndexJobStatus.RUNNING.value])
+            ).all()
+
+            for db_job in interrupted_jobs:
+                db_job.status = IndexJobStatus.FAILED.value
+                db_job.error = "Job was interrupted by a server restart."
+                if IndexingCheckpoint(db_job.id).get_source_video_path():
+                    db_job.error += f" Resume it with POST /index_jobs/{db_job.id}/resume."
+                db_job.completed_at = datetime.utcnow()
+
+            db.commit()
+
+            if interrupted_jobs:
+                print(f"Marked {len(interrupted_jobs)} interrupted index job(s) as failed.")
+
+        except Exception as e:
+            db.rollback()
+            print(f"Error marking interrupted index jobs as failed: {e}")
+
+        finally:
+            db.close()
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _update_job(self, job_id: str, **fields):
+        """Applies `fields` to the job row in a short-lived session."""
+        db = self.session_factory()
+
+        try:
+            db_job = db.query(IndexJobModel).filter(IndexJobModel.id == job_id).first()
+            if db_job is None:
+                print(f"Warning: Index job '{job_id}' not found in the database.")
+                return
+
+            for key, value in fields.items():
+                setattr(db_job, key, value)
+
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"Error updating index job '{job_id}': {e}")
+
+        finally:
+            db.close()
+
+    def _update_stage(self, job_id: str, stage: str, stage_status: IndexJobStageStatus):
+        """Records a stage transition and recomputes the overall job progress."""
+        with self._stage_update_lock:
+            self._update_stage_locked(job_id, stage, stage_status)
+
+    def _update_stage_locked(self, job_id: str, stage: str, stage_status: IndexJobStageStatus):
+        db = self.session_factory()
+
+        try:
+            db_job = db.query(IndexJobModel).filter(IndexJobModel.id == job_id).first()
+            if db_job is None:
+                return
+
+            # Copy so that SQLAlchemy detects the change on the JSON column
+            stages = {name: dict(info) for name, info in (db_job.stages or {}).items()}
+            stage_info = stages.get(stage, {})
+            now = datetime.utcnow()
+
+            stage_info["status"] = stage_status.value
+            if stage_status == IndexJobStageStatus.RUNNING:
+                stage_info["started_at"] = now.isoformat()
+                db_job.current_stage = stage
+            elif stage_status.value in _FINISHED_STAGE_STATUSES:
+                stage_info["completed_at"] = now.isoformat()
+                if stage_info.get("started_at"):
+                    started_at = datetime.fromisoformat(stage_info["started_at"])
+                    stage_info["duration_seconds"] = round((now - started_at).total_seconds(), 2)
+
+            stages[stage] = stage_info
+            db_job.stages = stages
+
+            num_finished = sum(1 for info in stages.values() if info.get("status") in _FINISHED_STAGE_STATUSES)
+            db_job.progress = round(num_finished / len(stages), 3) if stages else 0.0
+
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"Error updating stage '{stage}' of index job '{job_id}': {e}")
+
+        finally:
+            db.close()
+
+    def _run_job(
+        self,
+        job_id: str,
+        video_file_path: str,
+        temp_dir: Optional[str],
+        original_filename: str,
+        video_id: str,
+        num_keyframes_to_extract: int,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Worker entrypoint: runs the indexing pipeline and records the outcome."""
+        self._update_job(
+            job_id,
+            status=IndexJobStatus.RUNNING.value,
+            started_at=datetime.utcnow()
+        )
+
+        db = self.session_factory()
+        running_stages = set()
+        checkpoint = IndexingCheckpoint(job_id)
+
+        def on_stage_update(stage: str, stage_status: IndexJobStageStatus):
+            if stage_status == IndexJobStageStatus.RUNNING:
+                running_stages.add(stage)
+            else:
+                running_stages.discard(stage)
+
+            self._update_stage(job_id, stage, stage_status)
+
+        try:
+            video_file_path = checkpoint.store_source_video(video_file_path)
+
+            result = run_video_indexing_pipeline(
+                video_file_path=video_file_path,
+                original_filename=original_filename,
+                video_id=video_id,
+                num_keyframes_to_extract=num_keyframes_to_extract,
+                models=self.app_state.models,
+                db=db,
+                minio_client=self.app_state.clients["minio"],
+                gemini_client=self.app_state.clients["gemini"],
+                audio_segment_retriever=self.app_state.retrievers["audio_segment"],
+                video_keyframe_retriever=self.app_state.retrievers["video_keyframe"],
+                on_stage_update=on_stage_update,
+                content_hash=content_hash,
+                checkpoint=checkpoint
+            )
+            checkpoint.clear()
+
+            self._update_job(
+                job_id,
+                status=IndexJobStatus.COMPLETED.value,
+                current_stage=None,
+                progress=1.0,
+                result=result,
+                completed_at=datetime.utcnow()
+            )
+
+            return result
+
+        except Exception as e:
+            print(f"Error during index job '{job_id}' for video_id '{video_id}': {e}")
+            traceback.print_exc()
+
+            for stage in list(running_stages):
+                self._update_stage(job_id, stage, IndexJobStageStatus.FAILED)
+
+            error_message = getattr(e, "detail", None) or str(e)
+            if checkpoint.get_source_video_path():
+                print(f"Completed stages of index job '{job_id}' are checkpointed; resume with POST /index_jobs/{job_id}/resume")
+            self._update_job(
+                job_id,
+                status=IndexJobStatus.FAILED.value,
+                error=str(error_message),
+                completed_at=datetime.utcnow()
+            )
+            raise
+
+        finally:
+            db.close()
+
+            if temp_dir and os.path.exists(temp_dir):
+                print(f"Cleaning up temporary directory: {temp_dir}")
+                shutil.rmtree(temp_dir, ignore_errors=True)
@@ -1,16 +1,14 @@
 import os
 import io 
 import uuid
+import asyncio
 import time
 import traceback
 import json
 import shutil
 from pathlib import Path 
-from tempfile import mkdtemp
 from typing import List, Optional, Dict, Any, Tuple
 
-import numpy as np
-from PIL import Image
 from google import genai
 from fastapi import (
     File, 
@@ -21,8 +19,10 @@ from fastapi import (
     Query,
     APIRouter,
     Request, 
+    Response,
     status 
 )
+from fastapi.concurrency import run_in_threadpool
 import uvicorn
 from google import genai 
 from pydantic import BaseModel, Field, conint 
@@ -30,35 +30,12 @@ from sqlalchemy.orm import Session
 
 from core.config.config import settings
 from core.utils.minio_client import MinIOClient
+from core.utils.cache_manager import FrameEmbeddingCache
 from core.vector_store.qdrant_client import QdrantClient
 from core.utils.gemini_utils import load_gemini_client
 
-from core.utils.video_processor import extract_keyframes_by_clustering, get_resnet_feature_extractor
+from core.utils.video_processor import get_resnet_feature_extractor
 
-from core.tools.grounding.keyframe_captioner import KeyframeDescriptionOutput
-from core.utils.gemini_utils import GeminiImageBatchProcessor
-from core.utils.embedding_utils import (
-    generate_clip_image_embeddings_batch,
-    generate_sentence_embeddings_batch
-)
-from core.vector_store.retrievers.video_keyframe_retriever import VideoKeyframeRetriever
-from core.utils.audio_processor import extract_audio, process_audio_segments
-from core.vector_store.retrievers.audio_segment_retriever import AudioSegmentRetriever
-from core.utils.audio_processor import (
-    extract_audio, 
-    process_audio_segments,
-    DEFAULT_SAMPLING_RATE
-)
-from core.utils.embedding_utils import (
-    generate_clip_image_embeddings_batch,
-    generate_sentence_embeddings_batch,
-    generate_clap_audio_embeddings_batch
-)
-from core.vector_store.utils import (
-    index_keyframes, 
-    index_audio_segments
-)
-from core.prompts.gemini import OSCE_KEYFRAME_CAPTIONER_PROMPT
 from core.tools.base import Tool 
 from core.tools.repository import tool_repository
 from core.agents.base_agent import (
@@ -69,26 +46,30 @@ from core.agents.base_agent import (
 )
 from core.agents.reflector_agent import ReflectorOutput 
 from core.agents.scorer_agent import ScorerOutput
-from core.utils.video_processor import get_video_metadata
 
-from backend.constants import DEFAULT_NUM_KEYFRAMES_TO_EXTRACT
-from backend.database.database import get_db, VideoModel
+from backend.config.config import settings as backend_settings
+from backend.constants import DEFAULT_NUM_KEYFRAMES_TO_EXTRACT, IndexJobStatus
+from backend.database.database import get_db, VideoModel, IndexJobModel
 from backend.helpers import (
-    save_audio_to_minio,
-    save_video_to_minio,
-    save_video_in_db
+    save_upload_to_temp_dir,
+    find_video_by_content_hash
 )
+from backend.jobs import IndexJobManager
+from backend.checkpoints import IndexingCheckpoint
 from backend.schemas.video import (
     VideoListResponse,
     VideoResponse,
     VideoInDBBase
 )
+from backend.schemas.index_job import (
+    IndexJobResponse,
+    IndexJobCreateResponse
+)
 from backend.dependencies.clients import (
     get_minio_client_dependency, 
     get_qdrant_client_dependency, 
     get_gemini_client_dependency,
-    get_audio_segment_retriever_dependency, 
-    get_video_keyframe_retriever_dependency
+    get_index_job_manager_dependency
 )
 
 class PipelineInput(BaseModel):
@@ -123,264 +104,262 @@ async def health_check():
     """
     return {"status": "healthy"}
 
-@router.post("/index_video", status_code=201)
-async def index_video_endpoint(
-    request: Request, # Inject the current Request object to access the app.state object 
+def _find_duplicate_upload(
+    db: Session, 
+    index_job_manager: IndexJobManager, 
+    content_hash: str
+) -> Tuple[Optional[IndexJobModel], Optional[VideoModel]]:
+    """
+    Looks for a previous upload of the same file content.
+    Returns (job, video): an in-progress job for the same content (video is None), or the already indexed 
+    video together with its latest completed job (which may be None for videos indexed before jobs existed).
+    """
+    active_job = index_job_manager.find_active_job_by_content_hash(db, content_hash)
+    if active_job is not None:
+        return active_job, None
+
+    existing_video = find_video_by_content_hash(db, content_hash)
+    if existing_video is None:
+        return None, None
+
+    latest_job = db.query(IndexJobModel).filter(
+        IndexJobModel.video_id == existing_video.id,
+        IndexJobModel.status == IndexJobStatus.COMPLETED.value
+    ).order_by(IndexJobModel.created_at.desc()).first()
+
+    return latest_job, existing_video
+
+@router.post(
+    "/index_jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=IndexJobCreateResponse
+)
+async def create_index_job_endpoint(
+    request: Request, 
+    response: Response,
     video_file: UploadFile = File(..., description="The video file to be processed and indexed."),
     video_id: Optional[str] = Form(None, description="Optional custom video ID. Auto-generated if not provided."),
-    num_keyframes_to_extract: int = Form(DEFAULT_NUM_KEYFRAMES_TO_EXTRACT, description="Number of keyframes to extract.", ge=1, le=100), # Added ge and le for validation
+    num_keyframes_to_extract: int = Form(DEFAULT_NUM_KEYFRAMES_TO_EXTRACT, description="Number of keyframes to extract.", ge=1, le=100),
+    force_reindex: bool = Form(False, description="Index the video even if an identical file was already uploaded."),
     db: Session = Depends(get_db), 
-    minio_client: MinIOClient = Depends(get_minio_client_dependency), 
-    gemini_client: genai.Client = Depends(get_gemini_client_dependency),
-    audio_segment_retriever: AudioSegmentRetriever = Depends(get_audio_segment_retriever_dependency), 
-    video_keyframe_retriever: VideoKeyframeRetriever = Depends(get_video_keyframe_retriever_dependency)
+    index_job_manager: IndexJobManager = Depends(get_index_job_manager_dependency)
 ):
     """
-    Processes a video file to extract, describe, embed, and index keyframes and audio segments.
-    A unique `video_id` will be generated if not provided.
-    `num_keyframes_to_extract` can be specified in the form data.
+    Enqueues a video for indexing and returns immediately with the job ID.
+    The indexing pipeline runs on the background index job workers; poll `GET /index_jobs/{job_id}` for progress.
+
+    If an identical file (same SHA-256) is already indexed or being indexed, no new job is created and the 
+    existing video / job is returned with `deduplicated: true` (status 200), unless `force_reindex` is set.
     """
-    start_time_total = time.time()
     processing_video_id = video_id if video_id else str(uuid.uuid4())
-    print(f"\n--- Starting Video Indexing for video_id: {processing_video_id} ---")
-    print(f"Number of keyframes to extract: {num_keyframes_to_extract}")
 
+    try:
+        temp_dir, video_file_path, original_filename, content_hash = await run_in_threadpool(save_upload_to_temp_dir, video_file)
+    except Exception as e:
+        print(f"Error saving uploaded video for video_id '{processing_video_id}': {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to save the uploaded video: {str(e)}")
+
+    if not force_reindex:
+        duplicate_job, duplicate_video = _find_duplicate_upload(db, index_job_manager, content_hash)
+        if duplicate_job is not None or duplicate_video is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            print(f"Upload '{original_filename}' is a duplicate (sha256: {content_hash}). Skipping indexing.")
+            response.status_code = status.HTTP_200_OK
+
+            return IndexJobCreateResponse(
+                job_id=duplicate_job.id if duplicate_job else None, 
+                video_id=duplicate_video.id if duplicate_video else duplicate_job.video_id, 
+                status=duplicate_job.status if duplicate_job else IndexJobStatus.COMPLETED.value, 
+                status_url=str(request.url_for("get_index_job_endpoint", job_id=duplicate_job.id)) if duplicate_job else None,
+                deduplicated=True
+            )
 
-    temp_dir = mkdtemp()
-    # Ensure filename from UploadFile is sanitized or use a fixed name for robustness
-    original_filename = video_file.filename if video_file.filename else "uploaded_video"
-    base, ext = os.path.splitext(original_filename)
-    safe_filename = "".join(c if c.isalnum() or c in ['.', '_'] else '_' for c in base) + (ext if ext else ".mp4")
-    video_file_path = os.path.join(temp_dir, safe_filename)
+    try:
+        db_job = index_job_manager.create_job(
+            db=db, 
+            video_id=processing_video_id, 
+            filename=original_filename, 
+            num_keyframes_requested=num_keyframes_to_extract,
+            content_hash=content_hash
+        )
+    except Exception as e:
+        db.rollback()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        print(f"Error creating index job for video_id '{processing_video_id}': {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to create the index job: {str(e)}")
+
+    index_job_manager.submit(
+        job_id=db_job.id, 
+        video_file_path=video_file_path, 
+        temp_dir=temp_dir, 
+        original_filename=original_filename, 
+        video_id=processing_video_id, 
+        num_keyframes_to_extract=num_keyframes_to_extract,
+        content_hash=content_hash
+    )
 
-    extracted_audio_file_path = None
+    return IndexJobCreateResponse(
+        job_id=db_job.id, 
+        video_id=processing_video_id, 
+        status=db_job.status, 
+        status_url=str(request.url_for("get_index_job_endpoint", job_id=db_job.id))
+    )
 
-    try:
-        print(f"Saving uploaded video to: {video_file_path}")
-        with open(video_file_path, "wb") as buffer:
-            shutil.copyfileobj(video_file.file, buffer)
-        print(f"Video saved successfully.")
-
-        # Extract the video metadata 
-        video_metadata = get_video_metadata(video_file_path)
-                
-        # --- Retrieve necessary models and clients from app.state ---
-        resnet_model = request.app.state.models["resnet_model"]
-        resnet_transform = request.app.state.models["resnet_transform"]
-        clip_model = request.app.state.models["clip_model"]
-        clip_processor = request.app.state.models["clip_processor"]
-        sentence_transformers_model = request.app.state.models["sentence_transformer"]
-
-        whisper_model = request.app.state.models["whisper_model"]
-        diarization_model = request.app.state.models["diarization_model"]
-        audio_emotion_classification_model = request.app.state.models["audio_emotion_classification_model"]
-        clap_model = request.app.state.models["clap_model"]
-        clap_processor = request.app.state.models["clap_processor"]
-
-        # Keyframe extraction and indexing
-        print(f"\n--- Extracting Keyframes from '{video_file_path}' ---")
-        kf_start_time = time.time()
-        extracted_keyframes_data: List[Tuple[Image.Image, float]] = extract_keyframes_by_clustering(
-            video_path=video_file_path,
-            num_keyframes=num_keyframes_to_extract,
-            resnet_model=resnet_model,
-            resnet_transform=resnet_transform,
-            frame_sample_rate=1,
-            batch_size=64,
-            embedding_method="resnet"
+@router.get("/index_jobs/{job_id}", response_model=IndexJobResponse)
+async def get_index_job_endpoint(
+    job_id: str, 
+    db: Session = Depends(get_db)
+):
+    """Retrieves the status and per-stage progress of an index job."""
+    db_job = db.query(IndexJobModel).filter(IndexJobModel.id == job_id).first()
+    if db_job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"Index job with ID '{job_id}' not found."
         )
-        print(f"Keyframe extraction completed in {time.time() - kf_start_time:.2f} seconds.")
 
-        if not extracted_keyframes_data:
-            print("No keyframes extracted. Skipping keyframe indexing.")
-        else:
-            print(f"Successfully extracted {len(extracted_keyframes_data)} keyframes.")
-            keyframe_pil_images = [pil_image for (pil_image, _) in extracted_keyframes_data]
-
-            print("Generating keyframe descriptions with Gemini...")
-            desc_start_time = time.time()
-            gemini_image_processor = GeminiImageBatchProcessor(
-                client=gemini_client,
-                prompt_template=OSCE_KEYFRAME_CAPTIONER_PROMPT,
-                output_schema=KeyframeDescriptionOutput,
-                rate_limit_calls=10,
-                rate_limit_period=60,
-                max_retries=5,
-                max_backoff=120,
-                max_workers=4,
-            )
-            keyframe_descriptions_raw = gemini_image_processor.process_batch(keyframe_pil_images)
-            keyframe_descriptions = []
-            for desc_data in keyframe_descriptions_raw:
-                if isinstance(desc_data, dict): keyframe_descriptions.append(desc_data)
-                elif hasattr(desc_data, 'model_dump'): keyframe_descriptions.append(desc_data.model_dump())
-                else: keyframe_descriptions.append({"description": str(desc_data)})
-            print(f"Keyframe description generation took {time.time() - desc_start_time:.2f} seconds.")
-
-            print("Generating CLIP embeddings for keyframes...")
-            clip_emb_start_time = time.time()
-            keyframe_images_clip_embeddings = generate_clip_image_embeddings_batch(
-                pil_images=keyframe_pil_images, model=clip_model, processor=clip_processor,
-            )
-            print(f"CLIP embedding generation took {time.time() - clip_emb_start_time:.2f} seconds.")
+    return IndexJobResponse.model_validate(db_job)
 
-            print("Generating Sentence embeddings for keyframe descriptions...")
-            sent_emb_start_time = time.time()
-            keyframe_descriptions_sent_embeddings = generate_sentence_embeddings_batch(
-                texts=[d.get("description", "") for d in keyframe_descriptions], model=sentence_transformers_model
-            )
-            print(f"Sentence embedding generation took {time.time() - sent_emb_start_time:.2f} seconds.")
-
-            print("Indexing keyframes...")
-            index_kf_start_time = time.time()
-            index_keyframes(
-                video_id=processing_video_id,
-                extracted_keyframes_data=extracted_keyframes_data,
-                keyframe_images_clip_embeddings=keyframe_images_clip_embeddings,
-                keyframe_descriptions_sent_embeddings=keyframe_descriptions_sent_embeddings,
-                keyframe_descriptions=keyframe_descriptions,
-                minio_client=minio_client,
-                video_keyframe_retriever=video_keyframe_retriever
-            )
-            print(f"Keyframe indexing took {time.time() - index_kf_start_time:.2f} seconds.")
+@router.post(
+    "/index_jobs/{job_id}/resume",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=IndexJobCreateResponse
+)
+async def resume_index_job_endpoint(
+    request: Request, 
+    job_id: str, 
+    db: Session = Depends(get_db), 
+    index_job_manager: IndexJobManager = Depends(get_index_job_manager_dependency)
+):
+    """
+    Re-queues a failed index job. The pipeline resumes from the first incomplete stage, loading the outputs 
+    of the completed stages (keyframes, captions, embeddings, transcripts, upload receipts) from the job's checkpoint.
+    """
+    db_job = db.query(IndexJobModel).filter(IndexJobModel.id == job_id).first()
+    if db_job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"Index job with ID '{job_id}' not found."
+        )
 
-        # Audio extraction and indexing 
-        print(f"\n--- Extracting and Processing Audio from '{video_file_path}' ---")
-        audio_start_time = time.time()
+    if db_job.status != IndexJobStatus.FAILED.value:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, 
+            detail=f"Only failed index jobs can be resumed (job '{job_id}' is {db_job.status})."
+        )
 
-        print("Extracting audio track...")
-        extracted_audio_file_path = extract_audio(
-            video_path=video_file_path
+    source_video_path = IndexingCheckpoint(db_job.id).get_source_video_path()
+    if source_video_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, 
+            detail=f"No checkpoint is available for index job '{job_id}'. Upload the video again to re-index it."
         )
 
-        if not extracted_audio_file_path or not os.path.exists(extracted_audio_file_path):
-            print("Audio extraction failed. Skipping audio indexing.")
-        else:
-            print(f"Audio extracted to: {extracted_audio_file_path}")
-
-            print("Processing audio segments (transcription, diarization, emotion)...")
-            extracted_audio_segments = process_audio_segments(
-                audio_path=extracted_audio_file_path,
-                whisper_model=whisper_model,
-                diarization_model=diarization_model,
-                audio_emotion_classification_model=audio_emotion_classification_model,
-                sampling_rate=DEFAULT_SAMPLING_RATE
-            )
-            audio_proc_time = time.time()
-            print(f"Audio segment processing took {audio_proc_time - audio_start_time:.2f} seconds (excluding embeddings).")
+    db_job = index_job_manager.reset_job_for_resume(db, db_job)
+    index_job_manager.submit(
+        job_id=db_job.id, 
+        video_file_path=source_video_path, 
+        temp_dir=None, 
+        original_filename=db_job.filename, 
+        video_id=db_job.video_id, 
+        num_keyframes_to_extract=db_job.num_keyframes_requested or DEFAULT_NUM_KEYFRAMES_TO_EXTRACT,
+        content_hash=db_job.content_hash
+    )
 
+    return IndexJobCreateResponse(
+        job_id=db_job.id, 
+        video_id=db_job.video_id, 
+        status=db_job.status, 
+        status_url=str(request.url_for("get_index_job_endpoint", job_id=db_job.id))
+    )
 
-            if not extracted_audio_segments:
-                print("No audio segments processed. Skipping audio indexing.")
-            else:
-                print(f"Successfully processed {len(extracted_audio_segments)} audio segments.")
-                print("Generating CLAP embeddings for audio segments...")
-                clap_emb_start_time = time.time()
-
-                clap_audio_data_list = []
-
-                for segment in extracted_audio_segments:
-                    if "audio" in segment and isinstance(segment["audio"], np.ndarray):
-                         clap_audio_data_list.append(segment["audio"])
-                    else:
-                        print(f"Warning: Missing or invalid audio data for CLAP for a segment. Skipping.")
-
-                print("CLAP audio data list: ", clap_audio_data_list)
-
-                audio_segments_clap_embeddings = [] # Initialize
-                if clap_audio_data_list:
-                    audio_segments_clap_embeddings = generate_clap_audio_embeddings_batch(
-                        audio_data_list=clap_audio_data_list, 
-                        model=clap_model, 
-                        processor=clap_processor,
-                    )
-                    print(f"CLAP audio embedding generation took {time.time() - clap_emb_start_time:.2f} seconds.")
-                else:
-                    print("No valid audio data found for CLAP embedding generation.")
-
-
-                print("Generating Sentence embeddings for audio transcripts...")
-                audio_sent_emb_start_time = time.time()
-                audio_segments_transcript_sentence_embeddings = generate_sentence_embeddings_batch(
-                    texts=[segment.get("transcript", "") for segment in extracted_audio_segments], model=sentence_transformers_model,
-                )
-                print(f"Sentence transcript embedding generation took {time.time() - audio_sent_emb_start_time:.2f} seconds.")
-
-                print(audio_segments_clap_embeddings, audio_segments_transcript_sentence_embeddings)
-
-                clap_embeddings_exist = audio_segments_clap_embeddings is not None and len(audio_segments_clap_embeddings) > 0
-                transcript_embeddings_exist = audio_segments_transcript_sentence_embeddings is not None and len(audio_segments_transcript_sentence_embeddings) > 0
-
-                if clap_embeddings_exist or transcript_embeddings_exist:
-                    print("Indexing audio segments...")
-                    index_audio_start_time = time.time()
-                    index_audio_segments(
-                        video_id=processing_video_id,
-                        processed_audio_segments=extracted_audio_segments,
-                        audio_segments_clap_embeddings=audio_segments_clap_embeddings if clap_embeddings_exist else [],
-                        audio_segments_transcript_sentence_embeddings=audio_segments_transcript_sentence_embeddings if transcript_embeddings_exist else [],
-                        minio_client=minio_client,
-                        audio_segment_retriever=audio_segment_retriever
-                    )
-                    print(f"Audio segment indexing took {time.time() - index_audio_start_time:.2f} seconds.")
-                else:
-                    print("Skipping audio segment indexing as no embeddings were generated.")
-                    if not clap_embeddings_exist:
-                        print("Reason: CLAP embeddings are missing or empty.")
-                    if not transcript_embeddings_exist:
-                        print("Reason: Transcript sentence embeddings are missing or empty.")
-
-
-        total_processing_time = time.time() - start_time_total
-        print(f"--- Video Indexing for '{processing_video_id}' completed in {total_processing_time:.2f} seconds ---")
-
-        # Save the video data in the database 
-        minio_video_path = save_video_to_minio(
-            video_file_path=video_file_path, 
-            video_filename=original_filename, 
-            minio_client=minio_client 
-        )
+@router.post("/index_video", status_code=201)
+async def index_video_endpoint(
+    response: Response,
+    video_file: UploadFile = File(..., description="The video file to be processed and indexed."),
+    video_id: Optional[str] = Form(None, description="Optional custom video ID. Auto-generated if not provided."),
+    num_keyframes_to_extract: int = Form(DEFAULT_NUM_KEYFRAMES_TO_EXTRACT, description="Number of keyframes to extract.", ge=1, le=100), # Added ge and le for validation
+    force_reindex: bool = Form(False, description="Index the video even if an identical file was already uploaded."),
+    db: Session = Depends(get_db), 
+    index_job_manager: IndexJobManager = Depends(get_index_job_manager_dependency)
+):
+    """
+    Processes a video file to extract, describe, embed, and index keyframes and audio segments.
+    A unique `video_id` will be generated if not provided.
+    `num_keyframes_to_extract` can be specified in the form data.
 
-        minio_audio_path = save_audio_to_minio(
-            audio_file_path=extracted_audio_file_path, 
-            video_filename=original_filename, 
-            video_id=processing_video_id, 
-            minio_client=minio_client 
-        )
+    The pipeline runs on the index job workers; this endpoint awaits the job without blocking the event loop.
+    Use `POST /index_jobs` to enqueue a video and poll for progress instead of waiting for completion.
 
-        saved_video = save_video_in_db(
+    If an identical file (same SHA-256) was already indexed, the existing video is returned with 
+    `deduplicated: true` (status 200) instead of re-running the pipeline, unless `force_reindex` is set.
+    If it is currently being indexed, the running job is awaited instead of starting a new one.
+    """
+    processing_video_id = video_id if video_id else str(uuid.uuid4())
+    temp_dir = None
+
+    try:
+        temp_dir, video_file_path, original_filename, content_hash = await run_in_threadpool(save_upload_to_temp_dir, video_file)
+
+        duplicate_job, duplicate_video = (None, None) if force_reindex else _find_duplicate_upload(db, index_job_manager, content_hash)
+        duplicate_future = index_job_manager.get_future(duplicate_job.id) if duplicate_job and not duplicate_video else None
+
+        if duplicate_video is not None or duplicate_future is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            print(f"Upload '{original_filename}' is a duplicate (sha256: {content_hash}). Skipping indexing.")
+            response.status_code = status.HTTP_200_OK
+
+            if duplicate_future is not None:
+                result = await asyncio.wrap_future(duplicate_future)
+                return {**result, "job_id": duplicate_job.id, "deduplicated": True}
+
+            return {
+                "video_id": duplicate_video.id,
+                "message": f"Video with identical content was already indexed as '{duplicate_video.id}'.",
+                "video": VideoInDBBase.model_validate(duplicate_video).model_dump(mode="json"),
+                "num_keyframes_requested": num_keyframes_to_extract,
+                "job_id": duplicate_job.id if duplicate_job else None,
+                "deduplicated": True
+            }
+
+        db_job = index_job_manager.create_job(
             db=db, 
             video_id=processing_video_id, 
-            video_metadata=video_metadata, 
-            video_filename=original_filename, 
-            minio_video_path=minio_video_path, 
-            minio_audio_path=minio_audio_path
-        )        
-
-        return {
-            "video_id": processing_video_id,
-            "message": "Video processed and indexed successfully.",
-            "video": saved_video,
-            "num_keyframes_extracted_actual": len(extracted_keyframes_data) if extracted_keyframes_data else 0,
-            "num_keyframes_requested": num_keyframes_to_extract,
-            "processing_time_seconds": round(total_processing_time, 2)
-        }
-
-    except ValueError as ve: # Catch Pydantic validation errors for Form data
-        print(f"Validation error for form data: {ve}")
-        raise HTTPException(status_code=422, detail=str(ve))
-    
+            filename=original_filename, 
+            num_keyframes_requested=num_keyframes_to_extract,
+            content_hash=content_hash
+        )
+
     except Exception as e:
+        db.rollback()
+        if temp_dir and os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir, ignore_errors=True)
         print(f"Error during video indexing for video_id '{processing_video_id}': {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"An error occurred during video processing: {str(e)}")
 
-    finally:
-        if os.path.exists(temp_dir):
-            print(f"Cleaning up temporary directory: {temp_dir}")
-            shutil.rmtree(temp_dir)
-        if video_file and hasattr(video_file, 'file') and not video_file.file.closed:
-            video_file.file.close()
+    future = index_job_manager.submit(
+        job_id=db_job.id, 
+        video_file_path=video_file_path, 
+        temp_dir=temp_dir, 
+        original_filename=original_filename, 
+        video_id=processing_video_id, 
+        num_keyframes_to_extract=num_keyframes_to_extract,
+        content_hash=content_hash
+    )
+
+    try:
+        result = await asyncio.wrap_future(future)
+        return {**result, "job_id": db_job.id}
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        print(f"Error during video indexing for video_id '{processing_video_id}': {e}")
+        raise HTTPException(status_code=500, detail=f"An error occurred during video processing: {str(e)}")
 
 @router.post(
     "/assess_video",
@@ -440,7 +419,7 @@ async def assess_video_pipeline(
     selected_tools: Optional[List[Tool]] = None
     planner_selected_tool_names: List[str] = []
     try:
-        selected_tools = planner_agent.run(rubric_question=payload.rubric_question)
+        selected_tools = await planner_agent.run_async(rubric_question=payload.rubric_question)
         if selected_tools:
             planner_selected_tool_names = [tool.TOOL_NAME for tool in selected_tools]
             print(f"Planner selected tools: {planner_selected_tool_names}")
@@ -467,7 +446,7 @@ async def assess_video_pipeline(
     try:
         if use_all_tools:
             # Using the whole tool repository
-            executor_output = executor_agent.run(
+            executor_output = await executor_agent.run_async(
                 rubric_question=payload.rubric_question,
                 selected_tools=tool_repository, # selected_tools from Planner
                 video_id=payload.video_id,
@@ -475,7 +454,7 @@ async def assess_video_pipeline(
                 video_file_path="./sample_osce_videos/testvideo.mp4"
             )
         else:
-            executor_output = executor_agent.run(
+            executor_output = await executor_agent.run_async(
                 rubric_question=payload.rubric_question,
                 selected_tools=selected_tools, # selected_tools from Planner
                 video_id=payload.video_id,
@@ -493,7 +472,7 @@ async def assess_video_pipeline(
     scorer_result_dict: Optional[Dict] = None # Store as dict for Pydantic model
     try:
         if executor_output: # Only run scorer if there's some evidence
-            scorer_result_dict = scorer_agent.run(
+            scorer_result_dict = await scorer_agent.run_async(
                 rubric_question=payload.rubric_question,
                 evidence_from_executor=executor_output
             )
@@ -519,7 +498,7 @@ async def assess_video_pipeline(
     reflector_result_dict: Optional[Dict] = None
     try:
         if scorer_result_dict: 
-            reflector_result_dict = reflector_agent.run(
+            reflector_result_dict = await reflector_agent.run_async(
                 rubric_question=payload.rubric_question,
                 evidence_from_executor=executor_output,
                 scorer_output=scorer_result_dict # Pass the dict from scorer_agent.run
@@ -635,7 +614,7 @@ async def assess_video_with_yaml_pipeline(
     selected_tools: Optional[List[Tool]] = None
     planner_selected_tool_names: List[str] = []
     try:
-        selected_tools = planner_agent.run(rubric_question=rubric_question)
+        selected_tools = await planner_agent.run_async(rubric_question=rubric_question)
         if selected_tools:
             planner_selected_tool_names = [tool.TOOL_NAME for tool in selected_tools]
             print(f"Planner selected tools: {planner_selected_tool_names}")
@@ -657,7 +636,7 @@ async def assess_video_with_yaml_pipeline(
 
     try:
         if use_all_tools:
-            executor_output = executor_agent.run(
+            executor_output = await executor_agent.run_async(
                 rubric_question=rubric_question,
                 selected_tools=tool_repository,
                 video_id=payload.video_id,
@@ -665,7 +644,7 @@ async def assess_video_with_yaml_pipeline(
                 video_file_path="./sample_osce_videos/testvideo.mp4"
             )
         else:
-            executor_output = executor_agent.run(
+            executor_output = await executor_agent.run_async(
                 rubric_question=rubric_question,
                 selected_tools=selected_tools,
                 video_id=payload.video_id,
@@ -682,7 +661,7 @@ async def assess_video_with_yaml_pipeline(
     scorer_result_dict: Optional[Dict] = None
     try:
         if executor_output:
-            scorer_result_dict = scorer_agent.run(
+            scorer_result_dict = await scorer_agent.run_async(
                 rubric_question=rubric_question,
                 evidence_from_executor=executor_output
             )
@@ -705,7 +684,7 @@ async def assess_video_with_yaml_pipeline(
     reflector_result_dict: Optional[Dict] = None
     try:
         if scorer_result_dict: 
-            reflector_result_dict = reflector_agent.run(
+            reflector_result_dict = await reflector_agent.run_async(
                 rubric_question=rubric_question,
                 evidence_from_executor=executor_output,
                 scorer_output=scorer_result_dict
@@ -878,6 +857,20 @@ async def delete_video_details_by_id(
         else:
             print(f"Warning: Failed to delete video {db_video.minio_video_path} from MinIO.")
 
+    # Cached frame embeddings are keyed by the file content: keep them if another video has the same content
+    if db_video.content_hash:
+        same_content_video = db.query(VideoModel).filter(
+            VideoModel.content_hash == db_video.content_hash,
+            VideoModel.id != video_id
+        ).first()
+
+        if same_content_video is None:
+            try:
+                FrameEmbeddingCache(backend_settings.keyframe_extraction.frame_embedding_cache_dir).delete_video(db_video.content_hash)
+                print(f"Deleted cached frame embeddings for content hash: {db_video.content_hash}")
+            except OSError as e:
+                print(f"Warning: Failed to delete cached frame embeddings for {db_video.content_hash}: {e}")
+
     # TODO: Maybe delete the Qdrant vectors for the video (from the video keyframes collection and audio segments collection)
 
     try: 
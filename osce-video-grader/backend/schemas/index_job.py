@@ -0,0 +1,35 @@
+from datetime import datetime 
+from typing import Optional, Dict, Any 
+
+from pydantic import BaseModel, ConfigDict
+
+class IndexJobStage(BaseModel):
+    status: str 
+    started_at: Optional[datetime] = None 
+    completed_at: Optional[datetime] = None 
+    duration_seconds: Optional[float] = None 
+
+class IndexJobResponse(BaseModel):
+    id: str 
+    video_id: str 
+    filename: str 
+    num_keyframes_requested: Optional[int] = None 
+    status: str 
+    current_stage: Optional[str] = None 
+    stages: Dict[str, IndexJobStage] = {}
+    progress: float = 0.0 
+    result: Optional[Dict[str, Any]] = None 
+    error: Optional[str] = None 
+    created_at: datetime 
+    started_at: Optional[datetime] = None 
+    completed_at: Optional[datetime] = None 
+    updated_at: datetime 
+
+    model_config = ConfigDict(from_attributes=True)
+
+class IndexJobCreateResponse(BaseModel):
+    job_id: Optional[str] = None # None if the upload is a duplicate of a video indexed without a job
+    video_id: str 
+    status: str 
+    status_url: Optional[str] = None 
+    deduplicated: bool = False # True if the upload matched an already indexed (or in-progress) video
\ No newline at end of file
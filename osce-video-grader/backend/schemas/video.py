@@ -17,6 +17,7 @@ class VideoCreate(VideoBase):
     filename: str 
     minio_video_path: str 
     minio_audio_path: Optional[str] = None 
+    content_hash: Optional[str] = None 
 
 class VideoUpdate(VideoBase):
     pass
@@ -26,6 +27,7 @@ class VideoInDBBase(VideoBase):
     filename: str 
     minio_video_path: str 
     minio_audio_path: Optional[str] = None 
+    content_hash: Optional[str] = None 
     created_at: datetime 
     updated_at: datetime 
 
@@ -1,4 +1,5 @@
 import os 
+import asyncio
 from typing import List, Optional, Dict, Any 
 
 from google import genai 
@@ -114,6 +115,78 @@ class Executor:
             print(f"Error instantiating tool '{tool_name}': {e}")
             return None
         
+    def _video_search_filter(self, video_id: str) -> QdrantFilter:
+        return QdrantFilter(
+            must=[
+                FieldCondition(
+                    key="video_id",
+                    match=MatchValue(value=video_id)
+                )
+            ]
+        )
+
+    def _retrieve_audio_segments(
+        self, 
+        rubric_question: str, 
+        search_filter: QdrantFilter
+    ) -> List[SearchResult[AudioSegmentMetadata]]:
+        print("Executor: Retrieving audio segments...")
+
+        query_clap_emb = generate_clap_text_embedding(
+            text=rubric_question, 
+            model=self.clap_model, 
+            processor=self.clap_processor
+        )
+
+        query_sentence_emb = generate_sentence_embedding(
+            text_input=rubric_question, 
+            model=self.sentence_transformers_model
+        )
+
+        retrieved_audio_segments = retrieve_relevant_audio_segments(
+            rubric_question=rubric_question,
+            retriever=self.audio_segment_retriever,
+            minio_client=self.minio_client,
+            search_filter=search_filter,
+            query_clap_emb=query_clap_emb, 
+            query_sentence_emb=query_sentence_emb,
+            score_threshold=self.DEFAULT_AUDIO_SEGMENT_RETRIEVER_SCORE_THRESHOLD
+        )
+
+        print(f"Executor: Retrieved {len(retrieved_audio_segments)} relevant audio segments.")
+        return retrieved_audio_segments
+
+    def _retrieve_video_keyframes(
+        self, 
+        rubric_question: str, 
+        search_filter: QdrantFilter
+    ) -> List[SearchResult[VideoKeyframeMetadata]]:
+        print(f"Executor: Retrieving video keyframes for '{rubric_question}'...")
+
+        query_clip_emb = generate_clip_text_embedding( 
+            text=rubric_question, 
+            model=self.clip_model,
+            processor=self.clip_processor
+        )
+
+        query_sentence_emb = generate_sentence_embedding(
+            text_input=rubric_question, 
+            model=self.sentence_transformers_model
+        )
+
+        retrieved_video_keyframes = retrieve_relevant_keyframes(
+            rubric_question=rubric_question, 
+            query_clip_emb=query_clip_emb, 
+            query_sentence_emb=query_sentence_emb, 
+            retriever=self.video_keyframe_retriever, 
+            minio_client=self.minio_client, 
+            search_filter=search_filter,
+            score_threshold=self.DEFAULT_VIDEO_KEYFRAME_RETRIEVER_SCORE_THRESHOLD
+        )
+
+        print(f"Executor: Retrieved {len(retrieved_video_keyframes)} relevant video keyframes.")
+        return retrieved_video_keyframes
+
     def run(
         self, 
         rubric_question: str, 
@@ -133,14 +206,7 @@ class Executor:
 
         selected_tool_names = [tool.TOOL_NAME for tool in selected_tools]
 
-        search_filter = QdrantFilter(
-            must=[
-                FieldCondition(
-                    key="video_id",
-                    match=MatchValue(value=video_id)
-                )
-            ]
-        )
+        search_filter = self._video_search_filter(video_id)
 
         for tool_name in selected_tool_names:
             tool_instance = self._get_tool_instance(tool_name)
@@ -156,61 +222,15 @@ class Executor:
 
                 if tool_category == ToolCategory.AUDIO:
                     if retrieved_audio_segments_cache is None:
-                        print("Executor: Retrieving audio segments...")
-
-                        query_clap_emb = generate_clap_text_embedding(
-                            text=rubric_question, 
-                            model=self.clap_model, 
-                            processor=self.clap_processor
-                        )
-
-                        query_sentence_emb = generate_sentence_embedding(
-                            text_input=rubric_question, 
-                            model=self.sentence_transformers_model
-                        )
-
-                        retrieved_audio_cache = retrieve_relevant_audio_segments(
-                            rubric_question=rubric_question,
-                            retriever=self.audio_segment_retriever,
-                            minio_client=self.minio_client,
-                            search_filter=search_filter,
-                            query_clap_emb=query_clap_emb, 
-                            query_sentence_emb=query_sentence_emb,
-                            score_threshold=self.DEFAULT_AUDIO_SEGMENT_RETRIEVER_SCORE_THRESHOLD
-                        )
-
-                        print(f"Executor: Retrieved {len(retrieved_audio_cache)} relevant audio segments.")
+                        retrieved_audio_segments_cache = self._retrieve_audio_segments(rubric_question, search_filter)
                         
                     tool_outputs[tool_name] = tool_instance.run(
-                        retrieved_audio_segments_results=retrieved_audio_cache
+                        retrieved_audio_segments_results=retrieved_audio_segments_cache
                     )
 
                 elif tool_category == ToolCategory.VISUAL: 
                     if retrieved_video_keyframes_cache is None: 
-                        print(f"Executor: Retrieving video keyframes for '{rubric_question}'...")
-
-                        query_clip_emb = generate_clip_text_embedding( 
-                            text=rubric_question, 
-                            model=self.clip_model,
-                            processor=self.clip_processor
-                        )
-
-                        query_sentence_emb = generate_sentence_embedding(
-                            text_input=rubric_question, 
-                            model=self.sentence_transformers_model
-                        )
-
-                        retrieved_video_keyframes_cache = retrieve_relevant_keyframes(
-                            rubric_question=rubric_question, 
-                            query_clip_emb=query_clip_emb, 
-                            query_sentence_emb=query_sentence_emb, 
-                            retriever=self.video_keyframe_retriever, 
-                            minio_client=self.minio_client, 
-                            search_filter=search_filter,
-                            score_threshold=self.DEFAULT_VIDEO_KEYFRAME_RETRIEVER_SCORE_THRESHOLD
-                        )
-
-                        print(f"Executor: Retrieved {len(retrieved_video_keyframes_cache)} relevant video keyframes.")
+                        retrieved_video_keyframes_cache = self._retrieve_video_keyframes(rubric_question, search_filter)
 
                     tool_outputs[tool_name] = tool_instance.run(
                         retrieved_keyframes_result=retrieved_video_keyframes_cache
@@ -246,5 +266,98 @@ class Executor:
                 tool_outputs[tool_name] = None
                 continue
 
+        print("\nExecutor: Completed running all selected tools.")
+        return tool_outputs
+
+    async def run_async(
+        self, 
+        rubric_question: str, 
+        selected_tools: List[Tool],
+        video_file_path: Optional[str] = None, 
+        video_id: Optional[str] = None, 
+        action_vocabulary: Optional[Dict[str, str]] = None 
+    ):
+        """
+        Async version of `run`: the retrievals needed by the selected tools run once each in worker threads
+        (embedding models, Qdrant), then all the tools run concurrently, awaiting Gemini through the async API.
+        """
+        if not video_id:
+            print("Error: video_id must be provided to Executor.")
+            return {"error": "video_id is missing."}
+
+        selected_tool_names = [tool.TOOL_NAME for tool in selected_tools]
+        tool_instances = {tool_name: self._get_tool_instance(tool_name) for tool_name in selected_tool_names}
+        tool_categories = {tool_instance.TOOL_CATEGORY for tool_instance in tool_instances.values() if tool_instance}
+
+        search_filter = self._video_search_filter(video_id)
+
+        async def retrieve(category: ToolCategory, retrieve_fn):
+            if category not in tool_categories:
+                return None
+            return await asyncio.to_thread(retrieve_fn, rubric_question, search_filter)
+
+        # A failed retrieval only fails the tools that need it (as in `run`)
+        retrieved_audio_segments, retrieved_video_keyframes = await asyncio.gather(
+            retrieve(ToolCategory.AUDIO, self._retrieve_audio_segments),
+            retrieve(ToolCategory.VISUAL, self._retrieve_video_keyframes),
+            return_exceptions=True
+        )
+
+        async def run_tool(tool_name: str, tool_instance: Optional[Tool]):
+            if not tool_instance:
+                return None
+
+            print(f"\nExecutor: Preparing to run tool '{tool_name}' for rubric question: '{rubric_question}'")
+
+            try:
+                tool_category = tool_instance.TOOL_CATEGORY
+
+                if tool_category == ToolCategory.AUDIO:
+                    if isinstance(retrieved_audio_segments, Exception):
+                        raise retrieved_audio_segments
+
+                    return await tool_instance.run_async(
+                        retrieved_audio_segments_results=retrieved_audio_segments
+                    )
+
+                elif tool_category == ToolCategory.VISUAL: 
+                    if isinstance(retrieved_video_keyframes, Exception):
+                        raise retrieved_video_keyframes
+
+                    return await tool_instance.run_async(
+                        retrieved_keyframes_result=retrieved_video_keyframes
+                    )
+
+                elif tool_category == ToolCategory.TEMPORAL:
+                    cached_data = self.cache_manager.get_item(
+                        category=self.TEMPORAL_CACHE_CATEGORY,
+                        key=video_id
+                    )
+                    if cached_data is not None:
+                        print(f"Executor: Using cached output for '{tool_instance.TOOL_NAME}' (video_id: {video_id}).")
+                        return cached_data
+
+                    print(f"Executor: Running '{tool_instance.TOOL_NAME}' for video_id: {video_id} (will cache).")
+                    if not video_file_path or not os.path.exists(video_file_path):
+                        raise FileNotFoundError(f"Video file not found: {video_file_path} for temporal tool.")
+                    if not action_vocabulary:
+                        raise ValueError("Action vocabulary needed for temporal segmentation.")
+
+                    output = await tool_instance.run_async(video_file_path=video_file_path, action_vocabulary=action_vocabulary)
+
+                    self.cache_manager.set_item(
+                        category=self.TEMPORAL_CACHE_CATEGORY,
+                        key=video_id,
+                        value=output
+                    )
+                    return output
+
+            except Exception as e:
+                print(f"Error running tool '{tool_name}': {e}")
+                return None
+
+        outputs = await asyncio.gather(*(run_tool(tool_name, tool_instance) for tool_name, tool_instance in tool_instances.items()))
+        tool_outputs = dict(zip(tool_instances, outputs))
+
         print("\nExecutor: Completed running all selected tools.")
         return tool_outputs
\ No newline at end of file
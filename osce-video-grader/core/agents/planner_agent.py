@@ -3,7 +3,7 @@ from typing import List
 from google import genai 
 
 from core.tools.base import Tool
-from core.utils.gemini_utils import generate_text_content_with_gemini
+from core.utils.gemini_utils import generate_text_content_with_gemini, generate_text_content_with_gemini_async
 
 class Planner:
     def __init__(
@@ -104,38 +104,60 @@ class Planner:
 
         return prompt 
     
+    def _prepare_prompt(self, rubric_question: str) -> str:
+        if not self.tool_repository:
+            raise ValueError("Tool repository is empty. Please provide at least one tool.")
+
+        formatted_tools_string = self._format_tools_for_prompt()
+        return self._construct_prompt(
+            rubric_question=rubric_question, 
+            formatted_tools=formatted_tools_string
+        )
+
+    def _parse_selected_tools(self, response: str) -> List[Tool]:
+        if not response:
+            raise ValueError("No response received from the LLM. Please check the prompt and try again.")
+        
+        tool_names = response.strip().split(",")
+        selected_tools = []
+        for tool_name in tool_names:
+            tool_name = tool_name.strip().strip('"').strip("'")  # Clean up the tool name
+            if tool_name in self.tool_map:
+                selected_tools.append(self.tool_map[tool_name])
+            else:
+                print(f"Warning: Tool '{tool_name}' not found in the tool repository. Skipping.")
+
+        if not selected_tools:
+            raise ValueError("No valid tools selected. Please check the rubric question and the tool repository.")
+        
+        return selected_tools 
+
     def run(self, rubric_question: str) -> List[Tool]:
         try: 
-            if not self.tool_repository:
-                raise ValueError("Tool repository is empty. Please provide at least one tool.")
-
-            formatted_tools_string = self._format_tools_for_prompt()
-            prompt = self._construct_prompt(
-                rubric_question=rubric_question, 
-                formatted_tools=formatted_tools_string
-            )    
+            prompt = self._prepare_prompt(rubric_question)
 
             response = generate_text_content_with_gemini(
                 client=self.gemini_client, 
                 prompt_text=prompt
             )
 
-            if not response:
-                raise ValueError("No response received from the LLM. Please check the prompt and try again.")
-            
-            tool_names = response.strip().split(",")
-            selected_tools = []
-            for tool_name in tool_names:
-                tool_name = tool_name.strip().strip('"').strip("'")  # Clean up the tool name
-                if tool_name in self.tool_map:
-                    selected_tools.append(self.tool_map[tool_name])
-                else:
-                    print(f"Warning: Tool '{tool_name}' not found in the tool repository. Skipping.")
-
-            if not selected_tools:
-                raise ValueError("No valid tools selected. Please check the rubric question and the tool repository.")
-            
-            return selected_tools 
+            return self._parse_selected_tools(response)
+
+        except Exception as e: 
+            print(f"An error occurred while running the Planner: {e}")
+            return None 
+
+    async def run_async(self, rubric_question: str) -> List[Tool]:
+        """Async version of `run` (awaits the Gemini call instead of blocking on it)."""
+        try: 
+            prompt = self._prepare_prompt(rubric_question)
+
+            response = await generate_text_content_with_gemini_async(
+                client=self.gemini_client, 
+                prompt_text=prompt
+            )
+
+            return self._parse_selected_tools(response)
 
         except Exception as e: 
             print(f"An error occurred while running the Planner: {e}")
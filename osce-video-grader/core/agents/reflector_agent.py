@@ -6,7 +6,7 @@ from google import genai
 from pydantic import BaseModel, Field
 
 from core.tools.base import Tool, ToolCategory
-from core.utils.gemini_utils import generate_text_content_with_gemini
+from core.utils.gemini_utils import generate_text_content_with_gemini, generate_text_content_with_gemini_async
 from core.agents.scorer_agent import Scorer 
 
 class ReflectorOutput(BaseModel):
@@ -115,28 +115,23 @@ class Reflector:
         
         return prompt
 
-    def run(
+    def _prepare_prompt(
         self,
         rubric_question: str,
-        evidence_from_executor: Dict[str, List[Dict[str, Any]]], # Using the new structure
+        evidence_from_executor: Dict[str, List[Dict[str, Any]]],
         scorer_output: Dict[str, str]
-    ) -> Optional[ReflectorOutput]:
-
+    ) -> str:
         formatted_evidence = self.format_evidence_for_prompt(evidence_from_executor)
         
-        prompt = self._construct_prompt(
+        return self._construct_prompt(
             rubric_question=rubric_question,
             formatted_evidence=formatted_evidence,
             scorer_grade=scorer_output["grade"],
             scorer_rationale=scorer_output["rationale"]
         )
 
+    def _parse_response(self, response_str: str) -> Optional[Dict[str, Any]]:
         try:
-            response_str = generate_text_content_with_gemini(
-                client=self.gemini_client, 
-                prompt_text=prompt 
-            )
-
             if response_str.strip().startswith("```json"):
                 response_str = response_str.strip()[7:-3].strip()
             elif response_str.strip().startswith("```"):
@@ -161,6 +156,36 @@ class Reflector:
         
         except Exception as e: # Catches Pydantic validation errors and other issues
             print(f"An error occurred during Reflector LLM call or parsing/validation: {e}")
-            import traceback
             traceback.print_exc()
-            return None
\ No newline at end of file
+            return None
+
+    def run(
+        self,
+        rubric_question: str,
+        evidence_from_executor: Dict[str, List[Dict[str, Any]]], # Using the new structure
+        scorer_output: Dict[str, str]
+    ) -> Optional[ReflectorOutput]:
+        prompt = self._prepare_prompt(rubric_question, evidence_from_executor, scorer_output)
+
+        response_str = generate_text_content_with_gemini(
+            client=self.gemini_client, 
+            prompt_text=prompt 
+        )
+
+        return self._parse_response(response_str)
+
+    async def run_async(
+        self,
+        rubric_question: str,
+        evidence_from_executor: Dict[str, List[Dict[str, Any]]],
+        scorer_output: Dict[str, str]
+    ) -> Optional[ReflectorOutput]:
+        """Async version of `run` (awaits the Gemini call instead of blocking on it)."""
+        prompt = self._prepare_prompt(rubric_question, evidence_from_executor, scorer_output)
+
+        response_str = await generate_text_content_with_gemini_async(
+            client=self.gemini_client, 
+            prompt_text=prompt 
+        )
+
+        return self._parse_response(response_str)
@@ -1,11 +1,11 @@
 import json 
 import traceback 
-from typing import List, Dict, Any, Annotated  
+from typing import List, Dict, Any, Annotated, Optional, Tuple  
 
 from google import genai 
 from pydantic import BaseModel, Field
 
-from core.utils.gemini_utils import generate_text_content_gemini_with_retry
+from core.utils.gemini_utils import generate_text_content_gemini_with_retry, generate_text_content_gemini_with_retry_async
 
 class ScorerOutput(BaseModel):
     grade: Annotated[int, Field(strict=True, ge=0)]
@@ -137,15 +137,15 @@ class Scorer:
         """
         return prompt 
     
-    def run(
+    def _output_without_evidence(
         self, 
-        rubric_question: str, 
         evidence_from_executor: Dict[str, List[Dict[str, Any]]]
-    ):
+    ) -> Tuple[bool, Optional[Any]]:
+        """Returns (True, default output) if there is no evidence to score (no LLM call needed), else (False, None)."""
         if not evidence_from_executor:
             print("Scorer: No evidence provided from Executor (empty dictionary). Cannot score.")
-            try: return ScorerOutput(grade=0, rationale="No evidence was provided by the automated tools to assess performance on this rubric question.")
-            except Exception as e: print(f"Error creating default ScorerOutput: {e}"); return None
+            try: return True, ScorerOutput(grade=0, rationale="No evidence was provided by the automated tools to assess performance on this rubric question.")
+            except Exception as e: print(f"Error creating default ScorerOutput: {e}"); return True, None
         
         all_tools_empty = True
         for tool_name, items in evidence_from_executor.items():
@@ -157,21 +157,16 @@ class Scorer:
             print("Scorer: All tool outputs are empty. Assuming no evidence found.")
             try: 
                 output = ScorerOutput(grade=0, rationale="Automated tools ran but found no specific evidence items relevant to this rubric question.")
-                return output.model_dump()
+                return True, output.model_dump()
             
             except Exception as e: 
                 print(f"Error creating default ScorerOutput for empty tools: {e}")
-                return None
+                return True, None
 
-        formatted_evidence = self._format_evidence_for_prompt(evidence_from_executor)
-        prompt = self._construct_prompt(rubric_question, formatted_evidence)
+        return False, None
 
+    def _parse_response(self, response_str: str) -> Optional[Dict[str, Any]]:
         try:
-            response_str = generate_text_content_gemini_with_retry(
-                client=self.gemini_client, 
-                prompt_text=prompt
-            )
-
             print(response_str)
 
             if response_str.strip().startswith("```json"): response_str = response_str.strip()[7:-3].strip()
@@ -190,4 +185,43 @@ class Scorer:
         except Exception as e:
             print(f"An error occurred during Scorer LLM call or parsing/validation: {e}")
             traceback.print_exc()
-            return None
\ No newline at end of file
+            return None
+
+    def run(
+        self, 
+        rubric_question: str, 
+        evidence_from_executor: Dict[str, List[Dict[str, Any]]]
+    ):
+        no_evidence, output = self._output_without_evidence(evidence_from_executor)
+        if no_evidence:
+            return output
+
+        formatted_evidence = self._format_evidence_for_prompt(evidence_from_executor)
+        prompt = self._construct_prompt(rubric_question, formatted_evidence)
+
+        response_str = generate_text_content_gemini_with_retry(
+            client=self.gemini_client, 
+            prompt_text=prompt
+        )
+
+        return self._parse_response(response_str)
+
+    async def run_async(
+        self, 
+        rubric_question: str, 
+        evidence_from_executor: Dict[str, List[Dict[str, Any]]]
+    ):
+        """Async version of `run` (the Gemini call and its retries do not block the event loop)."""
+        no_evidence, output = self._output_without_evidence(evidence_from_executor)
+        if no_evidence:
+            return output
+
+        formatted_evidence = self._format_evidence_for_prompt(evidence_from_executor)
+        prompt = self._construct_prompt(rubric_question, formatted_evidence)
+
+        response_str = await generate_text_content_gemini_with_retry_async(
+            client=self.gemini_client, 
+            prompt_text=prompt
+        )
+
+        return self._parse_response(response_str)
@@ -6,8 +6,18 @@ _ = load_dotenv(find_dotenv())
 
 class GeminiConfig(BaseSettings):
     """Configuration for the Gemini API."""
+    model_config = SettingsConfigDict(env_prefix="GEMINI_")
+
     api_key: str = Field(..., validation_alias="GEMINI_API_KEY")
 
+    # One token bucket shared by all the text and image calls of the process (the API quota)
+    rate_limit_calls: int = 10
+    rate_limit_period_seconds: float = 60.0
+    # SQLite file holding the bucket, to share it across processes (e.g. several uvicorn workers); "" for in-process
+    rate_limiter_sqlite_path: str = ""
+    # Maximum number of in-flight async calls per event loop (the `*_async` functions of `gemini_utils`)
+    max_concurrent_requests: int = 8
+
 class QDrantConfig(BaseSettings):
     """Configuration for the Qdrant Vector Store."""
     model_config = SettingsConfigDict(env_prefix="QDRANT_")
@@ -20,6 +30,10 @@ class QDrantConfig(BaseSettings):
     audio_segments_collection_name: str = "osce-grader-audio-segments-v1"
     video_keyframes_collection_name: str = "osce-grader-video-keyframes-v1"
 
+    # Bulk indexing: points per upsert request, and number of requests sent concurrently
+    upsert_batch_size: int = 256
+    upsert_parallel: int = 4
+
 class MinIOConfig(BaseSettings):
     """Configuration for the MinIO Object Store."""
     model_config = SettingsConfigDict(env_prefix="MINIO_")
@@ -34,10 +48,48 @@ class MinIOConfig(BaseSettings):
     extracted_audios_bucket_name: str = "osce-grader-extracted-audios-bucket-v1"
     metadata_bucket_name: str = "osce-grader-metadata-bucket-v1"
 
+    # Concurrent uploads: upload threads, urllib3 connection pool size (>= upload threads) and HTTP retries
+    upload_max_workers: int = 8
+    http_pool_size: int = 16
+    http_max_retries: int = 3
+    multipart_part_size: int = 64 * 1024 * 1024 # Part size of streamed (multipart) file uploads, >= 5 MiB
+
 class HuggingFaceConfig(BaseSettings):
     """Configuration for hugging face."""
     access_token: str = Field(..., validation_alias="HF_ACCESS_TOKEN")
 
+class InferenceConfig(BaseSettings):
+    """Configuration for the ResNet / CLIP / sentence-transformer inference backend."""
+    model_config = SettingsConfigDict(env_prefix="INFERENCE_")
+
+    backend: str = "torch" # 'torch', 'torchscript', 'onnx' or 'onnx_int8'
+    export_dir: str = "./data/exported_models"
+    num_threads: int = 0 # ONNX Runtime intra-op threads (0: let ONNX Runtime decide)
+    # PyTorch intra-op threads of the whole API process (set once at startup): shared by every PyTorch model,
+    # i.e. pyannote, CLIP/ResNet/CLAP and the sentence transformer. 0: PyTorch default (one per core)
+    torch_num_threads: int = 0
+
+class AudioConfig(BaseSettings):
+    """Configuration for audio transcription, diarization and emotion classification."""
+    model_config = SettingsConfigDict(env_prefix="AUDIO_")
+
+    whisper_model_id: str = "small"
+    # Transcription: voice-activity detection drops the silent stretches, and (when batch size > 1) the speech
+    # regions are split into chunks of up to 30 s that are transcribed in batches by faster-whisper's batched pipeline
+    vad_filter: bool = True
+    transcription_batch_size: int = 8 # 1: sequential transcription of the (VAD-gated) audio
+
+    # Whisper (CTranslate2) and pyannote (PyTorch, see `InferenceConfig.torch_num_threads`) use separate thread pools;
+    # keep their sum <= the CPU cores
+    whisper_cpu_threads: int = 0 # 0: CTranslate2 default
+    concurrent_transcription_diarization: bool = True # Run Whisper and pyannote at the same time
+
+    # Speech-emotion classification of the diarized turns
+    # Turns are sorted by length and batched; the model takes no attention mask, so each batch is cropped to its
+    # shortest turn instead of zero-padded. The max window makes the longer turns equal, so they batch uncropped
+    emotion_batch_size: int = 16 # Turns per forward pass
+    emotion_max_window_seconds: float = 10.0 # Classify at most the first N seconds of a turn, 0: whole turn
+
 class Settings(BaseSettings):
     """Main settings class to hold all service configurations."""
     model_config = SettingsConfigDict(
@@ -50,5 +102,7 @@ class Settings(BaseSettings):
     minio: MinIOConfig = MinIOConfig()
     gemini: GeminiConfig = GeminiConfig()
     hf: HuggingFaceConfig = HuggingFaceConfig()
+    inference: InferenceConfig = InferenceConfig()
+    audio: AudioConfig = AudioConfig()
 
 settings = Settings()
\ No newline at end of file
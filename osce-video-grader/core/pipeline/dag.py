@@ -0,0 +1,318 @@
+import time
+import threading
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+class StageStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+# Callback invoked as `on_stage_update(stage_name, stage_status)` whenever a stage changes state
+StageUpdateCallback = Callable[[str, StageStatus], None]
+
+class StageSkipped(Exception):
+    """
+    Raised by a stage function to skip the stage (e.g. no keyframes to caption). The stages that require
+    its outputs are skipped too, while the rest of the pipeline continues.
+    If `failed` is True the stage is reported as failed instead of skipped (the pipeline still continues).
+    """
+    def __init__(self, reason: str, failed: bool = False):
+        super().__init__(reason)
+        self.failed = failed
+
+class StageTimeoutError(Exception):
+    """
+    Raised when an attempt of a stage times out. The attempt cannot be interrupted: `attempt` is the future of
+    the abandoned call, which keeps running in the background until the stage function returns.
+    """
+    def __init__(self, message: str, attempt: Future):
+        super().__init__(message)
+        self.attempt = attempt
+
+class Stage:
+    """
+    A node of a `PipelineDAG`: a function of named inputs that produces named outputs.
+
+    The function is called with one keyword argument per input (and per optional input) and returns the value of
+    its single output, or a tuple with one value per output (in declaration order) when it has several.
+    """
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        outputs: Sequence[str] = (),
+        optional_inputs: Sequence[str] = (),
+        max_concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        max_retries: int = 0,
+        retry_backoff_seconds: float = 1.0,
+        checkpointed: bool = True
+    ):
+        """
+        Args:
+            name (str): Unique stage name.
+            fn (Callable[..., Any]): The stage function.
+            inputs (Sequence[str]): Required inputs. If the stage producing one of them is skipped, this stage is skipped too.
+            outputs (Sequence[str]): Outputs produced by the stage.
+            optional_inputs (Sequence[str]): Inputs the stage waits for but that may be None (if their producer was skipped).
+            max_concurrency (Optional[int]): Maximum number of concurrent executions of this stage, across all the
+                runs of the pipeline (e.g. 1 for a stage holding a large model on the GPU). None for no limit.
+            timeout_seconds (Optional[float]): Timeout of each attempt. A timed-out attempt is abandoned, not interrupted:
+                the stage fails without retrying, and the attempt holds its concurrency slot until it returns. Only for
+                stages without side effects, as the abandoned attempt may still complete them after the failure.
+            max_retries (int): Number of retries after a failed attempt (not after a timeout). Only for idempotent stages.
+            retry_backoff_seconds (float): Delay before the first retry, doubled after every retry.
+            checkpointed (bool): Whether the outputs are persisted in (and loaded from) the run's checkpoint, if any.
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.optional_inputs = list(optional_inputs)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.checkpointed = checkpointed
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def call(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs the stage function once (with the stage's timeout) and maps its return value to the output names."""
+        if self.timeout_seconds is None:
+            result = self.fn(**kwargs)
+        else:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"stage-{self.name}")
+            future = executor.submit(self.fn, **kwargs)
+            executor.shutdown(wait=False)
+
+            try:
+                result = future.result(timeout=self.timeout_seconds)
+            except FutureTimeoutError:
+                raise StageTimeoutError(f"Stage '{self.name}' timed out after {self.timeout_seconds} seconds.", future)
+
+        if not self.outputs:
+            return {}
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        return dict(zip(self.outputs, result))
+
+class PipelineDAG:
+    """
+    A small declarative pipeline engine: stages declare their inputs and outputs, and every stage starts
+    as soon as the stages producing its inputs have finished, so independent branches run concurrently.
+
+    The same `PipelineDAG` can be run many times (concurrently); per-stage concurrency limits apply across runs.
+    """
+    def __init__(self, stages: List[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        self._producers: Dict[str, str] = {}
+
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: '{stage.name}'.")
+            self.stages[stage.name] = stage
+
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(f"Output '{output}' is produced by both '{self._producers[output]}' and '{stage.name}'.")
+                self._producers[output] = stage.name
+
+        self._dependencies: Dict[str, Set[str]] = {
+            stage.name: {
+                self._producers[name] for name in stage.inputs + stage.optional_inputs if name in self._producers
+            }
+            for stage in stages
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        remaining = {name: set(dependencies) for name, dependencies in self._dependencies.items()}
+
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f"The pipeline has a dependency cycle between stages: {sorted(remaining)}.")
+
+            for name in ready:
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+
+    def required_inputs(self) -> Set[str]:
+        """Returns the inputs that must be provided to `run` (i.e. not produced by any stage)."""
+        return {
+            name for stage in self.stages.values() for name in stage.inputs + stage.optional_inputs
+            if name not in self._producers
+        }
+
+    def run(
+        self,
+        inputs: Dict[str, Any],
+        on_stage_update: Optional[StageUpdateCallback] = None,
+        checkpoint: Optional[Any] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Runs the pipeline to completion.
+
+        If a stage fails (after its retries), no further stages are started; the stages already running are
+        waited for (so that their outputs are checkpointed) and the first error is re-raised.
+
+        Args:
+            inputs (Dict[str, Any]): Values of the inputs not produced by any stage.
+            on_stage_update (Optional[StageUpdateCallback]): Callback for reporting per-stage progress (called from worker threads).
+            checkpoint (Optional[Any]): Store with `has(key)`, `load(key)` and `save(key, value)` methods. Outputs of
+                checkpointed stages are saved in it under the stage name, and loaded instead of recomputed when present.
+            max_workers (Optional[int]): Maximum number of stages running at once within this run (default: no limit).
+
+        Returns:
+            Dict[str, Any]: The inputs and all the stage outputs (None for the outputs of skipped stages).
+        """
+        missing_inputs = self.required_inputs() - set(inputs)
+        if missing_inputs:
+            raise ValueError(f"Missing pipeline inputs: {sorted(missing_inputs)}.")
+
+        report = on_stage_update or (lambda stage, stage_status: None)
+        values = dict(inputs)
+        pending = list(self.stages)
+        finished: Dict[str, StageStatus] = {}
+        skipped: Set[str] = set() # Skipped or softly failed stages: their outputs are None
+        running: Dict[Future, str] = {}
+        errors: List[BaseException] = []
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.stages),
+            thread_name_prefix="pipeline-stage"
+        )
+
+        try:
+            while True:
+                # Start (or skip) every pending stage whose dependencies have all finished
+                scheduled = True
+                while scheduled and not errors:
+                    scheduled = False
+                    for name in list(pending):
+                        stage = self.stages[name]
+                        if not self._dependencies[name].issubset(finished):
+                            continue
+
+                        pending.remove(name)
+                        scheduled = True
+
+                        skipped_dependencies = {self._producers.get(input_name) for input_name in stage.inputs} & skipped
+                        if skipped_dependencies:
+                            print(f"Skipping stage '{name}' (its inputs from {sorted(skipped_dependencies)} are unavailable).")
+                            self._mark_skipped(stage, values, finished, skipped, StageStatus.SKIPPED)
+                            report(name, StageStatus.SKIPPED)
+                            continue
+
+                        kwargs = {input_name: values.get(input_name) for input_name in stage.inputs + stage.optional_inputs}
+                        running[executor.submit(self._execute_stage, stage, kwargs, report, checkpoint)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    stage = self.stages[name]
+
+                    try:
+                        values.update(future.result())
+                        finished[name] = StageStatus.COMPLETED
+
+                    except StageSkipped as e:
+                        stage_status = StageStatus.FAILED if e.failed else StageStatus.SKIPPED
+                        print(f"Stage '{name}' {stage_status.value}: {e}")
+                        self._mark_skipped(stage, values, finished, skipped, stage_status)
+
+                    except Exception as e:
+                        print(f"Stage '{name}' failed: {e}")
+                        finished[name] = StageStatus.FAILED
+                        errors.append(e)
+
+        finally:
+            executor.shutdown(wait=False)
+
+        if errors:
+            raise errors[0]
+
+        return values
+
+    def _mark_skipped(
+        self,
+        stage: Stage,
+        values: Dict[str, Any],
+        finished: Dict[str, StageStatus],
+        skipped: Set[str],
+        stage_status: StageStatus
+    ):
+        for output in stage.outputs:
+            values[output] = None
+        finished[stage.name] = stage_status
+        skipped.add(stage.name)
+
+    def _execute_stage(
+        self,
+        stage: Stage,
+        kwargs: Dict[str, Any],
+        report: StageUpdateCallback,
+        checkpoint: Optional[Any]
+    ) -> Dict[str, Any]:
+        """Worker entrypoint: loads the stage's outputs from the checkpoint, or runs it with its concurrency limit and retries."""
+        use_checkpoint = checkpoint is not None and stage.checkpointed
+
+        if use_checkpoint and checkpoint.has(stage.name):
+            report(stage.name, StageStatus.RUNNING)
+            outputs = checkpoint.load(stage.name)
+            print(f"Resuming: loaded the outputs of stage '{stage.name}' from the checkpoint.")
+            report(stage.name, StageStatus.COMPLETED)
+            return outputs
+
+        release_slot = None
+        if stage._semaphore is not None:
+            stage._semaphore.acquire()
+            release_slot = stage._semaphore.release
+
+        try:
+            report(stage.name, StageStatus.RUNNING)
+            start_time = time.time()
+
+            for attempt in range(stage.max_retries + 1):
+                try:
+                    outputs = stage.call(kwargs)
+                    break
+
+                except StageSkipped as e:
+                    report(stage.name, StageStatus.FAILED if e.failed else StageStatus.SKIPPED)
+                    raise
+
+                except Exception as e:
+                    # A timed-out attempt keeps running in the background: never start another one next to it
+                    if attempt == stage.max_retries or isinstance(e, StageTimeoutError):
+                        if isinstance(e, StageTimeoutError) and release_slot is not None:
+                            # The slot is released when the abandoned attempt actually returns, not now
+                            e.attempt.add_done_callback(lambda _, release_slot=release_slot: release_slot())
+                            release_slot = None
+
+                        report(stage.name, StageStatus.FAILED)
+                        raise
+
+                    delay = stage.retry_backoff_seconds * (2 ** attempt)
+                    print(f"Stage '{stage.name}' failed (attempt {attempt + 1}/{stage.max_retries + 1}): {e}. Retrying in {delay:.1f}s...")
+                    time.sleep(delay)
+
+            if use_checkpoint:
+                checkpoint.save(stage.name, outputs)
+
+            print(f"Stage '{stage.name}' completed in {time.time() - start_time:.2f} seconds.")
+            report(stage.name, StageStatus.COMPLETED)
+            return outputs
+
+        finally:
+            if release_slot is not None:
+                release_slot()
@@ -1,6 +1,12 @@
+import asyncio
 from enum import Enum 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional 
+from typing import Any, Callable, Dict, List, Optional 
+
+from core.utils.minio_client import MinIOClient
+from core.vector_store.schemas import SearchResult
+from core.vector_store.retrievers.video_keyframe_retriever import VideoKeyframeMetadata
+from core.vector_store.utils import load_pil_images_from_retrieved_results
 
 class ToolCategory(Enum):
     VISUAL = "visual"
@@ -30,6 +36,13 @@ class Tool(ABC):
     def run(self, *args, **kwargs) -> Any: 
         pass 
 
+    async def run_async(self, *args, **kwargs) -> Any:
+        """
+        Awaitable version of `run`. By default `run` is executed in a worker thread; tools that call Gemini
+        override this to await the async Gemini API instead.
+        """
+        return await asyncio.to_thread(self.run, *args, **kwargs)
+
     def metadata(self) -> Dict[str, str]:
         """
         Returns metadata about the tool.
@@ -40,4 +53,45 @@ class Tool(ABC):
             "category": self.category,
             "description": self.description or ""
         }
-        
\ No newline at end of file
+        
+
+# Called as `format_output(retrieved_keyframes_results, gemini_results, minio_client)`
+KeyframeOutputFormatter = Callable[[List[SearchResult[VideoKeyframeMetadata]], List[Any], MinIOClient], List[Dict[str, Any]]]
+
+class GeminiKeyframeTool(Tool):
+    """
+    Base class for the visual tools that run a Gemini prompt on each retrieved keyframe.
+    Subclasses set `self.gemini_batch_image_processor` and `self.minio_client`.
+    """
+    async def run_keyframe_batch_async(
+        self,
+        retrieved_keyframes_result: List[SearchResult[VideoKeyframeMetadata]],
+        format_output: KeyframeOutputFormatter
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Loads the keyframe images in a worker thread, awaits one Gemini request per keyframe and formats the responses.
+
+        Args:
+            retrieved_keyframes_result (List[SearchResult[VideoKeyframeMetadata]]): The retrieved keyframes.
+            format_output (KeyframeOutputFormatter): The tool's output formatter.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The formatted output, or None if an error occurred.
+        """
+        try:
+            pil_images = await asyncio.to_thread(
+                load_pil_images_from_retrieved_results,
+                results=retrieved_keyframes_result, 
+                minio_client=self.minio_client
+            )
+
+            gemini_results = await self.gemini_batch_image_processor.process_batch_async(
+                pil_images=pil_images, 
+                response_format="json"
+            )
+
+            return format_output(retrieved_keyframes_result, gemini_results, self.minio_client)
+
+        except Exception as e: 
+            print(f"An error occurred while running the {self.name} tool: {e}.")
+            return None
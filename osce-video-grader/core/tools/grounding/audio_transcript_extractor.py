@@ -43,7 +43,11 @@ def format_audio_transcript_output(
 
     for seg in retrieved_audio_segments_results:
         meta = seg.metadata
-        audio_segment_url = minio_client.get_presigned_url(meta.minio_path)
+        # Segments stored as byte ranges point to the whole audio track: the URL carries the segment's time range
+        audio_segment_url = minio_client.get_presigned_url(
+            meta.minio_path,
+            time_range=(meta.start_time, meta.end_time) if meta.get_byte_range() is not None else None
+        )
 
         audio_transcripts_tool_output.append({
             "start_time": meta.start_time,
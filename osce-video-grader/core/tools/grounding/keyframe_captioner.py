@@ -27,7 +27,7 @@ from core.utils.minio_client import MinIOClient
 from core.vector_store.utils import retrieve_relevant_keyframes, load_pil_images_from_retrieved_results
 from core.config.config import settings 
 from core.vector_store.qdrant_client import QdrantClient
-from core.tools.base import Tool, ToolCategory
+from core.tools.base import GeminiKeyframeTool, ToolCategory
 
 def generate_keyframes_caption_evidence_with_gemini(
         gemini_client, 
@@ -48,8 +48,6 @@ def generate_keyframes_caption_evidence_with_gemini(
             client=gemini_client,
             prompt_template=OSCE_KEYFRAME_CAPTIONER_PROMPT,
             output_schema=KeyframeDescriptionOutput,
-            rate_limit_calls=10,
-            rate_limit_period=60,
             max_retries=5,
             max_backoff=120,
             max_workers=4,
@@ -85,7 +83,7 @@ def format_keyframe_captioner_output(
 
     return keyframe_captioner_tool_output 
 
-class KeyframeCaptionerTool(Tool):
+class KeyframeCaptionerTool(GeminiKeyframeTool):
     TOOL_NAME = "keyframe_captioner"
     TOOL_CATEGORY = ToolCategory.VISUAL 
     TOOL_DESCRIPTION = (
@@ -108,8 +106,6 @@ class KeyframeCaptionerTool(Tool):
             client=gemini_client,
             prompt_template=OSCE_KEYFRAME_CAPTIONER_PROMPT,
             output_schema=KeyframeDescriptionOutput,
-            rate_limit_calls=10,
-            rate_limit_period=60,
             max_retries=5,
             max_backoff=120,
             max_workers=4,
@@ -141,6 +137,12 @@ class KeyframeCaptionerTool(Tool):
         except Exception as e: 
             print(f"An error occurred while running the {self.name} tool: {e}.")
             return None
+
+    async def run_async(
+        self, 
+        retrieved_keyframes_result: List[SearchResult[VideoKeyframeMetadata]]
+    ) -> List[Dict[str, Any]]:
+        return await self.run_keyframe_batch_async(retrieved_keyframes_result, format_keyframe_captioner_output)
         
 
 if __name__ == "__main__":
@@ -26,7 +26,7 @@ from core.utils.minio_client import MinIOClient
 from core.vector_store.utils import retrieve_relevant_keyframes, load_pil_images_from_retrieved_results
 from core.config.config import settings 
 from core.vector_store.qdrant_client import QdrantClient
-from core.tools.base import Tool, ToolCategory
+from core.tools.base import GeminiKeyframeTool, ToolCategory
 
 def generate_keyframes_object_detection_evidence_with_gemini(
         gemini_client, 
@@ -47,8 +47,6 @@ def generate_keyframes_object_detection_evidence_with_gemini(
             client=gemini_client,
             prompt_template=OSCE_KEYFRAME_OBJECT_DETECTOR_PROMPT,
             output_schema=ObjectDetectionOutput,
-            rate_limit_calls=10,
-            rate_limit_period=60,
             max_retries=5,
             max_backoff=120,
             max_workers=4,
@@ -98,7 +96,7 @@ def format_object_detector_output(
 
     return object_detector_tool_output
 
-class ObjectDetectorTool(Tool):
+class ObjectDetectorTool(GeminiKeyframeTool):
     TOOL_NAME = "object_detector"
     TOOL_CATEGORY = ToolCategory.VISUAL 
     TOOL_DESCRIPTION = (
@@ -122,8 +120,6 @@ class ObjectDetectorTool(Tool):
             client=gemini_client,
             prompt_template=OSCE_KEYFRAME_OBJECT_DETECTOR_PROMPT,
             output_schema=ObjectDetectionOutput,
-            rate_limit_calls=10,
-            rate_limit_period=60,
             max_retries=5,
             max_backoff=120,
             max_workers=4,
@@ -156,6 +152,12 @@ class ObjectDetectorTool(Tool):
             print(f"An error occurred while running the {self.name} tool: {e}.")
             return None
 
+    async def run_async(
+        self, 
+        retrieved_keyframes_result: List[SearchResult[VideoKeyframeMetadata]]
+    ) -> List[Dict[str, Any]]:
+        return await self.run_keyframe_batch_async(retrieved_keyframes_result, format_object_detector_output)
+
 if __name__ == "__main__":
     try:
         # Load models 
@@ -26,7 +26,7 @@ from core.utils.minio_client import MinIOClient
 from core.vector_store.utils import retrieve_relevant_keyframes, load_pil_images_from_retrieved_results
 from core.config.config import settings 
 from core.vector_store.qdrant_client import QdrantClient
-from core.tools.base import Tool, ToolCategory
+from core.tools.base import GeminiKeyframeTool, ToolCategory
 
 def generate_scene_interaction_evidence_with_gemini(
         gemini_client, 
@@ -47,8 +47,6 @@ def generate_scene_interaction_evidence_with_gemini(
             client=gemini_client,
             prompt_template=OSCE_KEYFRAME_POSE_ANALYZER_PROMPT,
             output_schema=PoseAnalysisOutput,
-            rate_limit_calls=10,
-            rate_limit_period=60,
             max_retries=5,
             max_backoff=120,
             max_workers=4,
@@ -89,7 +87,7 @@ def format_pose_analysis_output(
 
     return pose_analyzer_tool_output
 
-class PoseAnalyzerTool(Tool):
+class PoseAnalyzerTool(GeminiKeyframeTool):
     TOOL_NAME = "pose_analyzer"
     TOOL_CATEGORY = ToolCategory.VISUAL 
     TOOL_DESCRIPTION = (
@@ -113,8 +111,6 @@ class PoseAnalyzerTool(Tool):
             client=gemini_client,
             prompt_template=OSCE_KEYFRAME_POSE_ANALYZER_PROMPT,
             output_schema=PoseAnalysisOutput,
-            rate_limit_calls=10,
-            rate_limit_period=60,
             max_retries=5,
             max_backoff=120,
             max_workers=4,
@@ -147,6 +143,12 @@ class PoseAnalyzerTool(Tool):
             print(f"An error occurred while running the {self.name} tool: {e}.")
             return None 
 
+    async def run_async(
+        self, 
+        retrieved_keyframes_result: List[SearchResult[VideoKeyframeMetadata]]
+    ) -> List[Dict[str, Any]]:
+        return await self.run_keyframe_batch_async(retrieved_keyframes_result, format_pose_analysis_output)
+
 
 
 if __name__ == "__main__":
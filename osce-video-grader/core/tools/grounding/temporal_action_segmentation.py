@@ -1,5 +1,6 @@
 import os 
 import time 
+import asyncio
 from typing import List, Dict, Any, Tuple 
 
 import numpy as np 
@@ -8,7 +9,8 @@ from moviepy.video.io.VideoFileClip import VideoFileClip
 
 from core.utils.gemini_utils import (
     load_gemini_client,
-    generate_image_content_gemini_with_retry 
+    generate_image_content_gemini_with_retry,
+    generate_image_contents_gemini_with_retry_async
 )
 
 from core.utils.temporal_utils import (
@@ -69,6 +71,54 @@ def generate_temporal_action_segments_grid_wise(
 
         temporal_sequence.append((action_label, (start_time, end_time)))
 
+    return smooth_temporal_action_sequence(temporal_sequence, action_vocabulary)
+
+async def generate_temporal_action_segments_grid_wise_async(
+    video_file_path: str,
+    action_vocabulary: Dict[str, str], 
+    gemini_client: genai.Client, 
+    num_segments: int = 25, 
+    clip_stride: float = 2, 
+    grid_dimension: int = 3
+):
+    """
+    Async version of `generate_temporal_action_segments_grid_wise`: the grids are built in a worker thread,
+    then all of them are labelled concurrently instead of one Gemini call after the other.
+    """
+    grid_images_result = await asyncio.to_thread(
+        process_video_to_grids,
+        video_file_path=video_file_path, 
+        num_clips=num_segments, 
+        clip_stride=clip_stride, 
+        K=grid_dimension ** 2
+    )
+
+    action_labelling_prompts = [
+        generate_action_labelling_prompt(
+            start_time=start_time, 
+            end_time=end_time,
+            action_vocabulary=action_vocabulary
+        )
+        for _, (start_time, end_time) in grid_images_result
+    ]
+
+    action_labels = await generate_image_contents_gemini_with_retry_async(
+        client=gemini_client,
+        pil_images=[grid_image for grid_image, _ in grid_images_result],
+        prompt_texts=action_labelling_prompts
+    )
+
+    temporal_sequence: List[Tuple[str, Tuple[float, float]]] = [
+        (action_label, time_segment) for action_label, (_, time_segment) in zip(action_labels, grid_images_result)
+    ]
+
+    return smooth_temporal_action_sequence(temporal_sequence, action_vocabulary)
+
+def smooth_temporal_action_sequence(
+    temporal_sequence: List[Tuple[str, Tuple[float, float]]],
+    action_vocabulary: Dict[str, str]
+) -> List[Tuple[str, Tuple[float, float]]]:
+    """Smooths the per-clip action labels with Viterbi decoding over the allowed action transitions."""
     action_labels_list = get_action_labels_list(action_vocabulary)
     action_label_to_id_map, id_to_action_label_map = get_action_label_mappings(action_labels_list) 
     action_labels_successors_map = get_action_labels_successors_map(action_labels_list)
@@ -88,7 +138,6 @@ def generate_temporal_action_segments_grid_wise(
         action_label_to_id_map=action_label_to_id_map
     )
 
-    num_segments = len(temporal_sequence)
     num_action_labels = len(action_label_to_id_map)
 
     # Uniform initial distribution
@@ -179,6 +228,37 @@ class TemporalActionSegmentationTool(Tool):
         except Exception as e:
             print(f"An error occurred while running the {self.name} tool: {e}")
             return None
+
+    async def run_async(
+        self, 
+        video_file_path: str,
+        action_vocabulary: Dict[str, str],
+        num_segments: int = 25,
+        clip_stride: float = 2,
+        grid_dimension: int = 3
+    ):
+        try:
+            if not os.path.exists(video_file_path):
+                raise FileNotFoundError(f"Video file not found: {video_file_path}")
+
+            if not action_vocabulary:
+                raise ValueError("Action vocabulary is empty or not provided.")
+
+            temporal_action_segments = await generate_temporal_action_segments_grid_wise_async(
+                video_file_path=video_file_path, 
+                action_vocabulary=action_vocabulary, 
+                gemini_client=self.gemini_client, 
+                num_segments=num_segments, 
+                clip_stride=clip_stride, 
+                grid_dimension=grid_dimension
+            )
+
+            formatted_output = format_temporal_action_segmentation_output(temporal_action_segments)
+            return formatted_output
+
+        except Exception as e:
+            print(f"An error occurred while running the {self.name} tool: {e}")
+            return None
         
 
 if __name__ == "__main__":
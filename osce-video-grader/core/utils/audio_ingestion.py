@@ -0,0 +1,221 @@
+import os
+import time
+import threading
+import subprocess
+from typing import Dict, List, Optional, Sequence, Tuple, BinaryIO
+
+import numpy as np
+
+_PIPE_READ_SIZE = 1 << 20 # 1 MiB
+
+class DecodedAudio:
+    """
+    Mono float32 PCM of a media file, decoded once by ffmpeg at one or more sampling rates
+    (e.g. 16 kHz for Whisper, pyannote and the emotion model, 48 kHz for CLAP).
+
+    The waveforms are in-memory buffers or memory-mapped PCM files (see `decode_audio`). Segments are returned
+    as views into them, not copies, so audio is only read (and paged in) when a consumer actually uses it.
+    """
+    def __init__(self, waveforms: Dict[int, np.ndarray]):
+        """
+        Args:
+            waveforms (Dict[int, np.ndarray]): 1D float32 waveform per sampling rate.
+        """
+        self.waveforms = waveforms
+
+    @property
+    def sampling_rates(self) -> List[int]:
+        return sorted(self.waveforms)
+
+    @property
+    def duration_seconds(self) -> float:
+        sampling_rate, waveform = next(iter(self.waveforms.items()))
+        return len(waveform) / sampling_rate
+
+    def has_sampling_rate(self, sampling_rate: int) -> bool:
+        return sampling_rate in self.waveforms
+
+    def waveform(self, sampling_rate: int) -> np.ndarray:
+        if sampling_rate not in self.waveforms:
+            raise ValueError(f"Audio was not decoded at {sampling_rate} Hz (available: {self.sampling_rates}).")
+        return self.waveforms[sampling_rate]
+
+    def segment(
+        self,
+        start_time: float,
+        end_time: float,
+        sampling_rate: int
+    ) -> np.ndarray:
+        """Returns the samples between `start_time` and `end_time` (in seconds) as a view into the decoded buffer."""
+        start_sample = max(int(start_time * sampling_rate), 0)
+        end_sample = max(int(end_time * sampling_rate), start_sample)
+        return self.waveform(sampling_rate)[start_sample:end_sample]
+
+def _read_pipe(
+    pipe: BinaryIO,
+    buffer: bytearray
+):
+    """Drains a pipe into `buffer` (run in a thread per pipe, so that ffmpeg never blocks on a full pipe)."""
+    while True:
+        chunk = pipe.read(_PIPE_READ_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+    pipe.close()
+
+def _decode_to_pipes(
+    command: List[str],
+    sampling_rates: List[int],
+    timeout_seconds: Optional[float]
+) -> Tuple[Optional[int], bytes, List[bytearray]]:
+    """Runs ffmpeg with one raw output per sampling rate: stdout, then extra pipes (`pipe:<fd>`), read concurrently."""
+    extra_pipes = [os.pipe() for _ in sampling_rates[1:]]
+    output_targets = ["pipe:1"] + [f"pipe:{write_fd}" for _, write_fd in extra_pipes]
+    command = command + [
+        argument for sampling_rate, output_target in zip(sampling_rates, output_targets)
+        for argument in _output_arguments(sampling_rate) + [output_target]
+    ]
+
+    buffers = [bytearray() for _ in sampling_rates]
+    stderr_buffer = bytearray()
+
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            pass_fds=[write_fd for _, write_fd in extra_pipes]
+        )
+    except Exception:
+        for read_fd, _ in extra_pipes:
+            os.close(read_fd)
+        raise
+    finally:
+        # Only ffmpeg may hold the write ends, so that the readers see EOF when it exits
+        for _, write_fd in extra_pipes:
+            os.close(write_fd)
+
+    pipes = [process.stdout] + [os.fdopen(read_fd, "rb") for read_fd, _ in extra_pipes]
+    readers = [
+        threading.Thread(target=_read_pipe, args=(pipe, buffer), daemon=True)
+        for pipe, buffer in zip(pipes + [process.stderr], buffers + [stderr_buffer])
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        process.wait(timeout=timeout_seconds)
+    except subprocess.TimeoutExpired:
+        print(f"ERROR: ffmpeg timed out after {timeout_seconds} seconds.")
+        process.kill()
+        process.wait()
+
+    for reader in readers:
+        reader.join()
+
+    return process.returncode, bytes(stderr_buffer), buffers
+
+def _decode_to_files(
+    command: List[str],
+    output_paths: List[str],
+    sampling_rates: List[int],
+    timeout_seconds: Optional[float]
+) -> Tuple[Optional[int], bytes]:
+    """Runs ffmpeg with one raw output file per sampling rate."""
+    command = command + ["-y"] + [
+        argument for sampling_rate, output_path in zip(sampling_rates, output_paths)
+        for argument in _output_arguments(sampling_rate) + [output_path]
+    ]
+
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        _, stderr = process.communicate(timeout=timeout_seconds)
+    except subprocess.TimeoutExpired:
+        print(f"ERROR: ffmpeg timed out after {timeout_seconds} seconds.")
+        process.kill()
+        _, stderr = process.communicate()
+
+    return process.returncode, stderr
+
+def _output_arguments(sampling_rate: int) -> List[str]:
+    return ["-map", "0:a:0", "-ac", "1", "-ar", str(sampling_rate), "-c:a", "pcm_f32le", "-f", "f32le"]
+
+def decode_audio(
+    media_path: str,
+    sampling_rates: Sequence[int],
+    timeout_seconds: Optional[float] = 600,
+    output_dir: Optional[str] = None
+) -> Optional[DecodedAudio]:
+    """
+    Decodes the first audio stream of a media file (video or audio) to mono float32 PCM at each of the given
+    sampling rates, in a single ffmpeg process. The input is demuxed and decoded once; each output is resampled
+    by ffmpeg and written as raw `f32le` samples (no intermediate WAV file).
+
+    Without `output_dir`, the samples are piped straight into in-memory NumPy buffers. With `output_dir`, they are
+    written to raw PCM files there (`audio_<rate>.f32`) which are memory-mapped, so the decoded audio is paged
+    in on demand instead of being resident: use it for long recordings. The files must outlive the returned object.
+
+    Args:
+        media_path (str): Path to the media file.
+        sampling_rates (Sequence[int]): Sampling rates to decode to (e.g. (16000, 48000)).
+        timeout_seconds (Optional[float]): Timeout of the ffmpeg process. None for no timeout.
+        output_dir (Optional[str]): Directory for memory-mapped PCM files, or None to decode into memory.
+
+    Returns:
+        Optional[DecodedAudio]: The decoded audio, or None on failure (no audio stream, ffmpeg error, ...).
+    """
+    print(f"Decoding audio from '{media_path}' at {list(sampling_rates)} Hz...")
+    if not os.path.exists(media_path):
+        print(f"ERROR: Media file not found at {media_path}")
+        return None
+
+    sampling_rates = list(dict.fromkeys(sampling_rates))
+    if not sampling_rates:
+        raise ValueError("At least one sampling rate is required.")
+
+    command = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", media_path]
+    start_time = time.time()
+
+    try:
+        if output_dir is None:
+            returncode, stderr, buffers = _decode_to_pipes(command, sampling_rates, timeout_seconds)
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+            output_paths = [os.path.join(output_dir, f"audio_{sampling_rate}.f32") for sampling_rate in sampling_rates]
+            returncode, stderr = _decode_to_files(command, output_paths, sampling_rates, timeout_seconds)
+
+    except FileNotFoundError:
+        print("ERROR: ffmpeg is not installed or not in your PATH.")
+        return None
+
+    if returncode != 0:
+        print(f"ERROR: ffmpeg failed for {media_path} with return code {returncode}.")
+        ffmpeg_errors = stderr.decode("utf-8", errors="ignore").strip()
+        if ffmpeg_errors:
+            print(f"  FFmpeg STDERR: {ffmpeg_errors}")
+        return None
+
+    if output_dir is None:
+        # Zero-copy: the (writable) arrays share memory with the bytearrays they were read into
+        waveforms = {
+            sampling_rate: np.frombuffer(buffer, dtype="<f4", count=len(buffer) // 4)
+            for sampling_rate, buffer in zip(sampling_rates, buffers)
+        }
+    else:
+        if any(os.path.getsize(output_path) < 4 for output_path in output_paths):
+            print(f"ERROR: No audio samples decoded from {media_path}.")
+            return None
+
+        # Copy-on-write mappings: writable (e.g. for torch.from_numpy) without ever modifying the files
+        waveforms = {
+            sampling_rate: np.memmap(output_path, dtype="<f4", mode="c", shape=(os.path.getsize(output_path) // 4,))
+            for sampling_rate, output_path in zip(sampling_rates, output_paths)
+        }
+
+    if any(len(waveform) == 0 for waveform in waveforms.values()):
+        print(f"ERROR: No audio samples decoded from {media_path}.")
+        return None
+
+    decoded_audio = DecodedAudio(waveforms)
+    print(f"Decoded {decoded_audio.duration_seconds:.1f} seconds of audio in {time.time() - start_time:.2f} seconds.")
+    return decoded_audio
@@ -2,43 +2,46 @@ import os
 import tempfile 
 import time
 import subprocess 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path 
 from pprint import pprint 
-from typing import List, Dict, Optional, TypedDict 
+from typing import List, Dict, Optional, TypedDict, Sequence, Union 
 
 import torch 
 import librosa 
 import numpy as np 
-import pandas as pd 
 from moviepy import VideoFileClip
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, BatchedInferencePipeline
 from pyannote.audio import Pipeline 
 from transformers import pipeline as hf_pipeline
 
 from core.utils.helpers import get_device
+from core.utils.audio_ingestion import DecodedAudio, decode_audio
 from core.config.config import settings
 
 class ProcessedAudioSegment(TypedDict):
+    """A conversational chunk; its audio is referenced by (start, end) in the `DecodedAudio` it was processed from."""
     id: int
     start: float
     end: float
     transcript: str
-    audio: np.ndarray
     emotion: str
     emotion_confidence_score: float 
 
-DEFAULT_SAMPLING_RATE = 16000
+DEFAULT_SAMPLING_RATE = 16000 # Whisper, pyannote and the emotion model all expect 16 kHz
+CLAP_SAMPLING_RATE = 48000
 
 def load_whisper_model(
-        model_id: str = "small",
-        device: str = "cpu" # No support for MPS
+        model_id: str = settings.audio.whisper_model_id,
+        device: str = "cpu", # No support for MPS
+        cpu_threads: int = settings.audio.whisper_cpu_threads
     ):
     if device == "cpu":
         compute_type = "int8"
     else:
         compute_type = "float16"
 
-    model = WhisperModel(model_id, device=device, compute_type=compute_type)
+    model = WhisperModel(model_id, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
 
     return model 
 
@@ -166,89 +169,230 @@ def extract_audio(
                 print(f"  Could not delete failed/empty temp audio file {final_audio_path}: {e_del}")
         return None
 
-def transcribe_and_diarize(
-        audio_path: str,
-        whisper_model, 
-        diarization_model
+UNKNOWN_SPEAKER = "UNKNOWN"
+MIN_TURN_DURATION_CLASS_SECONDS = 0.0625 # Shorter turns are all in the smallest duration class
+
+def align_words_to_speakers(
+        word_starts: np.ndarray,
+        word_ends: np.ndarray,
+        turn_starts: np.ndarray,
+        turn_ends: np.ndarray,
+        turn_speakers: Sequence[str]
+    ) -> np.ndarray:
+    """
+    Assigns each word the speaker of the diarization turn it overlaps the most, as one sorted interval join.
+
+    The turns are split into duration classes (lengths in (L/2, L] for L a power of two). A turn of a class can only
+    overlap a word if it starts within [word start - L, word end], a contiguous window of the class's turns sorted by
+    start time, and only a few turns longer than L/2 start in such a span. Overlaps are only computed within these
+    windows, so a long turn never widens the window of the short ones, and the cost is O(words x classes x log turns)
+    instead of O(words x turns). Ties go to the earliest turn. Words with no positive overlap (e.g. zero-length words)
+    fall back to the turn containing their midpoint, and words outside every turn get `UNKNOWN_SPEAKER`.
+
+    Args:
+        word_starts (np.ndarray): (W,) word start times in seconds.
+        word_ends (np.ndarray): (W,) word end times in seconds.
+        turn_starts (np.ndarray): (T,) speaker turn start times in seconds.
+        turn_ends (np.ndarray): (T,) speaker turn end times in seconds.
+        turn_speakers (Sequence[str]): (T,) speaker label of each turn.
+
+    Returns:
+        np.ndarray: (W,) speaker label of each word (object array).
+    """
+    word_starts = np.asarray(word_starts, dtype=np.float64)
+    word_ends = np.asarray(word_ends, dtype=np.float64)
+    word_speakers = np.full(len(word_starts), UNKNOWN_SPEAKER, dtype=object)
+    if len(word_starts) == 0 or len(turn_starts) == 0:
+        return word_speakers
+
+    order = np.argsort(np.asarray(turn_starts, dtype=np.float64), kind="stable")
+    turn_starts = np.asarray(turn_starts, dtype=np.float64)[order]
+    turn_ends = np.asarray(turn_ends, dtype=np.float64)[order]
+    turn_speakers = np.asarray(turn_speakers, dtype=object)[order]
+
+    num_turns = len(turn_starts)
+    rows = np.arange(len(word_starts))
+    word_midpoints = (word_starts + (word_ends - word_starts) / 2)[:, None]
+    best_overlaps = np.full(len(word_starts), -np.inf)
+    best_by_overlap = np.full(len(word_starts), num_turns)
+    best_by_midpoint = np.full(len(word_starts), num_turns) # num_turns: no turn contains the midpoint
+
+    turn_durations = np.maximum(turn_ends - turn_starts, MIN_TURN_DURATION_CLASS_SECONDS)
+    duration_classes = np.ceil(np.log2(turn_durations)).astype(np.int64)
+
+    for duration_class in np.unique(duration_classes):
+        class_turns = np.flatnonzero(duration_classes == duration_class) # Sorted by start time
+        max_duration = turn_durations[class_turns].max()
+
+        # Candidate window [lo, hi) of every word within the class
+        lo = np.searchsorted(turn_starts[class_turns], word_starts - max_duration, side="left")
+        hi = np.searchsorted(turn_starts[class_turns], word_ends, side="right")
+        window_size = int(np.max(hi - lo, initial=0))
+        if window_size <= 0:
+            continue
+
+        window = lo[:, None] + np.arange(window_size)[None, :] # (W, window_size)
+        is_candidate = window < hi[:, None]
+        candidates = class_turns[np.minimum(window, len(class_turns) - 1)]
+
+        candidate_starts = turn_starts[candidates]
+        candidate_ends = turn_ends[candidates]
+        overlaps = np.minimum(candidate_ends, word_ends[:, None]) - np.maximum(candidate_starts, word_starts[:, None])
+        overlaps = np.where(is_candidate, overlaps, -np.inf)
+        contains_midpoint = is_candidate & (candidate_starts <= word_midpoints) & (candidate_ends >= word_midpoints)
+
+        class_best = np.argmax(overlaps, axis=1)
+        class_best_overlaps = overlaps[rows, class_best]
+        class_best_turns = candidates[rows, class_best]
+        is_better = (class_best_overlaps > best_overlaps) | (
+            (class_best_overlaps == best_overlaps) & (class_best_turns < best_by_overlap)
+        )
+        best_overlaps = np.where(is_better, class_best_overlaps, best_overlaps)
+        best_by_overlap = np.where(is_better, class_best_turns, best_by_overlap)
+
+        best_by_midpoint = np.minimum(best_by_midpoint, np.where(contains_midpoint, candidates, num_turns).min(axis=1))
+
+    best = np.where(best_overlaps > 0, best_by_overlap, best_by_midpoint)
+    is_assigned = best < num_turns
+    word_speakers[is_assigned] = turn_speakers[best[is_assigned]]
+
+    return word_speakers
+
+def group_words_into_segments(
+        words: List[Dict],
+        word_speakers: np.ndarray
     ) -> List[Dict]:
     """
-    Manually performs transcription and diarization, then merges the results
-    by aligning speakers to individual words. This is the core function.
+    Groups runs of consecutive words with the same speaker into segments ({'start', 'end', 'text', 'speaker'}).
+    Run boundaries are found in one vectorized comparison; each word's text is followed by a space.
     """
-    print("\n--- Starting Transcription and Diarization ---")
-    
-    # Step 1: Transcribe with faster-whisper to get word-level timestamps
-    print("Step 1: Transcribing with faster-whisper...")
-    segments, _ = whisper_model.transcribe(
-        audio_path, 
-        language="en",
-        word_timestamps=True
-    )
+    if not words:
+        return []
+
+    speaker_changes = np.flatnonzero(word_speakers[1:] != word_speakers[:-1]) + 1
+    run_starts = np.concatenate(([0], speaker_changes))
+    run_ends = np.concatenate((speaker_changes, [len(words)]))
+
+    return [
+        {
+            'start': words[start]['start'],
+            'text': "".join(word['text'] + " " for word in words[start:end]),
+            'speaker': word_speakers[start],
+            'end': words[end - 1]['end']
+        }
+        for start, end in zip(run_starts.tolist(), run_ends.tolist())
+    ]
+
+def transcribe_words(
+        audio: Union[str, np.ndarray],
+        whisper_model,
+        batch_size: int = settings.audio.transcription_batch_size,
+        vad_filter: bool = settings.audio.vad_filter
+    ) -> List[Dict]:
+    """
+    Transcribes the audio with faster-whisper and returns its words ({'start', 'end', 'text'}).
+    `audio` is a file path or a mono float32 waveform at 16 kHz.
+
+    With `vad_filter`, Silero VAD runs first and only the speech regions are decoded. With `batch_size` > 1 (and
+    `vad_filter`), the speech regions are split into chunks that are decoded `batch_size` at a time by
+    faster-whisper's `BatchedInferencePipeline`. Word timestamps are always on the timeline of the whole audio.
+    """
+    start_time = time.time()
+    if vad_filter and batch_size > 1:
+        segments, _ = BatchedInferencePipeline(model=whisper_model).transcribe(
+            audio,
+            language="en",
+            word_timestamps=True,
+            batch_size=batch_size
+        )
+    else:
+        segments, _ = whisper_model.transcribe(
+            audio, 
+            language="en",
+            word_timestamps=True,
+            vad_filter=vad_filter
+        )
     
-    # Collect all words from all segments into a single list
+    # Collect all words from all segments into a single list (the segments are decoded lazily, while iterating)
     all_words = []
     for segment in segments:
         for word in segment.words:
             all_words.append({'start': word.start, 'end': word.end, 'text': word.word})
-    print(f"  Transcription complete. Found {len(all_words)} words.")
+    print(f"  Transcription complete in {time.time() - start_time:.2f} seconds. Found {len(all_words)} words.")
+
+    return all_words
 
-    # Step 2: Diarize with pyannote.audio to get speaker turns
-    print("Step 2: Diarizing with pyannote.audio...")
+def diarize_speaker_turns(
+        audio: Union[str, np.ndarray],
+        diarization_model,
+        sampling_rate: int = DEFAULT_SAMPLING_RATE
+    ) -> List:
+    """
+    Diarizes the audio with pyannote.audio and returns its (turn, track, speaker) tuples.
+    `audio` is a file path or a mono float32 waveform (passed in memory as a (channel, time) tensor).
+    """
+    if isinstance(audio, np.ndarray):
+        audio = {"waveform": torch.from_numpy(audio).unsqueeze(0), "sample_rate": sampling_rate}
+
+    start_time = time.time()
     diarization = diarization_model(
-        audio_path,
+        audio,
         min_speakers=2,
         max_speakers=2
     )
     
-    # Create a pandas DataFrame for easy and fast lookup of speaker turns
-    speaker_turns = [{
-        'start': turn.start,
-        'end': turn.end,
-        'speaker': speaker
-    } for turn, _, speaker in diarization.itertracks(yield_label=True)]
-    speaker_df = pd.DataFrame(speaker_turns)
-    print(f"  Diarization complete. Found {len(speaker_df)} speaker turns.")
-
-    # Step 3: Manually align words to speakers
-    print("Step 3: Manually aligning words to speakers...")
-    # For each word, we find which speaker was active during its timestamp.
-    # We check the word's midpoint to see which speaker's turn it falls into.
-    word_speakers = []
-    for word in all_words:
-        word_midpoint = word['start'] + (word['end'] - word['start']) / 2
-        # Find the speaker turn that contains the word's midpoint
-        speaker = speaker_df[(speaker_df['start'] <= word_midpoint) & (speaker_df['end'] >= word_midpoint)]
-        
-        # Assign the speaker label, defaulting to UNKNOWN if no speaker is found
-        assigned_speaker = speaker.iloc[0]['speaker'] if not speaker.empty else "UNKNOWN"
-        word_speakers.append(assigned_speaker)
+    speaker_turns = list(diarization.itertracks(yield_label=True))
+    print(f"  Diarization complete in {time.time() - start_time:.2f} seconds. Found {len(speaker_turns)} speaker turns.")
+
+    return speaker_turns
+
+def transcribe_and_diarize(
+        audio: Union[str, np.ndarray],
+        whisper_model, 
+        diarization_model,
+        concurrent: bool = settings.audio.concurrent_transcription_diarization
+    ) -> List[Dict]:
+    """
+    Manually performs transcription and diarization, then merges the results
+    by aligning speakers to individual words. This is the core function.
+
+    `audio` is a file path or a mono float32 waveform at 16 kHz (see `decode_audio`).
 
-    # Add the determined speaker label to each word dictionary
-    for i, word in enumerate(all_words):
-        word['speaker'] = word_speakers[i]
-        word['text'] += " " # Add space for later joining
+    Both models only read the audio, so by default they run at the same time in two worker threads 
+    (CTranslate2 and PyTorch release the GIL, and use the thread budgets from `settings.audio`).
+    """
+    print("\n--- Starting Transcription and Diarization ---")
+
+    if concurrent:
+        # Steps 1 and 2: Transcribe with faster-whisper and diarize with pyannote.audio concurrently
+        print("Steps 1-2: Transcribing with faster-whisper and diarizing with pyannote.audio concurrently...")
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="transcribe-diarize") as executor:
+            words_future = executor.submit(transcribe_words, audio, whisper_model)
+            speaker_turns_future = executor.submit(diarize_speaker_turns, audio, diarization_model)
+            all_words = words_future.result()
+            speaker_turns = speaker_turns_future.result()
+    else:
+        # Step 1: Transcribe with faster-whisper to get word-level timestamps
+        print("Step 1: Transcribing with faster-whisper...")
+        all_words = transcribe_words(audio, whisper_model)
+
+        # Step 2: Diarize with pyannote.audio to get speaker turns
+        print("Step 2: Diarizing with pyannote.audio...")
+        speaker_turns = diarize_speaker_turns(audio, diarization_model)
+
+    # Step 3: Align every word to the speaker turn it overlaps the most (one sorted interval join)
+    print("Step 3: Aligning words to speakers...")
+    word_speakers = align_words_to_speakers(
+        word_starts=np.array([word['start'] for word in all_words], dtype=np.float64),
+        word_ends=np.array([word['end'] for word in all_words], dtype=np.float64),
+        turn_starts=np.array([turn.start for turn, _, _ in speaker_turns], dtype=np.float64),
+        turn_ends=np.array([turn.end for turn, _, _ in speaker_turns], dtype=np.float64),
+        turn_speakers=[speaker for _, _, speaker in speaker_turns]
+    )
 
     # Step 4: Group consecutive words from the same speaker back into segments
     print("Step 4: Grouping words back into diarized segments...")
-    final_segments = []
-    if all_words:
-        # Start the first segment with the first word
-        current_segment = {'start': all_words[0]['start'], 'text': all_words[0]['text'], 'speaker': all_words[0]['speaker']}
-        
-        for i in range(1, len(all_words)):
-            word = all_words[i]
-            # If the speaker is the same, append the word's text
-            if word['speaker'] == current_segment['speaker']:
-                current_segment['text'] += word['text']
-            # If the speaker changes, finalize the current segment and start a new one
-            else:
-                current_segment['end'] = all_words[i-1]['end']
-                final_segments.append(current_segment)
-                current_segment = {'start': word['start'], 'text': word['text'], 'speaker': word['speaker']}
-        
-        # Add the very last segment
-        current_segment['end'] = all_words[-1]['end']
-        final_segments.append(current_segment)
+    final_segments = group_words_into_segments(all_words, word_speakers)
     
     print("  Alignment and segment grouping complete.")
     return final_segments
@@ -279,42 +423,61 @@ def analyze_audio_segments_emotions(
     diarized_segments: List[Dict], 
     full_audio_waveform: np.ndarray, 
     audio_emotion_classification_model, 
-    sampling_rate: int = DEFAULT_SAMPLING_RATE
+    sampling_rate: int = DEFAULT_SAMPLING_RATE,
+    batch_size: int = settings.audio.emotion_batch_size,
+    max_window_seconds: float = settings.audio.emotion_max_window_seconds
 ) -> List[Dict]:
-    """Analyzes emotion for each diarized segment."""
+    """
+    Analyzes emotion for each diarized segment.
+
+    The turns long enough to classify are sorted by length and classified in batches of `batch_size`. The
+    wav2vec2-base feature extractor returns no attention mask (zero-padding would change the logits of the shorter
+    turns), so each batch is instead cropped to its shortest turn: as neighbours in the sorted order, the turns
+    of a batch have similar lengths and lose little. If `max_window_seconds` > 0, only the first
+    `max_window_seconds` of longer turns are classified, so all the long turns batch together uncropped.
+    """
     print("\nAnalyzing emotion for each individual speaker turn...")
-    segments_with_emotions = []
-    for seg in diarized_segments:
+    start = time.time()
+    max_window_samples = int(max_window_seconds * sampling_rate) if max_window_seconds > 0 else None
+
+    emotion_data = [{"label": "too_short", "score": 0.0} for _ in diarized_segments]
+    segment_audios = {}
+    for i, seg in enumerate(diarized_segments):
         start_time, end_time = seg.get('start', 0.0), seg.get('end', 0.0)
         start_sample = int(start_time * sampling_rate)
         end_sample = int(end_time * sampling_rate)
-        
-        current_emotion_data = {"label": "unknown", "score": 0.0}
 
         # Ensure audio chunk is valid and has some duration for emotion analysis
         if end_sample > start_sample and (end_sample - start_sample) > 400:
-            segment_audio = full_audio_waveform[start_sample:end_sample]
-            emotion_result_list = audio_emotion_classification_model(
-                segment_audio, 
-                sampling_rate=sampling_rate
-            )
-            
-            if emotion_result_list:
-                current_emotion_data = emotion_result_list[0] 
-
-        else:
-            current_emotion_data = {
-                "label": "too_short",
-                "score": 0.0
-            }
-
-        segments_with_emotions.append({
+            segment_audios[i] = full_audio_waveform[start_sample:end_sample][:max_window_samples]
+
+    # Length bucketing: neighbouring turns in the sorted order have similar lengths
+    ordered_indices = sorted(segment_audios, key=lambda i: len(segment_audios[i]))
+    batches = [
+        ordered_indices[batch_start:batch_start + max(batch_size, 1)]
+        for batch_start in range(0, len(ordered_indices), max(batch_size, 1))
+    ]
+    for batch_indices in batches:
+        batch_num_samples = len(segment_audios[batch_indices[0]]) # The shortest turn of the batch
+        batch_results = audio_emotion_classification_model(
+            [{"raw": segment_audios[i][:batch_num_samples], "sampling_rate": sampling_rate} for i in batch_indices],
+            batch_size=len(batch_indices),
+            top_k=1
+        )
+
+        for i, emotion_result_list in zip(batch_indices, batch_results):
+            emotion_data[i] = emotion_result_list[0] if emotion_result_list else {"label": "unknown", "score": 0.0}
+
+    segments_with_emotions = [
+        {
             **seg,
             "emotion_label": current_emotion_data.get("label"),
             "emotion_score": current_emotion_data.get("score")
-        })
+        }
+        for seg, current_emotion_data in zip(diarized_segments, emotion_data)
+    ]
         
-    print(f"  Analyzed emotions for {len(segments_with_emotions)} speaker turns.")
+    print(f"  Analyzed emotions for {len(segments_with_emotions)} speaker turns in {time.time() - start:.2f} seconds ({len(segment_audios)} classified in {len(batches)} batches).")
     return segments_with_emotions
 
 def infer_chunk_emotion(chunk_segments):
@@ -383,32 +546,43 @@ def assign_speaker_roles(diarized_segments: List[Dict]) -> Dict[str, str]:
     return speaker_map
 
 def process_audio_segments(
-    audio_path: str, 
+    audio: Union[str, DecodedAudio], 
     whisper_model: WhisperModel, 
     diarization_model, 
     audio_emotion_classification_model,
     sampling_rate: int = DEFAULT_SAMPLING_RATE,
     silence_threshold: int = 1
 ):
-    """Process audio chunks"""
+    """
+    Process audio chunks.
+
+    `audio` is the audio decoded by `decode_audio` (it must include `sampling_rate`), or the path of a media file
+    to decode. The models all run on the same waveform. The returned segments carry no audio, only their (start, end)
+    times: consumers slice `decoded_audio.segment(...)` when they need it, so with memory-mapped decoded audio
+    the samples are only paged in inside the model batches and resident memory does not grow with recording length.
+    """
+    if isinstance(audio, str):
+        decoded_audio = decode_audio(audio, sampling_rates=[sampling_rate])
+        if decoded_audio is None:
+            raise RuntimeError(f"Failed to decode audio from '{audio}'.")
+    else:
+        decoded_audio = audio
+
+    full_audio_waveform = decoded_audio.waveform(sampling_rate)
+
     # Transcribe and diarize 
     diarized_segments = transcribe_and_diarize(
-        audio_path, 
+        full_audio_waveform, 
         whisper_model=whisper_model, 
         diarization_model=diarization_model
     )
 
-    full_audio_waveform, _ = librosa.load(
-        audio_path, 
-        mono=True, 
-        sr=sampling_rate
-    )
-
     # Analyze emotions for each diarized segment 
     segments_with_emotions = analyze_audio_segments_emotions(
         diarized_segments, 
         full_audio_waveform, 
-        audio_emotion_classification_model
+        audio_emotion_classification_model,
+        sampling_rate=sampling_rate
     )
 
     # Assign speaker roles to each diarized segment
@@ -428,12 +602,6 @@ def process_audio_segments(
 
         full_transcript = "\n".join([f"{speaker_map.get(seg['speaker'], 'UNKNOWN')}: {seg['text'].strip()}" for seg in chunk_segments])
 
-        start_sample = int(start_time * DEFAULT_SAMPLING_RATE)
-        end_sample = int(end_time * DEFAULT_SAMPLING_RATE)
-
-        # Extract the audio chunk
-        chunk_audio = full_audio_waveform[start_sample:end_sample]
-
         chunk_emotion_label, chunk_emotion_confidence = infer_chunk_emotion(chunk_segments)
 
         processed_segment = {
@@ -441,7 +609,6 @@ def process_audio_segments(
             "start": start_time, 
             "end": end_time, 
             "transcript": full_transcript, 
-            "audio": chunk_audio,
             "emotion": chunk_emotion_label, 
             "emotion_confidence_score": chunk_emotion_confidence
         }
@@ -480,8 +647,8 @@ def resample_audio(
 if __name__ == "__main__":
     VIDEO_FILE_PATH = os.path.join("sample_osce_videos", "osce-physical-exam-demo-video-1.mp4")
 
-    # Extract audio 
-    audio_path = extract_audio(VIDEO_FILE_PATH)
+    # Decode audio 
+    decoded_audio = decode_audio(VIDEO_FILE_PATH, sampling_rates=[DEFAULT_SAMPLING_RATE])
 
     start = time.time()
 
@@ -490,7 +657,7 @@ if __name__ == "__main__":
     audio_emotion_classification_model = load_audio_emotion_classification_model()
 
     audio_segments = process_audio_segments(
-        audio_path, 
+        decoded_audio, 
         whisper_model, 
         diarization_model, 
         audio_emotion_classification_model
@@ -0,0 +1,264 @@
+import io
+import mmap
+import struct
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+FLAC_MARKER = b"fLaC"
+STREAMINFO_HEADER_SIZE = 42 # "fLaC" + metadata block header (4 bytes) + STREAMINFO (34 bytes), always first
+
+# Samples per block of the block size codes 1-15 of a FLAC frame header (6 and 7: explicit, see `_parse_frame_header`)
+_BLOCK_SIZES = {1: 192, 2: 576, 3: 1152, 4: 2304, 5: 4608, **{code: 256 << (code - 8) for code in range(8, 16)}}
+
+def _crc8(data: bytes) -> int:
+    """CRC-8 (polynomial x^8 + x^2 + x + 1) protecting FLAC frame headers."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+class AudioByteRange:
+    """
+    Location of an audio segment inside a FLAC track: the bytes of the whole frames covering the segment,
+    and the samples to keep once they are decoded.
+    """
+    def __init__(
+        self,
+        byte_start: int,
+        byte_end: int,
+        first_sample: int,
+        start_sample: int,
+        end_sample: int
+    ):
+        """
+        Args:
+            byte_start (int): Offset of the first frame covering the segment.
+            byte_end (int): Offset just past the last frame covering the segment.
+            first_sample (int): Index (in the track) of the first sample of the first frame.
+            start_sample (int): Index of the first sample of the segment.
+            end_sample (int): Index just past the last sample of the segment.
+        """
+        self.byte_start = byte_start
+        self.byte_end = byte_end
+        self.first_sample = first_sample
+        self.start_sample = start_sample
+        self.end_sample = end_sample
+
+class AudioTrackIndex:
+    """
+    Frame index of a FLAC-encoded audio track: the byte offset and first sample of every frame.
+    Any run of whole frames can be decoded on its own (prefixed with the track's STREAMINFO), which is what
+    lets audio segments be stored as byte ranges of one per-video track instead of separate objects.
+    """
+    def __init__(
+        self,
+        frame_byte_offsets: np.ndarray,
+        frame_sample_offsets: np.ndarray,
+        sampling_rate: int,
+        minio_path: Optional[str] = None
+    ):
+        """
+        Args:
+            frame_byte_offsets (np.ndarray): Byte offset of each frame, followed by the size of the track.
+            frame_sample_offsets (np.ndarray): First sample of each frame, followed by the number of samples.
+            sampling_rate (int): Sampling rate of the track.
+            minio_path (Optional[str]): MinIO path of the track, once uploaded.
+        """
+        self.frame_byte_offsets = frame_byte_offsets
+        self.frame_sample_offsets = frame_sample_offsets
+        self.sampling_rate = sampling_rate
+        self.minio_path = minio_path
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.frame_byte_offsets) - 1
+
+    def byte_range(
+        self,
+        start_time: float,
+        end_time: float
+    ) -> AudioByteRange:
+        """Returns the byte range of the whole frames covering `start_time` to `end_time` (in seconds)."""
+        num_samples = int(self.frame_sample_offsets[-1])
+        start_sample = min(max(int(start_time * self.sampling_rate), 0), num_samples)
+        end_sample = min(max(int(end_time * self.sampling_rate), start_sample), num_samples)
+
+        first_frame = max(int(np.searchsorted(self.frame_sample_offsets, start_sample, side="right")) - 1, 0)
+        end_frame = max(int(np.searchsorted(self.frame_sample_offsets, end_sample, side="left")), first_frame + 1)
+        end_frame = min(end_frame, self.num_frames)
+
+        return AudioByteRange(
+            byte_start=int(self.frame_byte_offsets[first_frame]),
+            byte_end=int(self.frame_byte_offsets[end_frame]),
+            first_sample=int(self.frame_sample_offsets[first_frame]),
+            start_sample=start_sample,
+            end_sample=end_sample
+        )
+
+def _parse_frame_header(
+    data: Union[bytes, mmap.mmap],
+    offset: int,
+    streaminfo_block_size: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Parses (and CRC-checks) the FLAC frame header at `offset`.
+    Returns (frame/sample number, block size), or None if there is no valid frame header at `offset`.
+    """
+    if offset + 5 > len(data):
+        return None
+
+    blocking_strategy = data[offset + 1] & 0x01
+    block_size_code = data[offset + 2] >> 4
+    sample_rate_code = data[offset + 2] & 0x0F
+    if block_size_code == 0 or sample_rate_code == 0x0F or data[offset + 3] & 0x01:
+        return None
+
+    # Frame (fixed blocking) or sample (variable blocking) number, UTF-8 coded
+    position = offset + 4
+    first_byte = data[position]
+    num_leading_ones = next((n for n in range(8) if not (first_byte << n) & 0x80), 8)
+    if num_leading_ones == 1 or num_leading_ones > 7: # A continuation byte, or 0xFF
+        return None
+    num_extra_bytes = max(num_leading_ones - 1, 0)
+    number = first_byte & (0x7F >> num_leading_ones)
+    if position + 1 + num_extra_bytes > len(data):
+        return None
+    for byte in data[position + 1:position + 1 + num_extra_bytes]:
+        if byte & 0xC0 != 0x80:
+            return None
+        number = (number << 6) | (byte & 0x3F)
+    position += 1 + num_extra_bytes
+
+    if block_size_code == 6:
+        block_size = data[position] + 1
+        position += 1
+    elif block_size_code == 7:
+        block_size = struct.unpack(">H", data[position:position + 2])[0] + 1
+        position += 2
+    else:
+        block_size = _BLOCK_SIZES[block_size_code]
+
+    if sample_rate_code == 12:
+        position += 1
+    elif sample_rate_code in (13, 14):
+        position += 2
+
+    if position >= len(data) or _crc8(data[offset:position]) != data[position]:
+        return None
+
+    frame_number = number if blocking_strategy else number * streaminfo_block_size
+    return frame_number, block_size
+
+def index_flac_frames(
+    data: Union[bytes, mmap.mmap],
+    sampling_rate: int
+) -> AudioTrackIndex:
+    """
+    Builds the frame index of a FLAC file by scanning for frame sync codes and validating each header
+    (CRC-8, and the sample number expected after the previous frame).
+    """
+    if data[:4] != FLAC_MARKER:
+        raise ValueError("Not a FLAC stream.")
+
+    # Skip the metadata blocks (STREAMINFO first)
+    streaminfo_block_size = struct.unpack(">H", data[8:10])[0]
+    offset = 4
+    while True:
+        is_last_block = data[offset] & 0x80
+        offset += 4 + int.from_bytes(data[offset + 1:offset + 4], "big")
+        if is_last_block:
+            break
+
+    frames = np.frombuffer(data, dtype=np.uint8, offset=offset)
+    candidates = np.flatnonzero((frames[:-1] == 0xFF) & ((frames[1:] & 0xFE) == 0xF8)) + offset
+
+    frame_byte_offsets, frame_sample_offsets = [], []
+    next_sample = 0
+    for candidate in candidates.tolist():
+        if frame_byte_offsets and candidate < frame_byte_offsets[-1] + 2:
+            continue
+
+        header = _parse_frame_header(data, candidate, streaminfo_block_size)
+        if header is None or header[0] != next_sample:
+            continue
+
+        frame_byte_offsets.append(candidate)
+        frame_sample_offsets.append(next_sample)
+        next_sample += header[1]
+
+    frame_byte_offsets.append(len(data))
+    frame_sample_offsets.append(next_sample)
+
+    return AudioTrackIndex(
+        frame_byte_offsets=np.asarray(frame_byte_offsets, dtype=np.int64),
+        frame_sample_offsets=np.asarray(frame_sample_offsets, dtype=np.int64),
+        sampling_rate=sampling_rate
+    )
+
+def encode_flac_track(
+    waveform: np.ndarray,
+    sampling_rate: int
+) -> Tuple[bytes, AudioTrackIndex]:
+    """
+    Encodes a mono waveform as 16-bit FLAC (lossless for 16-bit PCM) and indexes its frames.
+
+    Returns:
+        Tuple[bytes, AudioTrackIndex]: The FLAC file and its frame index.
+    """
+    flac_buffer = io.BytesIO()
+    sf.write(flac_buffer, waveform, sampling_rate, format="FLAC", subtype="PCM_16")
+    data = flac_buffer.getvalue()
+
+    return data, index_flac_frames(data, sampling_rate)
+
+def encode_flac_track_file(
+    waveform: np.ndarray,
+    sampling_rate: int,
+    output_path: str
+) -> AudioTrackIndex:
+    """
+    Like `encode_flac_track`, but writes the FLAC file to `output_path` and indexes it through a memory map,
+    so that neither the waveform (e.g. memory-mapped itself) nor the encoded track has to be resident.
+    """
+    sf.write(output_path, waveform, sampling_rate, format="FLAC", subtype="PCM_16")
+
+    with open(output_path, "rb") as flac_file, mmap.mmap(flac_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return index_flac_frames(data, sampling_rate)
+
+def decode_flac_range(
+    streaminfo_header: bytes,
+    frames: bytes,
+    byte_range: AudioByteRange
+) -> Tuple[np.ndarray, int]:
+    """
+    Decodes the frames read from a FLAC track's byte range and trims them to the segment.
+
+    Args:
+        streaminfo_header (bytes): The first `STREAMINFO_HEADER_SIZE` bytes of the track.
+        frames (bytes): The bytes of `byte_range`.
+        byte_range (AudioByteRange): The segment's byte range.
+
+    Returns:
+        Tuple[np.ndarray, int]: The segment's waveform (float32) and sampling rate.
+    """
+    if streaminfo_header[:4] != FLAC_MARKER or len(streaminfo_header) < STREAMINFO_HEADER_SIZE:
+        raise ValueError("Invalid FLAC STREAMINFO header.")
+
+    # A stand-alone stream: STREAMINFO as the only (last) metadata block, with the number of samples to decode
+    # (36 bits: the lower 4 bits of byte 13 and bytes 14-17) and no MD5 signature
+    num_samples = byte_range.end_sample - byte_range.first_sample
+    streaminfo = bytearray(streaminfo_header[8:STREAMINFO_HEADER_SIZE])
+    streaminfo[13] = (streaminfo[13] & 0xF0) | ((num_samples >> 32) & 0x0F)
+    streaminfo[14:18] = struct.pack(">I", num_samples & 0xFFFFFFFF)
+    streaminfo[18:34] = b"\x00" * 16
+    stream = FLAC_MARKER + bytes([0x80, 0x00, 0x00, 34]) + bytes(streaminfo) + frames
+
+    # Read without seeking: the frames are numbered from `first_sample`, not from 0
+    with sf.SoundFile(io.BytesIO(stream)) as flac_file:
+        waveform = flac_file.read(num_samples, dtype="float32")
+        sampling_rate = flac_file.samplerate
+    return waveform[byte_range.start_sample - byte_range.first_sample:], sampling_rate
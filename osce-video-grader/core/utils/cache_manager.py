@@ -1,9 +1,14 @@
 import os
+import re
 import json
 import fcntl # For file locking on POSIX systems (Linux/macOS)
-from typing import Dict, Any, Optional
+import tempfile
+from typing import Dict, Any, Optional, Tuple, List
+
+import numpy as np
 
 DEFAULT_CACHE_FILE_PATH = "./pipeline_cache.json"
+DEFAULT_FRAME_EMBEDDING_CACHE_DIR = "./data/frame_embedding_cache"
 
 class JsonCache:
     def __init__(self, cache_file_path: str = DEFAULT_CACHE_FILE_PATH):
@@ -82,4 +87,82 @@ class JsonCache:
     def clear_all(self):
         """Clears the entire cache."""
         self.cache_data = {}
-        self._save_cache_file()
\ No newline at end of file
+        self._save_cache_file()
+
+class FrameEmbeddingCache:
+    """
+    Persistent store of per-video frame features: the sampled frame timestamps and their embeddings,
+    saved as a `.npz` file per (video content SHA-256, embedding model, sampling parameters).
+    Lets a video be re-clustered (e.g. with a different number of keyframes, or after a failed run)
+    without decoding and embedding it again.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_FRAME_EMBEDDING_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(
+        embedding_model_name: str,
+        frame_sample_rate: float,
+        **sampling_params: Any
+    ) -> str:
+        """
+        Builds the cache key (file name) of a model and set of sampling parameters 
+        (e.g. the thumbnail size and pre-filter thresholds, which change which frames are embedded, 
+        and the inference backend and precision, which change the embeddings themselves).
+        """
+        parts = [embedding_model_name, f"{float(frame_sample_rate):g}fps"]
+        parts += [f"{name}={value}" for name, value in sorted(sampling_params.items())]
+        return re.sub(r"[^A-Za-z0-9_.=-]+", "_", "__".join(parts))
+
+    def _get_path(self, video_sha256: str, key: str) -> str:
+        return os.path.join(self.cache_dir, video_sha256, f"{key}.npz")
+
+    def load(self, video_sha256: str, key: str) -> Optional[Tuple[np.ndarray, List[float]]]:
+        """Returns the cached (embeddings, timestamps) of a video, or None on a cache miss."""
+        path = self._get_path(video_sha256, key)
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            with np.load(path) as data:
+                embeddings_np = data["embeddings"]
+                timestamps = data["timestamps"].tolist()
+
+            print(f"Loaded {embeddings_np.shape[0]} cached frame embeddings from '{path}'.")
+            return embeddings_np, timestamps
+        
+        except Exception as e:
+            print(f"Warning: Could not read frame embedding cache '{path}': {e}. Ignoring it.")
+            return None
+
+    def save(self, video_sha256: str, key: str, embeddings_np: np.ndarray, timestamps: List[float]):
+        """Stores the (embeddings, timestamps) of a video. Writes are atomic, so readers never see partial files."""
+        path = self._get_path(video_sha256, key)
+        temp_path = None
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz.tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    embeddings=np.asarray(embeddings_np, dtype=np.float32),
+                    timestamps=np.asarray(timestamps, dtype=np.float64)
+                )
+            os.replace(temp_path, path)
+            print(f"Saved {len(timestamps)} frame embeddings to '{path}'.")
+
+        except Exception as e:
+            print(f"Warning: Could not write frame embedding cache '{path}': {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def delete_video(self, video_sha256: str):
+        """Removes every cached entry of a video."""
+        video_dir = os.path.join(self.cache_dir, video_sha256)
+        if not os.path.isdir(video_dir):
+            return
+
+        for filename in os.listdir(video_dir):
+            os.remove(os.path.join(video_dir, filename))
+        os.rmdir(video_dir)
@@ -8,7 +8,13 @@ from transformers import CLIPModel, CLIPProcessor, ClapModel, AutoProcessor
 from sentence_transformers import SentenceTransformer 
 
 from core.utils.helpers import get_device
-from core.utils.audio_processor import DEFAULT_SAMPLING_RATE, resample_audio
+from core.utils.audio_processor import DEFAULT_SAMPLING_RATE, CLAP_SAMPLING_RATE, resample_audio
+from core.utils.inference_backends import (
+    wrap_clip_model,
+    wrap_sentence_transformer,
+    InferenceBackend,
+    DEFAULT_INFERENCE_BACKEND
+)
 
 DEFAULT_CLIP_MODEL_NAME = "openai/clip-vit-base-patch16"
 DEFAULT_CLAP_MODEL_NAME = "laion/clap-htsat-fused"
@@ -17,11 +23,10 @@ DEFAULT_CLIP_EMBEDDING_DIM = 512
 DEFAULT_CLAP_EMBEDDING_DIM = 512 
 DEFAULT_SENTENCE_TRANSFORMERS_EMBEDDING_DIM = 384
 
-CLAP_SAMPLING_RATE = 48000
-
 def load_clip_model_and_processor(
     model_name: str = DEFAULT_CLIP_MODEL_NAME,
-    device: str = get_device()
+    device: str = get_device(),
+    backend: InferenceBackend = DEFAULT_INFERENCE_BACKEND
 ) -> Tuple[CLIPModel, CLIPProcessor]:
     """
     Loads a CLIP model and its processor.
@@ -29,6 +34,7 @@ def load_clip_model_and_processor(
     Args:
         model_name (str): The Hugging Face model identifier for CLIP.
         device (str): The device to load the model onto (e.g., 'cpu', 'cuda').
+        backend (InferenceBackend): 'torch' (eager), 'torchscript', 'onnx' or 'onnx_int8' (the exported backends run on CPU).
 
     Returns:
         Tuple[CLIPModel, CLIPProcessor]: The loaded CLIP model and processor.
@@ -38,8 +44,11 @@ def load_clip_model_and_processor(
     try:
         model = CLIPModel.from_pretrained(model_name).to(device)
         processor = CLIPProcessor.from_pretrained(model_name)
+
+        if backend != "torch":
+            model = wrap_clip_model(model, model_name, backend)
         
-        print(f"CLIP model '{model_name}' loaded successfully on {device}.")
+        print(f"CLIP model '{model_name}' loaded successfully on {device} (backend: {backend}).")
         return model, processor
     
     except Exception as e:
@@ -170,12 +179,16 @@ def generate_clip_text_embeddings_batch(
         return None
 
 @lru_cache(maxsize=4)
-def load_sentence_transformer_model(model_name: str = DEFAULT_SENTENCE_TRANSFORMER_MODEL) -> SentenceTransformer:
+def load_sentence_transformer_model(
+    model_name: str = DEFAULT_SENTENCE_TRANSFORMER_MODEL,
+    backend: InferenceBackend = DEFAULT_INFERENCE_BACKEND
+) -> SentenceTransformer:
     """
     Loads and caches a SentenceTransformer model.
 
     Args:
         model_name (str): The SentenceTransformer model identifier.
+        backend (InferenceBackend): 'torch' (eager) or 'onnx' / 'onnx_int8' (ONNX Runtime on CPU).
 
     Returns:
         SentenceTransformer: The loaded model instance.
@@ -183,7 +196,8 @@ def load_sentence_transformer_model(model_name: str = DEFAULT_SENTENCE_TRANSFORM
     print(f"Loading SentenceTransformer model: {model_name}...")
     try:
         model = SentenceTransformer(model_name)
-        print(f"SentenceTransformer model '{model_name}' loaded successfully.")
+        model = wrap_sentence_transformer(model, model_name, backend)
+        print(f"SentenceTransformer model '{model_name}' loaded successfully (backend: {backend}).")
         return model
     
     except Exception as e:
@@ -379,6 +393,7 @@ def generate_clap_audio_embeddings_batch(
 ) -> Optional[np.ndarray]:
     """
     Generates CLAP audio embeddings for a list of audio waveforms in batches.
+    Waveforms already at `target_sampling_rate` (e.g. decoded at 48 kHz by `decode_audio`) are not resampled.
 
     Args:
         audio_data_list (List[np.ndarray]): List of input audio waveforms.
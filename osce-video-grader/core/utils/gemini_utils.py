@@ -5,8 +5,15 @@ import json
 import time 
 import logging 
 import random 
+import asyncio
+import sqlite3
+import threading
+import uuid
+import weakref
+from enum import Enum
 from typing import Optional, List, Dict, Literal, Type, Union, Any, Sequence
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 
 import numpy as np 
 from PIL import Image 
@@ -20,7 +27,6 @@ from tenacity import (
     retry_if_exception_type,
     before_sleep_log
 )
-from ratelimit import limits, sleep_and_retry
 
 from core.config.config import settings 
 from core.utils.helpers import extract_and_validate_json_from_llm_response, pydantic_schema_to_json_string
@@ -43,6 +49,238 @@ DEFAULT_GEMINI_TEXT_MODEL = "gemini-2.0-flash"
 class GeminiRateLimit(Exception):
     """Raised when Gemini returns a 429 with retryInfo."""
 
+class GeminiRequestPriority(int, Enum):
+    """Priority of a Gemini call when waiting for the rate limiter (lower value = served first)."""
+    INTERACTIVE = 0 # e.g. the tools and agents of /assess_video
+    BACKGROUND = 1 # e.g. keyframe captioning while indexing videos
+
+class GeminiRateLimiter:
+    """
+    Token bucket for the Gemini API quota, shared by every text and image call (`get_gemini_rate_limiter`).
+
+    The bucket holds up to `calls` tokens and refills at `calls / period_seconds` tokens per second; each call takes
+    one token, waiting for it if needed. A waiting call only takes a token if no call of a higher priority is waiting,
+    so interactive traffic overtakes background indexing.
+
+    With `sqlite_path`, the bucket and the waiting calls live in a SQLite database, so that all the processes using
+    the same file (e.g. several uvicorn workers) share one quota. Otherwise the bucket is in-process.
+    """
+    # Waiting calls of other processes that have not polled for this long are considered gone (e.g. killed)
+    _STALE_WAITER_SECONDS = 10.0
+
+    def __init__(
+        self,
+        calls: int = settings.gemini.rate_limit_calls,
+        period_seconds: float = settings.gemini.rate_limit_period_seconds,
+        sqlite_path: Optional[str] = settings.gemini.rate_limiter_sqlite_path or None,
+        poll_interval_seconds: float = 0.5
+    ):
+        """
+        Args:
+            calls (int): Bucket capacity (the maximum burst) and number of calls allowed per `period_seconds`.
+            period_seconds (float): Period of the quota.
+            sqlite_path (Optional[str]): SQLite file to share the bucket across processes, or None for in-process.
+            poll_interval_seconds (float): Maximum wait between two checks of the bucket.
+        """
+        self.capacity = float(calls)
+        self.refill_rate = calls / period_seconds
+        self.sqlite_path = sqlite_path
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self._condition = threading.Condition()
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._waiting = {priority: 0 for priority in GeminiRequestPriority}
+
+        if self.sqlite_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.sqlite_path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS bucket (id INTEGER PRIMARY KEY CHECK (id = 1), tokens REAL NOT NULL, updated_at REAL NOT NULL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS waiters (id TEXT PRIMARY KEY, priority INTEGER NOT NULL, heartbeat REAL NOT NULL)")
+                conn.execute("INSERT OR IGNORE INTO bucket (id, tokens, updated_at) VALUES (1, ?, ?)", (self.capacity, time.time()))
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE (a write lock across processes).
+        # Not bound to the creating thread: async waiters use their connection from worker threads (one at a time).
+        return sqlite3.connect(self.sqlite_path, timeout=30, isolation_level=None, check_same_thread=False)
+
+    def acquire(self, priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE):
+        """Blocks until a token is available for a call of the given priority, and takes it."""
+        if self.sqlite_path:
+            self._acquire_shared(priority)
+        else:
+            self._acquire_local(priority)
+
+    async def acquire_async(self, priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE):
+        """Like `acquire`, but waits with `asyncio.sleep`, without blocking the event loop (or a thread)."""
+        if self.sqlite_path:
+            await self._acquire_shared_async(priority)
+        else:
+            await self._acquire_local_async(priority)
+
+    def drain(self):
+        """Empties the bucket (e.g. after a 429), so that all callers slow down to the refill rate."""
+        if self.sqlite_path:
+            with closing(self._connect()) as conn:
+                conn.execute("UPDATE bucket SET tokens = 0, updated_at = ? WHERE id = 1", (time.time(),))
+        else:
+            with self._condition:
+                self._tokens, self._updated_at = 0.0, time.monotonic()
+
+    def _try_acquire_local(self, priority: GeminiRequestPriority) -> Optional[float]:
+        """Takes a token and returns None, or returns the time to wait before trying again (`_condition` held)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_rate)
+        self._updated_at = now
+
+        higher_priority_waiting = any(self._waiting[p] for p in GeminiRequestPriority if p < priority)
+        if self._tokens >= 1 and not higher_priority_waiting:
+            self._tokens -= 1
+            return None
+
+        return self._wait_time(self._tokens)
+
+    def _acquire_local(self, priority: GeminiRequestPriority):
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait_time = self._try_acquire_local(priority)
+                    if wait_time is None:
+                        return
+                    self._condition.wait(timeout=wait_time)
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    async def _acquire_local_async(self, priority: GeminiRequestPriority):
+        # The lock is only held for the bookkeeping: blocking waiters release it while they wait
+        with self._condition:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._condition:
+                    wait_time = self._try_acquire_local(priority)
+                if wait_time is None:
+                    return
+                await asyncio.sleep(wait_time)
+        finally:
+            with self._condition:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def _try_acquire_shared(
+        self,
+        conn: sqlite3.Connection,
+        waiter_id: str,
+        priority: GeminiRequestPriority
+    ) -> Optional[float]:
+        """Takes a token and returns None, or returns the time to wait before trying again (one short transaction)."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            # Waiters of processes that died without deleting their row
+            conn.execute("DELETE FROM waiters WHERE heartbeat <= ?", (now - self._STALE_WAITER_SECONDS,))
+
+            tokens, updated_at = conn.execute("SELECT tokens, updated_at FROM bucket WHERE id = 1").fetchone()
+            tokens = min(self.capacity, tokens + max(now - updated_at, 0.0) * self.refill_rate)
+
+            higher_priority_waiting = conn.execute(
+                "SELECT COUNT(*) FROM waiters WHERE priority < ?",
+                (int(priority),)
+            ).fetchone()[0]
+
+            acquired = tokens >= 1 and not higher_priority_waiting
+            if acquired:
+                tokens -= 1
+
+            conn.execute("UPDATE bucket SET tokens = ?, updated_at = ? WHERE id = 1", (tokens, now))
+            # Upsert: re-registers this waiter if a long stall (e.g. the busy timeout) got its row deleted as stale
+            conn.execute("INSERT OR REPLACE INTO waiters (id, priority, heartbeat) VALUES (?, ?, ?)", (waiter_id, int(priority), now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return None if acquired else self._wait_time(tokens)
+
+    def _acquire_shared(self, priority: GeminiRequestPriority):
+        waiter_id = uuid.uuid4().hex
+
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT INTO waiters (id, priority, heartbeat) VALUES (?, ?, ?)", (waiter_id, int(priority), time.time()))
+            try:
+                while True:
+                    wait_time = self._try_acquire_shared(conn, waiter_id, priority)
+                    if wait_time is None:
+                        return
+                    time.sleep(wait_time)
+            finally:
+                conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+
+    async def _acquire_shared_async(self, priority: GeminiRequestPriority):
+        # Every SQLite call may wait (up to the busy timeout) for another process's write lock:
+        # they all run in worker threads, only the waits between polls are on the event loop
+        waiter_id = uuid.uuid4().hex
+
+        conn = await asyncio.to_thread(self._connect)
+        try:
+            await asyncio.to_thread(
+                conn.execute,
+                "INSERT INTO waiters (id, priority, heartbeat) VALUES (?, ?, ?)",
+                (waiter_id, int(priority), time.time())
+            )
+            try:
+                while True:
+                    wait_time = await asyncio.to_thread(self._try_acquire_shared, conn, waiter_id, priority)
+                    if wait_time is None:
+                        return
+                    await asyncio.sleep(wait_time)
+            finally:
+                await asyncio.to_thread(conn.execute, "DELETE FROM waiters WHERE id = ?", (waiter_id,))
+        finally:
+            await asyncio.to_thread(conn.close)
+
+    async def drain_async(self):
+        """Like `drain`, without blocking the event loop on the SQLite write lock."""
+        if self.sqlite_path:
+            await asyncio.to_thread(self.drain)
+        else:
+            self.drain()
+
+    def _wait_time(self, tokens: float) -> float:
+        """Time until the next token (capped by the poll interval, to notice higher-priority calls finishing)."""
+        if tokens >= 1:
+            return self.poll_interval_seconds
+        return min((1 - tokens) / self.refill_rate, self.poll_interval_seconds)
+
+_gemini_rate_limiter: Optional[GeminiRateLimiter] = None
+_gemini_rate_limiter_lock = threading.Lock()
+
+def get_gemini_rate_limiter() -> GeminiRateLimiter:
+    """Returns the process-wide Gemini rate limiter (created on first use from `settings.gemini`)."""
+    global _gemini_rate_limiter
+
+    with _gemini_rate_limiter_lock:
+        if _gemini_rate_limiter is None:
+            _gemini_rate_limiter = GeminiRateLimiter()
+        return _gemini_rate_limiter
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Whether a Gemini API error is a quota error (HTTP 429 / RESOURCE_EXHAUSTED), from its structured fields only."""
+    return getattr(error, "code", None) == 429 or getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+
+# One semaphore per event loop (an asyncio.Semaphore must not be shared between loops)
+_gemini_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _get_gemini_async_semaphore() -> asyncio.Semaphore:
+    """Returns the semaphore bounding the in-flight async Gemini calls of the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _gemini_async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _gemini_async_semaphores[loop] = asyncio.Semaphore(settings.gemini.max_concurrent_requests)
+    return semaphore
+
 
 def load_gemini_client(
     api_key: str = settings.gemini.api_key
@@ -67,7 +305,8 @@ def generate_text_content_with_gemini(
     max_output_tokens: Optional[int] = None,
     temperature: float = 0,
     top_p: float = 1.0,
-    top_k: float = 35
+    top_k: float = 35,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
 ):
     """Generate content from Gemini using a text-only prompt."""
     if not client:
@@ -75,6 +314,7 @@ def generate_text_content_with_gemini(
          return None
     
     try:
+        get_gemini_rate_limiter().acquire(priority)
         response = client.models.generate_content(
             model=model_id,
             contents=[
@@ -92,6 +332,8 @@ def generate_text_content_with_gemini(
 
     except Exception as e:
         print(f"An error occurred while generating response: {e}")
+        if _is_rate_limit_error(e):
+            get_gemini_rate_limiter().drain()
         
         return None 
 
@@ -107,6 +349,7 @@ def generate_text_content_gemini_with_retry(
     max_retries: int = 10,
     min_delay: float = 25.0, 
     max_delay: float = 30.0,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
 ):
     """Generate content from Gemini using a text-only prompt (with a retry mechanism)."""
     try:    
@@ -122,8 +365,10 @@ def generate_text_content_gemini_with_retry(
         
         return None 
     
+    rate_limiter = get_gemini_rate_limiter()
     for attempt in range(max_retries):
         try:
+            rate_limiter.acquire(priority)
             response = client.models.generate_content(
                 model=model_id,
                 contents=[
@@ -136,6 +381,9 @@ def generate_text_content_gemini_with_retry(
         
         except Exception as e:
             try:
+                if _is_rate_limit_error(e):
+                    rate_limiter.drain()
+
                 if attempt + 1 == max_retries: 
                     print(f"Max retries reached. Failing permanently.")
                     break 
@@ -159,7 +407,8 @@ def generate_image_content_with_gemini(
     max_output_tokens: Optional[int] = None,
     temperature: float = 0,
     top_p: float = 1.0,
-    top_k: float = 35
+    top_k: float = 35,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
 ):
     """Generate content from Gemini using an image and text prompt."""
     if not client:
@@ -172,6 +421,7 @@ def generate_image_content_with_gemini(
         pil_image.save(img_byte_arr, format="JPEG")
         image_bytes = img_byte_arr.getvalue()
 
+        get_gemini_rate_limiter().acquire(priority)
         response = client.models.generate_content(
             model=model_id,
             contents=[
@@ -193,6 +443,8 @@ def generate_image_content_with_gemini(
 
     except Exception as e:
         print(f"An error occurred while generating response: {e}")
+        if _is_rate_limit_error(e):
+            get_gemini_rate_limiter().drain()
         
         return None 
     
@@ -207,7 +459,8 @@ def generate_image_content_gemini_with_retry(
     max_output_tokens: Optional[int] = None,
     temperature: float = 0,
     top_p: float = 1.0,
-    top_k: float = 35
+    top_k: float = 35,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
 ):
     """Generate content from Gemini using an image and text prompt, with a self-contained exponential backoff retry mechanism."""
     try:
@@ -228,8 +481,10 @@ def generate_image_content_gemini_with_retry(
         
         return None 
     
+    rate_limiter = get_gemini_rate_limiter()
     for attempt in range(max_retries):
         try:
+            rate_limiter.acquire(priority)
             response = client.models.generate_content(
                 model=model_id,
                 contents=[
@@ -246,6 +501,9 @@ def generate_image_content_gemini_with_retry(
         
         except Exception as e:
             try:
+                if _is_rate_limit_error(e):
+                    rate_limiter.drain()
+
                 if attempt + 1 == max_retries: 
                     print(f"Max retries reached. Failing permanently.")
                     break 
@@ -261,12 +519,251 @@ def generate_image_content_gemini_with_retry(
             
     return None
 
+def _pil_image_to_jpeg_bytes(pil_image: Image.Image) -> bytes:
+    img_byte_arr = io.BytesIO()
+    pil_image.save(img_byte_arr, format="JPEG")
+    return img_byte_arr.getvalue()
+
+async def _generate_content_async(
+    client: genai.Client,
+    model_id: str,
+    contents: List[Any],
+    config: types.GenerateContentConfig,
+    priority: GeminiRequestPriority
+) -> str:
+    """
+    Single call through the SDK's async client (`client.aio`): waits for a token of the shared rate limiter,
+    then for a slot of the event loop's concurrency semaphore. Raises on API errors.
+    """
+    # Rate limiter first: a call waiting for a token must not hold a slot that a higher-priority call needs
+    await get_gemini_rate_limiter().acquire_async(priority)
+
+    async with _get_gemini_async_semaphore():
+        response = await client.aio.models.generate_content(
+            model=model_id,
+            contents=contents,
+            config=config
+        )
+
+    return response.text
+
+async def generate_text_content_with_gemini_async(
+    client: genai.Client, 
+    prompt_text: str, 
+    model_id: str = DEFAULT_GEMINI_TEXT_MODEL, 
+    max_output_tokens: Optional[int] = None,
+    temperature: float = 0,
+    top_p: float = 1.0,
+    top_k: float = 35,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
+) -> Optional[str]:
+    """Async version of `generate_text_content_with_gemini`."""
+    if not client:
+         print("Gemini client is required.")
+         return None
+
+    try:
+        return await _generate_content_async(
+            client=client,
+            model_id=model_id,
+            contents=[prompt_text],
+            config=types.GenerateContentConfig(
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                top_k=top_k
+            ),
+            priority=priority
+        )
+
+    except Exception as e:
+        print(f"An error occurred while generating response: {e}")
+        if _is_rate_limit_error(e):
+            await get_gemini_rate_limiter().drain_async()
+
+        return None
+
+async def _generate_content_with_retry_async(
+    client: genai.Client,
+    model_id: str,
+    contents: List[Any],
+    config: types.GenerateContentConfig,
+    priority: GeminiRequestPriority,
+    max_retries: int,
+    min_delay: float,
+    max_delay: float
+) -> Optional[str]:
+    """Retry loop of the `*_with_retry_async` functions: waits between attempts with `asyncio.sleep`."""
+    rate_limiter = get_gemini_rate_limiter()
+    for attempt in range(max_retries):
+        try:
+            return await _generate_content_async(client, model_id, contents, config, priority)
+
+        except Exception as e:
+            print(f"An error occurred while generating response (attempt {attempt + 1}/{max_retries}): {e}")
+            if _is_rate_limit_error(e):
+                await rate_limiter.drain_async()
+
+            if attempt + 1 == max_retries: 
+                print("Max retries reached. Failing permanently.")
+                break 
+
+            delay = random.uniform(min_delay, max_delay)
+
+            print(f"Waiting for {delay:.2f} seconds before retrying...")
+            await asyncio.sleep(delay)
+
+    return None
+
+async def generate_text_content_gemini_with_retry_async(
+    client: genai.Client, 
+    prompt_text: str, 
+    model_id: str = DEFAULT_GEMINI_TEXT_MODEL, 
+    max_output_tokens: Optional[int] = None,
+    temperature: float = 0,
+    top_p: float = 1.0,
+    top_k: float = 35,
+    max_retries: int = 10,
+    min_delay: float = 25.0, 
+    max_delay: float = 30.0,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
+) -> Optional[str]:
+    """Async version of `generate_text_content_gemini_with_retry` (the delays between retries do not block the event loop)."""
+    return await _generate_content_with_retry_async(
+        client=client,
+        model_id=model_id,
+        contents=[prompt_text],
+        config=types.GenerateContentConfig(
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k
+        ),
+        priority=priority,
+        max_retries=max_retries,
+        min_delay=min_delay,
+        max_delay=max_delay
+    )
+
+async def generate_image_content_with_gemini_async(
+    client: genai.Client,
+    pil_image: Image.Image,
+    prompt_text: str,
+    model_id: str = DEFAULT_GEMINI_IMAGE_MODEL,
+    max_output_tokens: Optional[int] = None,
+    temperature: float = 0,
+    top_p: float = 1.0,
+    top_k: float = 35,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
+) -> Optional[str]:
+    """Async version of `generate_image_content_with_gemini` (the JPEG encoding runs in a worker thread)."""
+    if not client:
+         print("Gemini client is required.")
+         return None
+
+    try:
+        image_bytes = await asyncio.to_thread(_pil_image_to_jpeg_bytes, pil_image)
+
+        return await _generate_content_async(
+            client=client,
+            model_id=model_id,
+            contents=[
+                prompt_text,
+                types.Part.from_bytes(
+                    data=image_bytes,
+                    mime_type="image/jpeg"
+                )
+            ],
+            config=types.GenerateContentConfig(
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                top_k=top_k
+            ),
+            priority=priority
+        )
+
+    except Exception as e:
+        print(f"An error occurred while generating response: {e}")
+        if _is_rate_limit_error(e):
+            await get_gemini_rate_limiter().drain_async()
+
+        return None
+
+async def generate_image_content_gemini_with_retry_async(
+    client: genai.Client, 
+    pil_image: Image.Image, 
+    prompt_text: str, 
+    model_id: str = DEFAULT_GEMINI_IMAGE_MODEL,
+    max_retries: int = 10, 
+    min_delay: float = 25.0, 
+    max_delay: float = 30.0,
+    max_output_tokens: Optional[int] = None,
+    temperature: float = 0,
+    top_p: float = 1.0,
+    top_k: float = 35,
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
+) -> Optional[str]:
+    """Async version of `generate_image_content_gemini_with_retry` (the delays between retries do not block the event loop)."""
+    try:
+        image_bytes = await asyncio.to_thread(_pil_image_to_jpeg_bytes, pil_image)
+
+    except Exception as e:
+        print(f"An error occurred while generating response: {e}")
+        return None
+
+    return await _generate_content_with_retry_async(
+        client=client,
+        model_id=model_id,
+        contents=[
+            prompt_text,
+            types.Part.from_bytes(
+                data=image_bytes,
+                mime_type="image/jpeg"
+            )
+        ],
+        config=types.GenerateContentConfig(
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k
+        ),
+        priority=priority,
+        max_retries=max_retries,
+        min_delay=min_delay,
+        max_delay=max_delay
+    )
+
+async def generate_image_contents_gemini_with_retry_async(
+    client: genai.Client,
+    pil_images: Sequence[Image.Image],
+    prompt_texts: Sequence[str],
+    **kwargs
+) -> List[Optional[str]]:
+    """
+    Batch version of `generate_image_content_gemini_with_retry_async`: one call per (image, prompt) pair, all
+    awaited concurrently with `asyncio.gather` (bounded by the rate limiter and the concurrency semaphore).
+
+    Returns:
+        List[Optional[str]]: The responses, in the order of the inputs (None for the failed calls).
+    """
+    return list(await asyncio.gather(*(
+        generate_image_content_gemini_with_retry_async(
+            client=client,
+            pil_image=pil_image,
+            prompt_text=prompt_text,
+            **kwargs
+        )
+        for pil_image, prompt_text in zip(pil_images, prompt_texts)
+    )))
+
 def generate_image_description_using_gemini(
     client: genai.Client, 
     pil_image: Image.Image,
     output_schema: BaseModel,
     prompt: str = OSCE_KEYFRAME_CAPTIONER_PROMPT,
-    response_format: Literal["raw", "json"] = "json"
+    response_format: Literal["raw", "json"] = "json",
+    priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE
 ):
     json_format_str = pydantic_schema_to_json_string(output_schema)
     json_format_str = json_format_str.replace("{", "{{").replace("}", "}}")
@@ -279,7 +776,8 @@ def generate_image_description_using_gemini(
         raw_response = generate_image_content_with_gemini(
             client=client, 
             pil_image=pil_image, 
-            prompt_text=prompt 
+            prompt_text=prompt,
+            priority=priority
         )
 
         if response_format == "json":
@@ -301,11 +799,10 @@ class GeminiImageBatchProcessor:
         client: genai.Client,
         prompt_template: str,
         output_schema: Type[BaseModel],
-        rate_limit_calls: int = 10,
-        rate_limit_period: int = 60,
         max_retries: int = 5,
         max_backoff: int = 120,
         max_workers: int = 4,
+        priority: GeminiRequestPriority = GeminiRequestPriority.INTERACTIVE,
     ):
         """
         A robust, concurrent batch-processor for generating descriptions of images via Gemini API.
@@ -314,11 +811,10 @@ class GeminiImageBatchProcessor:
           - client (genai.Client): Google Gemini API Client.
           - prompt_template (str): Prompt for generating the image description.
           - output_schema (BaseModel): Pydantic schema class to validate the structured JSON output.
-          - rate_limit_calls (int): Max calls per rate_limit_period (default 10)
-          - rate_limit_period (int): Seconds in which rate_limit_calls applies (default 60)
           - max_retries (int): Retry attempts on failure (default 5)
           - max_backoff (int): Maximum backoff time in seconds (default 120)
           - max_workers (int): Size of the thread pool for concurrent image processing (default 4).
+          - priority (GeminiRequestPriority): Priority of the calls in the shared Gemini rate limiter (default INTERACTIVE)
         """
         self.client = client
         self.prompt_template = prompt_template
@@ -329,17 +825,17 @@ class GeminiImageBatchProcessor:
         escaped = raw_schema.replace("{", "{{").replace("}", "}}")
         self.prompt = prompt_template.format(json_format_str=escaped)
 
-        # rate‐limit decorator parameters
-        self._rate_limit_calls = rate_limit_calls
-        self._rate_limit_period = rate_limit_period
+        # calls are throttled by the rate limiter shared by all Gemini calls (see `get_gemini_rate_limiter`)
+        self._priority = priority
 
         # retry decorator parameters
         self._max_retries = max_retries
         self._max_backoff = max_backoff
 
         # bind decorated methods
-        self._throttled_call = self._make_throttled(self._make_retry(self._call_once))
+        self._throttled_call = self._make_retry(self._call_once)
         self._process_image = self._make_process(self._throttled_call)
+        self._throttled_call_async = self._make_retry_async(self._call_once_async)
 
     def _parse_retry_delay(self, payload: dict) -> float:
         """Extract '42s' → 42.0 from RetryInfo in error payload."""
@@ -380,23 +876,39 @@ class GeminiImageBatchProcessor:
             return raw
         return wrapped
 
-    def _make_throttled(self, fn):
-        """Wrap `fn(img)` to rate-limit calls per config."""
-        @sleep_and_retry
-        @limits(
-            calls=self._rate_limit_calls,
-            period=self._rate_limit_period
+    def _make_retry_async(self, fn):
+        """Async version of `_make_retry` (tenacity awaits `asyncio.sleep` between the attempts)."""
+        @retry(
+            reraise=True,
+            stop=stop_after_attempt(self._max_retries),
+            wait=wait_exponential(multiplier=1, max=self._max_backoff),
+            retry=retry_if_exception_type((GeminiRateLimit, Exception)),
+            before_sleep=before_sleep_log(logger, logging.WARNING),
         )
-        def wrapped(img: Image.Image) -> str:
-            return fn(img)
+        async def wrapped(img: Image.Image) -> str:
+            raw = await fn(img)
+
+            if raw is None:
+                raise Exception("Empty response from Gemini")
+            return raw
         return wrapped
 
     def _call_once(self, img: Image.Image) -> str:
-        """Single Gemini API call."""
+        """Single Gemini API call (each attempt waits for a token of the shared rate limiter)."""
         return generate_image_content_with_gemini(
             client=self.client,
             pil_image=img,
             prompt_text=self.prompt,
+            priority=self._priority
+        )
+
+    async def _call_once_async(self, img: Image.Image) -> str:
+        """Single async Gemini API call."""
+        return await generate_image_content_with_gemini_async(
+            client=self.client,
+            pil_image=img,
+            prompt_text=self.prompt,
+            priority=self._priority
         )
 
     def _make_process(self, fn):
@@ -429,6 +941,31 @@ class GeminiImageBatchProcessor:
                 pil_images
             ))
 
+    async def process_batch_async(
+        self,
+        pil_images: Sequence[Image.Image],
+        response_format: str = "json",
+    ) -> List[Union[str, Dict[str, Any]]]:
+        """
+        Async version of `process_batch`: the images are processed concurrently on the event loop with
+        `asyncio.gather` (at most `max_workers` at once), preserving order.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def process_image(img: Image.Image) -> Union[str, Dict[str, Any]]:
+            async with semaphore:
+                raw = await self._throttled_call_async(img)
+
+            if response_format == "raw":
+                return raw
+
+            return extract_and_validate_json_from_llm_response(
+                raw, 
+                self.output_schema
+            )
+
+        return list(await asyncio.gather(*(process_image(img) for img in pil_images)))
+
 if __name__ == "__main__":
     gemini_client = load_gemini_client()
     
@@ -478,8 +1015,6 @@ if __name__ == "__main__":
         client=gemini_client,
         prompt_template=OSCE_KEYFRAME_CAPTIONER_PROMPT,
         output_schema=KeyframeDescriptionOutput,
-        rate_limit_calls=10,
-        rate_limit_period=60,
         max_retries=5,
         max_backoff=120,
         max_workers=4,
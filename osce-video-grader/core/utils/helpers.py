@@ -2,6 +2,7 @@ import re
 import os 
 import json 
 import uuid 
+import hashlib
 from typing import Type, Any, Dict, List, get_args, get_origin  
 
 import cv2 
@@ -159,6 +160,15 @@ def cleanup_local_file(filepath: str):
         except Exception as e:
             print(f"Error cleaning up local file {filepath}: {e}")
 
+def compute_file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Returns the hex SHA-256 digest of a file's content, read in chunks."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
 if __name__ == "__main__":
     # device = get_device()
     # print(f"Using device: {device}")
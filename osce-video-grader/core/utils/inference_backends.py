@@ -0,0 +1,388 @@
+"""
+Optional exported inference backends for the ResNet, CLIP and sentence-transformer models.
+
+The wrappers below expose the same call surface as the eager PyTorch models that the embedding functions in
+`core/utils/embedding_utils.py` and `core/utils/video_processor.py` already use (`model(x)`,
+`get_image_features`, `get_text_features`, `encode`, `eval`, `to`), so those functions work unchanged.
+
+Backends:
+    - "torch": eager fp32 PyTorch (default, no export).
+    - "torchscript": traced TorchScript run under `torch.inference_mode()` with channels_last inputs
+        (vision encoders only; text encoders stay eager).
+    - "onnx": fp32 ONNX Runtime on CPU.
+    - "onnx_int8": ONNX Runtime on CPU with dynamic int8 weight quantization.
+
+Exported graphs are written once to `settings.inference.export_dir` and reused across restarts.
+"""
+import os
+import re
+from typing import Literal, Optional, List, Dict, Union, Callable
+
+import torch
+import torch.nn as nn
+import numpy as np
+
+from core.config.config import settings
+
+InferenceBackend = Literal["torch", "torchscript", "onnx", "onnx_int8"]
+
+DEFAULT_INFERENCE_BACKEND = "torch"
+ONNX_OPSET_VERSION = 17
+CLIP_IMAGE_SIZE = 224
+CLIP_TEXT_MAX_LENGTH = 77
+
+
+def get_inference_backend_precision(backend: InferenceBackend) -> str:
+    """Numeric precision of the model weights under a backend (embeddings of different precisions must not be mixed)."""
+    return "int8" if backend == "onnx_int8" else "fp32"
+
+def _get_export_path(model_name: str, component: str, extension: str) -> str:
+    safe_model_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    export_dir = os.path.join(settings.inference.export_dir, safe_model_name)
+    os.makedirs(export_dir, exist_ok=True)
+
+    return os.path.join(export_dir, f"{component}.{extension}")
+
+def _export_onnx(
+    module: nn.Module,
+    example_inputs: tuple,
+    export_path: str,
+    input_names: List[str],
+    dynamic_axes: Dict[str, Dict[int, str]]
+):
+    """Exports `module` to ONNX (fp32, CPU) unless the file already exists."""
+    if os.path.exists(export_path):
+        return
+
+    print(f"Exporting ONNX model to '{export_path}'...")
+    module = module.cpu().eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            example_inputs,
+            export_path,
+            input_names=input_names,
+            output_names=["features"],
+            dynamic_axes={**dynamic_axes, "features": {0: "batch"}},
+            opset_version=ONNX_OPSET_VERSION
+        )
+
+def _quantize_onnx(fp32_path: str) -> str:
+    """Applies dynamic int8 weight quantization to an exported ONNX model (cached next to it)."""
+    int8_path = fp32_path.replace(".onnx", ".int8.onnx")
+    if os.path.exists(int8_path):
+        return int8_path
+
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    print(f"Quantizing '{fp32_path}' to int8...")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+class OnnxSession:
+    """Thin wrapper around an ONNX Runtime CPU session returning torch tensors."""
+    def __init__(self, model_path: str):
+        import onnxruntime as ort
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.inference.num_threads > 0:
+            session_options.intra_op_num_threads = settings.inference.num_threads
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def run(self, **inputs: Union[torch.Tensor, np.ndarray]) -> torch.Tensor:
+        feed = {}
+        for name in self.input_names:
+            value = inputs[name]
+            if isinstance(value, torch.Tensor):
+                value = value.detach().cpu().numpy()
+            feed[name] = value
+
+        return torch.from_numpy(self.session.run(None, feed)[0])
+
+def _build_onnx_session(
+    module: nn.Module,
+    example_inputs: tuple,
+    model_name: str,
+    component: str,
+    input_names: List[str],
+    dynamic_axes: Dict[str, Dict[int, str]],
+    backend: InferenceBackend
+) -> OnnxSession:
+    export_path = _get_export_path(model_name, component, "onnx")
+    _export_onnx(module, example_inputs, export_path, input_names, dynamic_axes)
+
+    if backend == "onnx_int8":
+        export_path = _quantize_onnx(export_path)
+
+    return OnnxSession(export_path)
+
+class _ExportedModel:
+    """Base class for exported models: mimics the `nn.Module` methods the embedding functions call."""
+    def eval(self):
+        return self
+
+    def to(self, *args, **kwargs):
+        return self
+
+class ExportedImageEncoder(_ExportedModel):
+    """Drop-in replacement for a feature extractor called as `model(batch_tensor)` (e.g. the ResNet backbone)."""
+    def __init__(self, forward_fn: Callable[[torch.Tensor], torch.Tensor], backend: InferenceBackend):
+        self.forward_fn = forward_fn
+        self.backend = backend
+
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        return self.forward_fn(pixel_values)
+
+class ExportedClipModel(_ExportedModel):
+    """Drop-in replacement for `CLIPModel` exposing `get_image_features` and `get_text_features`."""
+    def __init__(
+        self,
+        image_forward_fn: Callable[[torch.Tensor], torch.Tensor],
+        text_forward_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor],
+        backend: InferenceBackend
+    ):
+        self.image_forward_fn = image_forward_fn
+        self.text_forward_fn = text_forward_fn
+        self.backend = backend
+
+    def get_image_features(self, pixel_values: torch.Tensor, **kwargs) -> torch.Tensor:
+        return self.image_forward_fn(pixel_values)
+
+    def get_text_features(self, input_ids: torch.Tensor, attention_mask: Optional[torch.Tensor] = None, **kwargs) -> torch.Tensor:
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        return self.text_forward_fn(input_ids, attention_mask)
+
+class _ClipImageFeatures(nn.Module):
+    def __init__(self, clip_model: nn.Module):
+        super().__init__()
+        self.clip_model = clip_model
+
+    def forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        return self.clip_model.get_image_features(pixel_values=pixel_values)
+
+class _ClipTextFeatures(nn.Module):
+    def __init__(self, clip_model: nn.Module):
+        super().__init__()
+        self.clip_model = clip_model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.clip_model.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+
+class _SentenceTokenEmbeddings(nn.Module):
+    def __init__(self, transformer_model: nn.Module):
+        super().__init__()
+        self.transformer_model = transformer_model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.transformer_model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+def _torchscript_image_forward(module: nn.Module, example_input: torch.Tensor) -> Callable[[torch.Tensor], torch.Tensor]:
+    """Traces a CPU image module with channels_last weights and returns a forward function run in inference mode."""
+    module = module.cpu().eval().to(memory_format=torch.channels_last)
+    with torch.inference_mode():
+        traced_module = torch.jit.optimize_for_inference(
+            torch.jit.trace(module, example_input.to(memory_format=torch.channels_last))
+        )
+
+    def forward(pixel_values: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            return traced_module(pixel_values.cpu().contiguous(memory_format=torch.channels_last))
+
+    return forward
+
+def wrap_image_encoder(
+    model: nn.Module,
+    model_name: str,
+    backend: InferenceBackend,
+    image_size: int = CLIP_IMAGE_SIZE
+) -> Union[nn.Module, ExportedImageEncoder]:
+    """
+    Returns `model` (an image feature extractor such as the headless ResNet) running on `backend`.
+
+    Args:
+        model (nn.Module): The eager PyTorch model, called as `model(batch_tensor)`.
+        model_name (str): Name used to cache the exported graph.
+        backend (InferenceBackend): Inference backend.
+        image_size (int): Input height/width used for export (the batch and spatial axes stay dynamic for ONNX).
+    """
+    if backend == "torch":
+        return model
+
+    example_input = torch.randn(1, 3, image_size, image_size)
+
+    if backend == "torchscript":
+        return ExportedImageEncoder(_torchscript_image_forward(model, example_input), backend)
+
+    if backend in ("onnx", "onnx_int8"):
+        session = _build_onnx_session(
+            model,
+            (example_input,),
+            model_name,
+            "image_encoder",
+            input_names=["pixel_values"],
+            dynamic_axes={"pixel_values": {0: "batch", 2: "height", 3: "width"}},
+            backend=backend
+        )
+        return ExportedImageEncoder(lambda pixel_values: session.run(pixel_values=pixel_values), backend)
+
+    raise ValueError(f"Unsupported inference backend: {backend}. Use 'torch', 'torchscript', 'onnx' or 'onnx_int8'.")
+
+def wrap_clip_model(
+    clip_model: nn.Module,
+    model_name: str,
+    backend: InferenceBackend
+) -> Union[nn.Module, ExportedClipModel]:
+    """
+    Returns `clip_model` running on `backend` (see the module docstring).
+    With "torchscript", only the image tower is traced; text features stay eager.
+    """
+    if backend == "torch":
+        return clip_model
+
+    clip_model = clip_model.cpu().eval()
+    example_pixel_values = torch.randn(1, 3, CLIP_IMAGE_SIZE, CLIP_IMAGE_SIZE)
+    example_input_ids = torch.ones(1, CLIP_TEXT_MAX_LENGTH, dtype=torch.long)
+    example_attention_mask = torch.ones(1, CLIP_TEXT_MAX_LENGTH, dtype=torch.long)
+
+    if backend == "torchscript":
+        image_forward_fn = _torchscript_image_forward(_ClipImageFeatures(clip_model), example_pixel_values)
+
+        def text_forward_fn(input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+            with torch.inference_mode():
+                return clip_model.get_text_features(input_ids=input_ids.cpu(), attention_mask=attention_mask.cpu())
+
+        return ExportedClipModel(image_forward_fn, text_forward_fn, backend)
+
+    if backend in ("onnx", "onnx_int8"):
+        image_session = _build_onnx_session(
+            _ClipImageFeatures(clip_model),
+            (example_pixel_values,),
+            model_name,
+            "image_encoder",
+            input_names=["pixel_values"],
+            dynamic_axes={"pixel_values": {0: "batch"}},
+            backend=backend
+        )
+        text_session = _build_onnx_session(
+            _ClipTextFeatures(clip_model),
+            (example_input_ids, example_attention_mask),
+            model_name,
+            "text_encoder",
+            input_names=["input_ids", "attention_mask"],
+            dynamic_axes={"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"}},
+            backend=backend
+        )
+        return ExportedClipModel(
+            lambda pixel_values: image_session.run(pixel_values=pixel_values),
+            lambda input_ids, attention_mask: text_session.run(
+                input_ids=input_ids.long(), attention_mask=attention_mask.long()
+            ),
+            backend
+        )
+
+    raise ValueError(f"Unsupported inference backend: {backend}. Use 'torch', 'torchscript', 'onnx' or 'onnx_int8'.")
+
+class ExportedSentenceEncoder(_ExportedModel):
+    """
+    Drop-in replacement for `SentenceTransformer.encode` for models made of a transformer, mean pooling
+    and (optionally) normalization, such as all-MiniLM-L6-v2.
+    """
+    def __init__(self, session: OnnxSession, tokenizer, max_seq_length: int, normalize: bool, backend: InferenceBackend):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_seq_length = max_seq_length
+        self.normalize = normalize
+        self.backend = backend
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        **kwargs
+    ) -> np.ndarray:
+        is_single_sentence = isinstance(sentences, str)
+        if is_single_sentence:
+            sentences = [sentences]
+
+        all_embeddings = []
+        for start in range(0, len(sentences), batch_size):
+            inputs = self.tokenizer(
+                sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            attention_mask = inputs["attention_mask"].astype(np.int64)
+            token_embeddings = self.session.run(
+                input_ids=inputs["input_ids"].astype(np.int64), attention_mask=attention_mask
+            ).numpy()
+
+            # Mean pooling over the non-padding tokens
+            mask = attention_mask[..., None].astype(token_embeddings.dtype)
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+            if self.normalize:
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                embeddings = embeddings / np.where(norms == 0, 1.0, norms)
+
+            all_embeddings.append(embeddings)
+
+        embeddings = np.vstack(all_embeddings) if all_embeddings else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if is_single_sentence else embeddings
+
+def wrap_sentence_transformer(
+    model,
+    model_name: str,
+    backend: InferenceBackend
+):
+    """
+    Returns the SentenceTransformer `model` running on `backend`.
+    Only the ONNX backends are supported for text encoders; "torchscript" keeps the eager model.
+    """
+    if backend in ("torch", "torchscript"):
+        if backend == "torchscript":
+            print("TorchScript backend is not supported for sentence transformers. Using eager PyTorch.")
+        return model
+
+    if backend not in ("onnx", "onnx_int8"):
+        raise ValueError(f"Unsupported inference backend: {backend}. Use 'torch', 'torchscript', 'onnx' or 'onnx_int8'.")
+
+    from sentence_transformers.models import Pooling, Normalize
+
+    pooling_modules = [module for module in model if isinstance(module, Pooling)]
+    if pooling_modules and pooling_modules[0].get_pooling_mode_str() != "mean":
+        print(f"Unsupported pooling mode for ONNX export of '{model_name}'. Using eager PyTorch.")
+        return model
+
+    transformer_model = model[0].auto_model.cpu().eval()
+    example_input_ids = torch.ones(1, 16, dtype=torch.long)
+    example_attention_mask = torch.ones(1, 16, dtype=torch.long)
+
+    session = _build_onnx_session(
+        _SentenceTokenEmbeddings(transformer_model),
+        (example_input_ids, example_attention_mask),
+        model_name,
+        "sentence_encoder",
+        input_names=["input_ids", "attention_mask"],
+        dynamic_axes={"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"}},
+        backend=backend
+    )
+
+    return ExportedSentenceEncoder(
+        session,
+        tokenizer=model.tokenizer,
+        max_seq_length=model.max_seq_length,
+        normalize=any(isinstance(module, Normalize) for module in model),
+        backend=backend
+    )
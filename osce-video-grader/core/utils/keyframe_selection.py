@@ -0,0 +1,172 @@
+from typing import List, Literal, Optional
+
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA
+
+# constants
+DEFAULT_KEYFRAME_SELECTOR = "auto"
+MINIBATCH_KMEANS_MIN_CANDIDATES = 2000 # "auto" switches to MiniBatchKMeans from this many candidate frames
+DEFAULT_PCA_COMPONENTS = 64 # "auto" reduces embeddings to this dimension before MiniBatchKMeans
+DEFAULT_MINIBATCH_SIZE = 1024
+
+KeyframeSelector = Literal["auto", "kmeans", "minibatch_kmeans", "temporal_segmentation"]
+
+def closest_to_centroids(
+    distances_to_centroids: np.ndarray,
+    cluster_labels: np.ndarray
+) -> List[int]:
+    """
+    Picks, for each cluster, the member closest to the cluster's centroid in a single vectorized pass.
+
+    Args:
+        distances_to_centroids (np.ndarray): (N, K) distances of every frame to every centroid (e.g. `kmeans.transform(X)`).
+        cluster_labels (np.ndarray): (N,) cluster label of every frame.
+
+    Returns:
+        List[int]: Sorted, de-duplicated indices of the representative frames (empty clusters are skipped).
+    """
+    num_clusters = distances_to_centroids.shape[1]
+    is_member = cluster_labels[:, None] == np.arange(num_clusters)[None, :]
+
+    member_distances = np.where(is_member, distances_to_centroids, np.inf)
+    closest_indices = np.argmin(member_distances, axis=0)
+    non_empty_clusters = is_member.any(axis=0)
+
+    return sorted(set(closest_indices[non_empty_clusters].tolist()))
+
+def reduce_dimensions(
+    embeddings_np: np.ndarray,
+    num_components: Optional[int],
+    random_state: int = 0
+) -> np.ndarray:
+    """Projects the embeddings onto their first `num_components` principal components (no-op if None or not smaller)."""
+    if not num_components:
+        return embeddings_np
+
+    num_components = min(num_components, embeddings_np.shape[0], embeddings_np.shape[1])
+    if num_components >= embeddings_np.shape[1]:
+        return embeddings_np
+
+    print(f"Reducing embeddings from {embeddings_np.shape[1]} to {num_components} dimensions with PCA...")
+    return PCA(n_components=num_components, random_state=random_state).fit_transform(embeddings_np)
+
+def select_by_kmeans(
+    embeddings_np: np.ndarray,
+    num_keyframes: int,
+    use_minibatch: bool = False,
+    pca_components: Optional[int] = None,
+    batch_size: int = DEFAULT_MINIBATCH_SIZE,
+    random_state: int = 0
+) -> List[int]:
+    """
+    Clusters the embeddings with (MiniBatch)KMeans and picks the frame closest to each centroid.
+
+    Args:
+        embeddings_np (np.ndarray): (N, D) candidate frame embeddings.
+        num_keyframes (int): Number of clusters (K).
+        use_minibatch (bool): Use MiniBatchKMeans instead of full KMeans (for long videos).
+        pca_components (Optional[int]): If set, cluster in a PCA-reduced space of this dimension.
+        batch_size (int): Mini-batch size for MiniBatchKMeans.
+        random_state (int): Random seed.
+
+    Returns:
+        List[int]: Sorted indices of the selected frames.
+    """
+    features = reduce_dimensions(embeddings_np, pca_components, random_state)
+
+    if use_minibatch:
+        kmeans = MiniBatchKMeans(
+            n_clusters=num_keyframes,
+            batch_size=batch_size,
+            random_state=random_state,
+            n_init='auto'
+        )
+    else:
+        kmeans = KMeans(n_clusters=num_keyframes, random_state=random_state, n_init='auto')
+
+    cluster_labels = kmeans.fit_predict(features)
+    return closest_to_centroids(kmeans.transform(features), cluster_labels)
+
+def select_by_temporal_segmentation(
+    embeddings_np: np.ndarray,
+    num_keyframes: int
+) -> List[int]:
+    """
+    Splits the (time-ordered) frames into `num_keyframes` contiguous segments at the largest changes between
+    consecutive embeddings, and picks the frame closest to each segment's mean. Runs in linear time.
+
+    Args:
+        embeddings_np (np.ndarray): (N, D) candidate frame embeddings, in timestamp order.
+        num_keyframes (int): Number of segments (K).
+
+    Returns:
+        List[int]: Sorted indices of the selected frames (one per segment).
+    """
+    num_frames = embeddings_np.shape[0]
+
+    # Change between consecutive frames; boundaries go after the K - 1 largest changes
+    consecutive_distances = np.linalg.norm(np.diff(embeddings_np, axis=0), axis=1)
+    num_boundaries = num_keyframes - 1
+    if num_boundaries > 0:
+        boundary_positions = np.argpartition(consecutive_distances, -num_boundaries)[-num_boundaries:]
+        segment_starts = np.concatenate(([0], np.sort(boundary_positions) + 1))
+    else:
+        segment_starts = np.array([0])
+
+    segment_lengths = np.diff(np.append(segment_starts, num_frames))
+    segment_means = np.add.reduceat(embeddings_np, segment_starts, axis=0) / segment_lengths[:, None]
+
+    # Distance of each frame to the mean of its own segment
+    distances_to_mean = np.linalg.norm(embeddings_np - np.repeat(segment_means, segment_lengths, axis=0), axis=1)
+
+    return [
+        int(start + np.argmin(distances_to_mean[start:start + length]))
+        for start, length in zip(segment_starts, segment_lengths)
+    ]
+
+def select_keyframe_indices_with_selector(
+    embeddings_np: np.ndarray,
+    num_keyframes: int,
+    selector: KeyframeSelector = DEFAULT_KEYFRAME_SELECTOR,
+    pca_components: Optional[int] = None,
+    random_state: int = 0
+) -> List[int]:
+    """
+    Selects `num_keyframes` representative frames from the candidate embeddings.
+
+    Args:
+        embeddings_np (np.ndarray): (N, D) candidate frame embeddings, in timestamp order.
+        num_keyframes (int): Number of keyframes to select (K <= N).
+        selector (KeyframeSelector):
+            - "kmeans": full KMeans, closest frame to each centroid.
+            - "minibatch_kmeans": MiniBatchKMeans, closest frame to each centroid.
+            - "temporal_segmentation": contiguous segments split at the largest visual changes (linear time).
+            - "auto": "kmeans" for short videos, PCA-reduced "minibatch_kmeans" from
+                `MINIBATCH_KMEANS_MIN_CANDIDATES` candidates.
+        pca_components (Optional[int]): If set, KMeans selectors cluster in a PCA-reduced space of this dimension.
+        random_state (int): Random seed for the KMeans selectors.
+
+    Returns:
+        List[int]: Sorted indices of the selected frames.
+    """
+    if selector == "auto":
+        if embeddings_np.shape[0] >= MINIBATCH_KMEANS_MIN_CANDIDATES:
+            selector = "minibatch_kmeans"
+            pca_components = pca_components or DEFAULT_PCA_COMPONENTS
+        else:
+            selector = "kmeans"
+
+    if selector == "kmeans":
+        return select_by_kmeans(embeddings_np, num_keyframes, pca_components=pca_components, random_state=random_state)
+    elif selector == "minibatch_kmeans":
+        return select_by_kmeans(
+            embeddings_np, num_keyframes, use_minibatch=True, pca_components=pca_components, random_state=random_state
+        )
+    elif selector == "temporal_segmentation":
+        return select_by_temporal_segmentation(embeddings_np, num_keyframes)
+    else:
+        raise ValueError(
+            f"Unsupported keyframe selector: {selector}. "
+            "Use 'auto', 'kmeans', 'minibatch_kmeans' or 'temporal_segmentation'."
+        )
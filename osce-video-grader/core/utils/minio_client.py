@@ -3,6 +3,7 @@ import io
 import uuid 
 import json 
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List, Tuple 
 from datetime import datetime, timedelta 
 from pathlib import Path 
@@ -14,9 +15,11 @@ import soundfile as sf
 from minio import Minio 
 from minio.error import S3Error 
 import urllib3 
+import certifi
 
 from core.config.config import settings 
 from core.utils.audio_processor import extract_audio
+from core.utils.audio_track import AudioByteRange, STREAMINFO_HEADER_SIZE, decode_flac_range
 from core.utils.helpers import sanitize_filename_for_minio, cleanup_local_file
 
 class MediaType(Enum):
@@ -33,7 +36,10 @@ class MinIOClient:
         endpoint: str = settings.minio.endpoint,
         access_key: str = settings.minio.access_key,
         secret_key: str = settings.minio.secret_key,
-        secure: bool = False 
+        secure: bool = False,
+        upload_max_workers: int = settings.minio.upload_max_workers,
+        http_pool_size: int = settings.minio.http_pool_size,
+        http_max_retries: int = settings.minio.http_max_retries
     ):
         """
         Initialize  MinIO client.
@@ -43,15 +49,36 @@ class MinIOClient:
             access_key (str): Access key for MinIO.
             secret_key (str): Secret key for MinIO.
             secure (bool): Whether to use HTTPS.
+            upload_max_workers (int): Number of threads used by the batch upload methods.
+            http_pool_size (int): Maximum number of pooled HTTP connections (should be >= `upload_max_workers`).
+            http_max_retries (int): Retries (with backoff) of failed connections and 5xx responses.
         """
         # Disable SSL warnings for local development 
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        # Mirrors the MinIO SDK's default pool manager, sized for concurrent uploads and with configurable retries
+        http_client = urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=10, read=300),
+            maxsize=max(http_pool_size, upload_max_workers),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=http_max_retries,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504]
+            )
+        )
         
         self.client = Minio(
             endpoint=endpoint,
             access_key=access_key,
             secret_key=secret_key,
-            secure=secure
+            secure=secure,
+            http_client=http_client
+        )
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=upload_max_workers,
+            thread_name_prefix="minio-upload"
         )
         
         # Bucket names for different media types
@@ -116,13 +143,9 @@ class MinIOClient:
             # original_filename = f"{uuid.uuid4()}.mp4" # Or try to infer extension
             return None
 
-        sanitized_object_name = sanitize_filename_for_minio(original_filename)
+        sanitized_object_name, content_type = self._get_original_video_object(original_filename)
 
         try:
-            # Infer content type from sanitized name's extension
-            _, extension = os.path.splitext(sanitized_object_name)
-            content_type = f"video/{extension.lstrip('.').lower()}" if extension else "application/octet-stream"
-
             self.client.put_object(
                 bucket_name=self.original_videos_bucket,
                 object_name=sanitized_object_name, # Use sanitized name
@@ -142,6 +165,57 @@ class MinIOClient:
             print(f"Unexpected error storing original video as {sanitized_object_name}: {e}")
         
         return None
+
+    def store_original_video_file(
+        self,
+        video_file_path: str,
+        original_filename: str,
+        part_size: int = settings.minio.multipart_part_size
+    ) -> Optional[str]:
+        """
+        Streams a video file from disk to MinIO as a multipart upload (the file is never loaded into memory).
+        The object is named like in `store_original_video`.
+
+        Args:
+            video_file_path: Path to the local video file.
+            original_filename: The original filename of the video.
+            part_size: Size of each uploaded part in bytes.
+        Returns:
+            MinIO object path (bucket/sanitized_object_name) or None on failure.
+        """
+        if not original_filename:
+            print("Error: Original filename is required to store the video.")
+            return None
+
+        sanitized_object_name, content_type = self._get_original_video_object(original_filename)
+
+        try:
+            self.client.fput_object(
+                bucket_name=self.original_videos_bucket,
+                object_name=sanitized_object_name,
+                file_path=video_file_path,
+                content_type=content_type,
+                part_size=part_size
+            )
+            minio_path = f"{self.original_videos_bucket}/{sanitized_object_name}"
+
+            print(f"Stored original video as: {minio_path}")
+            return minio_path
+
+        except S3Error as e:
+            print(f"MinIO S3Error storing original video as {sanitized_object_name}: {e}")
+
+        except Exception as e:
+            print(f"Unexpected error storing original video as {sanitized_object_name}: {e}")
+
+        return None
+
+    def _get_original_video_object(self, original_filename: str) -> Tuple[str, str]:
+        """Returns the object name and content type (inferred from the extension) of an original video."""
+        sanitized_object_name = sanitize_filename_for_minio(original_filename)
+        _, extension = os.path.splitext(sanitized_object_name)
+        content_type = f"video/{extension.lstrip('.').lower()}" if extension else "application/octet-stream"
+        return sanitized_object_name, content_type
     
     def store_extracted_audio(
         self,
@@ -154,13 +228,7 @@ class MinIOClient:
         """
         Stores the full extracted audio track from a video.
         """
-        if not original_video_filename:
-            base_name_for_audio = video_id # Fallback to video_id if no original name
-        else:
-            base_name_for_audio, _ = os.path.splitext(sanitize_filename_for_minio(original_video_filename))
-
-        object_name = f"{base_name_for_audio}.{audio_format.lower()}"
-        content_type = f"audio/{audio_format.lower()}"
+        object_name, content_type = self._get_extracted_audio_object(video_id, original_video_filename, audio_format)
 
         try:
             self.client.put_object(
@@ -182,6 +250,58 @@ class MinIOClient:
 
         return None
 
+    def store_extracted_audio_file(
+        self,
+        audio_file_path: str,
+        video_id: str,
+        original_video_filename: str,
+        audio_format: str = "wav",
+        part_size: int = settings.minio.multipart_part_size
+    ) -> Optional[str]:
+        """
+        Streams the full extracted audio track from disk to MinIO as a multipart upload.
+        The object is named like in `store_extracted_audio`.
+        """
+        object_name, content_type = self._get_extracted_audio_object(video_id, original_video_filename, audio_format)
+
+        try:
+            self.client.fput_object(
+                bucket_name=self.extracted_audios_bucket,
+                object_name=object_name,
+                file_path=audio_file_path,
+                content_type=content_type,
+                part_size=part_size
+            )
+            minio_path = f"{self.extracted_audios_bucket}/{object_name}"
+            print(f"Stored extracted full audio (from video_id: {video_id}): {minio_path}")
+            return minio_path
+
+        except S3Error as e:
+            print(f"MinIO S3Error storing extracted audio for video {video_id}: {e}")
+
+        except Exception as e:
+            print(f"Unexpected error storing extracted audio for video {video_id}: {e}")
+
+        return None
+
+    def _get_extracted_audio_object(
+        self,
+        video_id: str,
+        original_video_filename: str,
+        audio_format: str
+    ) -> Tuple[str, str]:
+        """
+        Returns the object name and content type of an extracted audio track.
+        Tracks are namespaced by video ID: audio segments are stored as byte ranges of their video's track, so a
+        video with the same filename must never overwrite it.
+        """
+        if not original_video_filename:
+            base_name_for_audio = video_id # Fallback to video_id if no original name
+        else:
+            base_name_for_audio, _ = os.path.splitext(sanitize_filename_for_minio(original_video_filename))
+
+        return f"{video_id}/{base_name_for_audio}.{audio_format.lower()}", f"audio/{audio_format.lower()}"
+
     def store_audio_segment(
         self, 
         audio_data: np.ndarray, 
@@ -284,6 +404,96 @@ class MinIOClient:
 
         return None
 
+    def upload_objects_batch(
+        self,
+        bucket_name: str,
+        items: List[Tuple[bytes, str]],
+        content_type: str = "application/octet-stream"
+    ) -> List[Optional[str]]:
+        """
+        Uploads many small objects concurrently on the client's bounded upload thread pool.
+
+        Args:
+            bucket_name (str): The bucket to upload to.
+            items (List[Tuple[bytes, str]]): (data, object name) pairs.
+            content_type (str): Content type of all the objects.
+
+        Returns:
+            List[Optional[str]]: The MinIO object paths (bucket/object_name), in the order of `items` 
+                (None for the objects that failed to upload).
+        """
+        def upload(item: Tuple[bytes, str]) -> Optional[str]:
+            data, object_name = item
+
+            try:
+                self.client.put_object(
+                    bucket_name=bucket_name,
+                    object_name=object_name,
+                    data=io.BytesIO(data),
+                    length=len(data),
+                    content_type=content_type
+                )
+                return f"{bucket_name}/{object_name}"
+
+            except S3Error as e:
+                print(f"MinIO S3Error uploading {bucket_name}/{object_name}: {e}")
+
+            except Exception as e:
+                print(f"Unexpected error uploading {bucket_name}/{object_name}: {e}")
+
+            return None
+
+        return list(self._upload_executor.map(upload, items))
+
+    def store_video_keyframes_batch(
+        self,
+        items: List[Tuple[bytes, str]],
+        image_format: str = "JPEG"
+    ) -> List[Optional[str]]:
+        """
+        Stores many video keyframes concurrently.
+
+        Args:
+            items (List[Tuple[bytes, str]]): (encoded image, keyframe ID) pairs.
+            image_format (str): Image format of all the keyframes (JPEG, PNG, etc.)
+
+        Returns:
+            List[Optional[str]]: MinIO object paths in the order of `items` (None for failed uploads).
+        """
+        extension = image_format.lower()
+        minio_paths = self.upload_objects_batch(
+            self.video_keyframes_bucket,
+            [(image_data, f"{keyframe_id}.{extension}") for image_data, keyframe_id in items],
+            content_type=f"image/{extension}"
+        )
+        print(f"Stored {sum(path is not None for path in minio_paths)}/{len(items)} video keyframes.")
+        return minio_paths
+
+    def store_audio_segments_batch(
+        self,
+        items: List[Tuple[np.ndarray, str]],
+        sample_rate: int
+    ) -> List[Optional[str]]:
+        """
+        Encodes many audio segments as WAV and stores them concurrently.
+
+        Args:
+            items (List[Tuple[np.ndarray, str]]): (audio data, segment ID) pairs.
+            sample_rate (int): Sample rate of all the segments.
+
+        Returns:
+            List[Optional[str]]: MinIO object paths in the order of `items` (None for failed uploads).
+        """
+        encoded_items = []
+        for audio_data, segment_id in items:
+            audio_buffer = io.BytesIO()
+            sf.write(audio_buffer, audio_data, sample_rate, format='WAV')
+            encoded_items.append((audio_buffer.getvalue(), f"{segment_id}.wav"))
+
+        minio_paths = self.upload_objects_batch(self.audio_segments_bucket, encoded_items, content_type="audio/wav")
+        print(f"Stored {sum(path is not None for path in minio_paths)}/{len(items)} audio segments.")
+        return minio_paths
+
     def _store_metadata(
             self,
             item_id: str,
@@ -329,7 +539,8 @@ class MinIOClient:
     def get_presigned_url(
             self,
             minio_path: str,
-            expires_in_hours: int = 5*24 # 5 days
+            expires_in_hours: int = 5*24, # 5 days
+            time_range: Optional[Tuple[float, float]] = None
         ) -> Optional[str]:
         """
         Generate a presigned URL for an object.
@@ -338,6 +549,8 @@ class MinIOClient:
             bucket_name (str): The name of the bucket.
             object_name (str): The name of the object.
             expires_in_hours (int): URL expiration time in hours.
+            time_range (Optional[Tuple[float, float]]): (start, end) in seconds, appended to the URL of an audio or
+                video object as a media fragment (`#t=start,end`) so that players only play that range.
 
         Returns:
             Presigned URL string or None if an error occurs.
@@ -357,6 +570,10 @@ class MinIOClient:
                 object_name=object_name,
                 expires=timedelta(hours=expires_in_hours)
             )
+
+            if time_range is not None:
+                url = f"{url}#t={time_range[0]:.3f},{time_range[1]:.3f}"
+
             return url
         
         except S3Error as e:
@@ -392,11 +609,58 @@ class MinIOClient:
                 response.release_conn()
 
         return None
+
+    def retrieve_object_range(
+            self,
+            bucket_name: str,
+            object_name: str,
+            offset: int,
+            length: int
+        ) -> Optional[bytes]:
+        """Retrieves `length` bytes of an object starting at `offset` (an HTTP range read)."""
+        response = None
+
+        try:
+            response = self.client.get_object(bucket_name, object_name, offset=offset, length=length)
+            return response.read()
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                print(f"S3Error retrieving bytes {offset}-{offset + length - 1} of {bucket_name}/{object_name}: {e}")
+        finally:
+            if response:
+                response.close()
+                response.release_conn()
+
+        return None
     
-    def retrieve_audio_segment(self, minio_path: str) -> Optional[Tuple[np.ndarray, int]]:
-        """Retrieves audio segment from MinIO given a full path."""
+    def retrieve_audio_segment(
+            self,
+            minio_path: str,
+            byte_range: Optional[AudioByteRange] = None
+        ) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Retrieves audio segment from MinIO given a full path.
+
+        With a `byte_range`, `minio_path` is the video's FLAC audio track and only the STREAMINFO header and
+        the frames covering the segment are read (two range reads); otherwise it is a stand-alone segment object.
+        """
         try:
             bucket_name, object_name = minio_path.split('/', 1)
+
+            if byte_range is not None:
+                streaminfo_header = self.retrieve_object_range(bucket_name, object_name, 0, STREAMINFO_HEADER_SIZE)
+                frames = self.retrieve_object_range(
+                    bucket_name,
+                    object_name,
+                    byte_range.byte_start,
+                    byte_range.byte_end - byte_range.byte_start
+                )
+
+                if streaminfo_header and frames:
+                    return decode_flac_range(streaminfo_header, frames, byte_range)
+
+                return None
+
             audio_bytes = self.retrieve_object_data(bucket_name, object_name)
 
             if audio_bytes:
@@ -1,26 +1,61 @@
 import os
 import time  
-from typing import List, Tuple, Optional, TypedDict 
+import queue
+import threading
+import subprocess 
+from typing import List, Tuple, Optional, TypedDict, Iterator, Literal, Sequence, Union, Dict 
 
 import cv2
 import torch
 from PIL import Image
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import euclidean_distances # To find closest point to centroid
 import matplotlib.pyplot as plt
 from transformers import CLIPModel, CLIPProcessor
 import torch.nn as nn
+import torch.nn.functional as F
 import torchvision.models as models
 import torchvision.transforms as transforms
 
-from core.utils.helpers import get_device 
+from core.utils.helpers import get_device, compute_file_sha256
+from core.utils.cache_manager import FrameEmbeddingCache
+from core.utils.inference_backends import (
+    wrap_image_encoder, 
+    get_inference_backend_precision, 
+    InferenceBackend, 
+    DEFAULT_INFERENCE_BACKEND
+)
+from core.utils.keyframe_selection import (
+    select_keyframe_indices_with_selector,
+    KeyframeSelector,
+    DEFAULT_KEYFRAME_SELECTOR
+)
 
 # constants 
 DEFAULT_FRAME_SAMPLE_RATE = 1 
 DEFAULT_FPS = 30.0
 DEFAULT_CLIP_MODEL_NAME = "openai/clip-vit-base-patch16" # Default CLIP model from Hugging Face
 DEFAULT_RESNET_MODEL_NAME = 'resnet34' # Default ResNet model for feature extraction
+DEFAULT_FRAME_DECODER = "opencv"
+DEFAULT_THUMBNAIL_SHORT_SIDE = 224 # Input size of the CLIP and ResNet models, when it cannot be read from their preprocessing
+SEEK_INSTEAD_OF_GRAB_THRESHOLD_SECONDS = 5.0 # Seek when the next frame to re-decode is further away than this
+SEEK_PREROLL_SECONDS = 1.0 # Seek this far before the target, then grab forward (doubled if the seek overshoots)
+DEFAULT_PIPELINE_QUEUE_SIZE = 4 # Max. batches buffered between pipeline stages (bounds peak memory)
+DEFAULT_NUM_PREPROCESS_WORKERS = 2
+DEFAULT_PREFILTER_DUPLICATE_THRESHOLD = 0.02 # Mean abs. grayscale difference (0-1) below which a frame is a near-duplicate
+DEFAULT_PREFILTER_SHOT_THRESHOLD = 0.3 # Bhattacharyya histogram distance (0-1) above which a shot boundary is detected
+DEFAULT_PREFILTER_MAX_GAP_SECONDS = 30.0 # Keep at least one frame this often, even in a static shot
+PREFILTER_SIGNATURE_SIZE = 32
+
+FrameDecoder = Literal["opencv", "ffmpeg"]
+
+class FramePreprocessConfig(TypedDict):
+    """Resize / center-crop / normalize parameters of a model's image preprocessing."""
+    resize_short_side: int
+    crop_height: int
+    crop_width: int
+    interpolation: str # 'bilinear' or 'bicubic'
+    mean: List[float]
+    std: List[float]
 
 class VideoMetadata(TypedDict):
     duration_seconds: float 
@@ -92,15 +127,272 @@ def get_video_metadata(video_file_path: str) -> Optional[VideoMetadata]:
         if cap is not None and cap.isOpened():
             cap.release()
 
+def get_thumbnail_size(
+    width: int,
+    height: int,
+    short_side: int = DEFAULT_THUMBNAIL_SHORT_SIDE
+) -> Tuple[int, int]:
+    """Returns the (width, height) of a frame downscaled so its short side is `short_side` (never upscales)."""
+    if min(width, height) <= short_side:
+        return width, height
+    
+    if width <= height:
+        return short_side, int(round(height * short_side / width))
+    
+    return int(round(width * short_side / height)), short_side
+
+def _should_sample_frame(
+    current_time_sec: float,
+    last_sampled_time: float,
+    frame_sample_rate: float
+) -> bool:
+    """Returns True if the frame at `current_time_sec` is due to be sampled."""
+    return current_time_sec >= last_sampled_time + (1.0 / frame_sample_rate)
+
+def _iter_sampled_frames_opencv(
+    video_path: str,
+    frame_sample_rate: float,
+    resize_short_side: Optional[int] = None
+) -> Iterator[Tuple[np.ndarray, float]]:
+    """
+    Samples frames with OpenCV, only colour-converting the frames that are kept.
+    Every frame is `grab()`-ed (demux + decode, no colour conversion) but only the sampled 
+    frames are `retrieve()`-d and converted to RGB.
+    """
+    cap = cv2.VideoCapture(video_path)
+
+    try:
+        if not cap.isOpened():
+            print(f"Error: Could not open video file {video_path}")
+            return
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps == 0:
+            print(f"Warning: FPS is 0 for video {video_path}. Defaulting to {DEFAULT_FPS} FPS.")
+            fps = DEFAULT_FPS
+
+        frame_count = 0
+        last_sampled_time = -1.0 # Ensure the first frame (or near it) is sampled
+        thumbnail_size = None
+
+        while True:
+            if not cap.grab():
+                break
+
+            current_time_sec = frame_count / fps
+            if _should_sample_frame(current_time_sec, last_sampled_time, frame_sample_rate):
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+
+                if resize_short_side:
+                    if thumbnail_size is None:
+                        thumbnail_size = get_thumbnail_size(frame.shape[1], frame.shape[0], resize_short_side)
+                    if thumbnail_size != (frame.shape[1], frame.shape[0]):
+                        frame = cv2.resize(frame, thumbnail_size, interpolation=cv2.INTER_AREA)
+
+                yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), current_time_sec
+                last_sampled_time = current_time_sec
+
+            frame_count += 1
+
+    finally:
+        cap.release()
+
+def _iter_sampled_frames_ffmpeg(
+    video_path: str,
+    frame_sample_rate: float,
+    resize_short_side: Optional[int] = None
+) -> Iterator[Tuple[np.ndarray, float]]:
+    """
+    Samples frames by piping raw RGB frames out of an ffmpeg `fps=` filter.
+    Only the frames kept by the filter are colour-converted and copied into Python.
+    """
+    metadata = get_video_metadata(video_path)
+    if not metadata or metadata["resolution_width"] <= 0 or metadata["resolution_height"] <= 0:
+        print(f"Error: Could not determine the resolution of {video_path} for ffmpeg frame sampling.")
+        return
+
+    width, height = metadata["resolution_width"], metadata["resolution_height"]
+    video_filter = f"fps={frame_sample_rate}"
+
+    if resize_short_side:
+        width, height = get_thumbnail_size(width, height, resize_short_side)
+        video_filter += f",scale={width}:{height}:flags=area"
+
+    frame_num_bytes = width * height * 3
+
+    command = [
+        "ffmpeg",
+        "-noautorotate", # Keep the frame size consistent with the stream resolution reported by OpenCV
+        "-i", video_path,
+        "-an",
+        "-vf", video_filter,
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-loglevel", "error",
+        "-"
+    ]
+
+    process = subprocess.Popen(
+        command, 
+        stdout=subprocess.PIPE, 
+        stderr=subprocess.DEVNULL, 
+        bufsize=frame_num_bytes
+    )
+
+    try:
+        frame_index = 0
+        while True:
+            raw_frame = process.stdout.read(frame_num_bytes)
+            if len(raw_frame) < frame_num_bytes:
+                break
+
+            frame = np.frombuffer(raw_frame, dtype=np.uint8).reshape(height, width, 3)
+            yield frame, frame_index / frame_sample_rate
+            frame_index += 1
+
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+def iter_sampled_frames(
+    video_path: str,
+    frame_sample_rate: float = DEFAULT_FRAME_SAMPLE_RATE,
+    decoder: FrameDecoder = DEFAULT_FRAME_DECODER,
+    resize_short_side: Optional[int] = None
+) -> Iterator[Tuple[np.ndarray, float]]:
+    """Lazily samples frames from a video at a specified rate.
+
+    Args:
+        video_path (str): Path to the input video file.
+        frame_sample_rate (float): Rate at which frames are sampled from the video (frames per second).
+        decoder (FrameDecoder): "opencv" (grab/retrieve, only sampled frames are converted) or 
+            "ffmpeg" (ffmpeg `fps=` filter piped as raw RGB).
+        resize_short_side (Optional[int]): If set, frames are downscaled (aspect preserved) so their 
+            short side matches this size before being returned.
+
+    Yields:
+        Tuple[np.ndarray, float]: (RGB uint8 frame of shape (H, W, 3), timestamp in seconds).
+    """
+    if decoder == "opencv":
+        return _iter_sampled_frames_opencv(video_path, frame_sample_rate, resize_short_side)
+    elif decoder == "ffmpeg":
+        return _iter_sampled_frames_ffmpeg(video_path, frame_sample_rate, resize_short_side)
+    else:
+        raise ValueError(f"Unsupported frame decoder: {decoder}. Use 'opencv' or 'ffmpeg'.")
+
+class FramePrefilter:
+    """
+    Cheap pre-filter that drops visually redundant sampled frames before they are embedded.
+    Each frame is compared to the last kept frame using a 32x32 grayscale thumbnail (near-duplicate suppression)
+    and an HSV colour histogram (shot boundary detection), so embedding and clustering cost scale with visual 
+    change rather than with the video duration. 
+
+    A filter is stateful: use one instance per video.
+    """
+    def __init__(
+        self,
+        duplicate_threshold: float = DEFAULT_PREFILTER_DUPLICATE_THRESHOLD,
+        shot_threshold: float = DEFAULT_PREFILTER_SHOT_THRESHOLD,
+        max_gap_seconds: Optional[float] = DEFAULT_PREFILTER_MAX_GAP_SECONDS
+    ):
+        """
+        Args:
+            duplicate_threshold (float): Frames whose mean absolute grayscale difference (0-1) to the last kept 
+                frame is below this are dropped as near-duplicates.
+            shot_threshold (float): Frames whose colour histogram distance (0-1) to the last kept frame is above 
+                this are kept as shot boundaries, even if their grayscale difference is small.
+            max_gap_seconds (Optional[float]): A frame is always kept if the last kept frame is at least this old 
+                (None to disable).
+        """
+        self.duplicate_threshold = duplicate_threshold
+        self.shot_threshold = shot_threshold
+        self.max_gap_seconds = max_gap_seconds
+
+        self.num_seen = 0
+        self.num_kept = 0
+        self.num_shot_boundaries = 0
+
+        self._last_kept_signature: Optional[np.ndarray] = None
+        self._last_kept_histogram: Optional[np.ndarray] = None
+        self._last_kept_timestamp: Optional[float] = None
+
+    @staticmethod
+    def _compute_signature(frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the downscaled grayscale signature and the normalized HSV histogram of an RGB frame."""
+        small_frame = cv2.resize(frame, (PREFILTER_SIGNATURE_SIZE, PREFILTER_SIGNATURE_SIZE), interpolation=cv2.INTER_AREA)
+        signature = cv2.cvtColor(small_frame, cv2.COLOR_RGB2GRAY).astype(np.float32) / 255.0
+
+        hsv_frame = cv2.cvtColor(small_frame, cv2.COLOR_RGB2HSV)
+        histogram = cv2.calcHist([hsv_frame], [0, 1], None, [16, 4], [0, 180, 0, 256])
+        cv2.normalize(histogram, histogram)
+
+        return signature, histogram
+
+    def should_keep(self, frame: np.ndarray, timestamp: float) -> bool:
+        """Decides whether a sampled RGB frame carries new visual content (and updates the filter state)."""
+        self.num_seen += 1
+        signature, histogram = self._compute_signature(frame)
+
+        if self._last_kept_signature is None:
+            keep = True
+        else:
+            histogram_distance = cv2.compareHist(self._last_kept_histogram, histogram, cv2.HISTCMP_BHATTACHARYYA)
+            is_shot_boundary = histogram_distance >= self.shot_threshold
+            if is_shot_boundary:
+                self.num_shot_boundaries += 1
+
+            is_near_duplicate = float(np.mean(np.abs(signature - self._last_kept_signature))) < self.duplicate_threshold
+            is_gap_too_long = (
+                self.max_gap_seconds is not None 
+                and timestamp - self._last_kept_timestamp >= self.max_gap_seconds
+            )
+            keep = is_shot_boundary or not is_near_duplicate or is_gap_too_long
+
+        if keep:
+            self.num_kept += 1
+            self._last_kept_signature = signature
+            self._last_kept_histogram = histogram
+            self._last_kept_timestamp = timestamp
+
+        return keep
+
+    def filter(self, frames: Iterator[Tuple[np.ndarray, float]]) -> Iterator[Tuple[np.ndarray, float]]:
+        """Wraps a (frame, timestamp) iterator, yielding only the frames that are kept."""
+        for frame, timestamp in frames:
+            if self.should_keep(frame, timestamp):
+                yield frame, timestamp
+
+    @property
+    def config_key(self) -> str:
+        """Identifies the filter's thresholds (used in cache keys, since they decide which frames are kept)."""
+        return f"{self.duplicate_threshold:g}-{self.shot_threshold:g}-{self.max_gap_seconds}"
+
+    @property
+    def num_pruned(self) -> int:
+        return self.num_seen - self.num_kept
+
+    def report(self):
+        pruned_percentage = 100.0 * self.num_pruned / self.num_seen if self.num_seen else 0.0
+        print(
+            f"Frame pre-filter: kept {self.num_kept}/{self.num_seen} sampled frames, pruned {self.num_pruned} "
+            f"({pruned_percentage:.1f}%) near-duplicates, detected {self.num_shot_boundaries} shot boundaries."
+        )
+
 def sample_frames_from_video(       
     video_path: str, 
     frame_sample_rate: int = DEFAULT_FRAME_SAMPLE_RATE, # Sample 1 frame per second initially
+    decoder: FrameDecoder = DEFAULT_FRAME_DECODER
 ) -> Tuple[List[Image.Image], List[float], float]:
     """Samples frames from a video at a specified rate.
     
     Args:
         video_path (str): Path to the input video file.
         frame_sample_rate (int): Rate at which frames are sampled from the video (frames per second).
+        decoder (FrameDecoder): Frame sampling engine, see `iter_sampled_frames`.
 
     Returns:
         Tuple[List[Image.Image], List[float], float]: 
@@ -120,39 +412,374 @@ def sample_frames_from_video(
             return [], [], fps
 
         fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+
         if fps == 0:
-            print(f"Warning: FPS is 0 for video {video_path}. Defaulting to 25 FPS.")
+            print(f"Warning: FPS is 0 for video {video_path}. Defaulting to {DEFAULT_FPS} FPS.")
             fps = DEFAULT_FPS # Default FPS if not available or 0
 
-        print(f"Video Info: FPS: {fps:.2f}. Sampling frames at ~{frame_sample_rate} FPS...")
-        frame_count = 0
-        last_sampled_time = -1.0 # Ensure the first frame (or near it) is sampled
-
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            current_time_sec = frame_count / fps
-            if current_time_sec >= last_sampled_time + (1.0 / frame_sample_rate):
-                pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-                candidate_pil_images.append(pil_image)
-                candidate_timestamps.append(current_time_sec)
-                last_sampled_time = current_time_sec
-            frame_count += 1
+        print(f"Video Info: FPS: {fps:.2f}. Sampling frames at ~{frame_sample_rate} FPS (decoder: {decoder})...")
 
-        cap.release()
+        for frame, timestamp in iter_sampled_frames(video_path, frame_sample_rate, decoder):
+            candidate_pil_images.append(Image.fromarray(frame))
+            candidate_timestamps.append(timestamp)
 
         print(f"Initially sampled {len(candidate_pil_images)} candidate frames.")
         return candidate_pil_images, candidate_timestamps, fps
     
     except Exception as e:
         print(f"Error during frame sampling: {e}")
-        if 'cap' in locals() and cap.isOpened():
-            cap.release()
         return [], [], fps
 
+class ThumbnailFrameStore:
+    """
+    Contiguous uint8 store of downscaled sampled frames with shape (N, H, W, 3).
+    Used instead of a list of full-resolution PIL images so that memory stays bounded for long videos.
+    The buffer can optionally be backed by a (raw, headerless) memory-mapped file, which grows in place.
+    """
+    def __init__(
+        self,
+        frame_height: int,
+        frame_width: int,
+        capacity: int,
+        memmap_path: Optional[str] = None
+    ):
+        """
+        Args:
+            frame_height (int): Height of the stored thumbnails.
+            frame_width (int): Width of the stored thumbnails.
+            capacity (int): Initial number of frames to allocate (the store grows if exceeded).
+            memmap_path (Optional[str]): If set, frames are stored in a memory-mapped file at this path.
+        """
+        self.frame_shape = (frame_height, frame_width, 3)
+        self.memmap_path = memmap_path
+        self._num_frames = 0
+        self._buffer = self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.memmap_path:
+            return np.memmap(self.memmap_path, dtype=np.uint8, mode="w+", shape=(capacity, *self.frame_shape))
+        
+        return np.empty((capacity, *self.frame_shape), dtype=np.uint8)
+
+    def _grow(self, capacity: int):
+        if not self.memmap_path:
+            grown_buffer = np.empty((capacity, *self.frame_shape), dtype=np.uint8)
+            grown_buffer[:self._num_frames] = self._buffer[:self._num_frames]
+            self._buffer = grown_buffer
+            return
+
+        # Extend the file and map it again: the stored frames stay on disk and are never copied into RAM
+        self._buffer.flush()
+        self._buffer = None
+        with open(self.memmap_path, "r+b") as f:
+            f.truncate(capacity * int(np.prod(self.frame_shape)))
+        self._buffer = np.memmap(self.memmap_path, dtype=np.uint8, mode="r+", shape=(capacity, *self.frame_shape))
+
+    def append(self, frame: np.ndarray):
+        if frame.shape != self.frame_shape:
+            frame = cv2.resize(frame, (self.frame_shape[1], self.frame_shape[0]), interpolation=cv2.INTER_AREA)
+
+        if self._num_frames == len(self._buffer):
+            # Grow by 50% (rare: the initial capacity is estimated from the frame count and FPS)
+            self._grow(int(self._num_frames * 1.5) + 1)
+
+        self._buffer[self._num_frames] = frame
+        self._num_frames += 1
+
+    @property
+    def frames(self) -> np.ndarray:
+        """View of the stored frames, shape (N, H, W, 3)."""
+        return self._buffer[:self._num_frames]
+
+    @property
+    def nbytes(self) -> int:
+        return self._num_frames * int(np.prod(self.frame_shape))
+
+    def __len__(self) -> int:
+        return self._num_frames
+
+    def close(self):
+        """Releases the buffer and removes the memory-mapped file, if any."""
+        self._buffer = None
+        self._num_frames = 0
+
+        if self.memmap_path and os.path.exists(self.memmap_path):
+            os.unlink(self.memmap_path)
+
+def sample_frames_to_thumbnail_store(
+    video_path: str,
+    frame_sample_rate: float = DEFAULT_FRAME_SAMPLE_RATE,
+    decoder: FrameDecoder = DEFAULT_FRAME_DECODER,
+    thumbnail_short_side: int = DEFAULT_THUMBNAIL_SHORT_SIDE,
+    memmap_path: Optional[str] = None,
+    frame_prefilter: Optional[FramePrefilter] = None
+) -> Tuple[Optional[ThumbnailFrameStore], List[float]]:
+    """Samples frames from a video into a compact thumbnail store.
+
+    Args:
+        video_path (str): Path to the input video file.
+        frame_sample_rate (float): Rate at which frames are sampled from the video (frames per second).
+        decoder (FrameDecoder): Frame sampling engine, see `iter_sampled_frames`.
+        thumbnail_short_side (int): Short side of the stored thumbnails (should match the embedding model's input).
+        memmap_path (Optional[str]): Optional path of a file to memory-map the thumbnails into.
+        frame_prefilter (Optional[FramePrefilter]): If set, visually redundant frames are dropped before being stored.
+
+    Returns:
+        Tuple[Optional[ThumbnailFrameStore], List[float]]: The thumbnail store and the timestamps (in seconds) 
+        of the sampled frames. Returns (None, []) if no frames could be sampled.
+    """
+    metadata = get_video_metadata(video_path)
+    estimated_num_frames = 1
+    if metadata and metadata["frame_count"] > 0 and metadata["fps"] > 0:
+        estimated_num_frames = int(metadata["frame_count"] / metadata["fps"] * frame_sample_rate) + 2
+
+    frame_store: Optional[ThumbnailFrameStore] = None
+    timestamps: List[float] = []
+
+    try:
+        print(f"Sampling frames at ~{frame_sample_rate} FPS into a thumbnail store (short side: {thumbnail_short_side}px, decoder: {decoder})...")
+        sampled_frames = iter_sampled_frames(video_path, frame_sample_rate, decoder, thumbnail_short_side)
+        if frame_prefilter is not None:
+            sampled_frames = frame_prefilter.filter(sampled_frames)
+
+        for frame, timestamp in sampled_frames:
+            if frame_store is None:
+                frame_store = ThumbnailFrameStore(
+                    frame_height=frame.shape[0], 
+                    frame_width=frame.shape[1], 
+                    capacity=estimated_num_frames, 
+                    memmap_path=memmap_path
+                )
+
+            frame_store.append(frame)
+            timestamps.append(timestamp)
+
+    except Exception as e:
+        print(f"Error during frame sampling: {e}")
+        if frame_store is not None:
+            frame_store.close()
+        return None, []
+
+    if frame_store is None:
+        return None, []
+
+    if frame_prefilter is not None:
+        frame_prefilter.report()
+
+    print(f"Initially sampled {len(frame_store)} candidate frames ({frame_store.nbytes / 1e6:.1f} MB of thumbnails).")
+    return frame_store, timestamps
+
+def _grab_at_or_after(cap: cv2.VideoCapture, seek_time: float) -> Optional[float]:
+    """Seeks to `seek_time` (in seconds) and grabs one frame. Returns its actual timestamp, or None at the end of the stream."""
+    cap.set(cv2.CAP_PROP_POS_MSEC, seek_time * 1000.0)
+    if not cap.grab():
+        return None
+
+    return cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+def decode_frames_at_timestamps(
+    video_path: str,
+    timestamps: List[float]
+) -> List[Optional[Image.Image]]:
+    """
+    Decodes full-resolution frames at the given timestamps (as produced by `iter_sampled_frames`).
+    Nearby frames are reached by grabbing forward from the current position. For distant ones, the decoder seeks
+    by time to before the target (seeks land on a preceding keyframe and may be inexact), then grabs forward until
+    the decoded frame's own timestamp (`CAP_PROP_POS_MSEC`) reaches the target: the frame position is verified,
+    never assumed from the seek.
+
+    Returns:
+        List[Optional[Image.Image]]: RGB PIL images in the same order as `timestamps` (None if a frame could not be decoded).
+    """
+    decoded_frames: List[Optional[Image.Image]] = [None] * len(timestamps)
+    if not timestamps:
+        return decoded_frames
+
+    cap = cv2.VideoCapture(video_path)
+
+    try:
+        if not cap.isOpened():
+            print(f"Error: Could not open video file {video_path}")
+            return decoded_frames
+        
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps == 0:
+            fps = DEFAULT_FPS
+
+        half_frame_seconds = 0.5 / fps
+        position = None # Timestamp of the last grabbed frame, None before the first grab or after the end of the stream
+
+        for original_index in sorted(range(len(timestamps)), key=lambda i: timestamps[i]):
+            target_time = timestamps[original_index]
+            current_time = position if position is not None else 0.0
+
+            if target_time - current_time > SEEK_INSTEAD_OF_GRAB_THRESHOLD_SECONDS:
+                # Seek further back until the seek lands at or before the target
+                seek_preroll = SEEK_PREROLL_SECONDS
+                while True:
+                    seek_time = max(target_time - seek_preroll, 0.0)
+                    position = _grab_at_or_after(cap, seek_time)
+                    if position is None or position <= target_time + half_frame_seconds or seek_time == 0.0:
+                        break
+                    seek_preroll *= 2
+
+            while position is None or position < target_time - half_frame_seconds:
+                if not cap.grab():
+                    position = None
+                    break
+                position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+            ret, frame = cap.retrieve() if position is not None else (False, None)
+            if not ret:
+                print(f"Warning: Could not decode frame at {target_time:.2f}s.")
+                continue
+
+            decoded_frames[original_index] = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        return decoded_frames
+    
+    finally:
+        cap.release()
+
+def _as_pil_image(frame: Union[Image.Image, np.ndarray]) -> Image.Image:
+    """Returns an RGB PIL image for a PIL image or an RGB uint8 array."""
+    if isinstance(frame, np.ndarray):
+        return Image.fromarray(frame)
+    
+    return frame.convert("RGB")
+
+_SUPPORTED_INTERPOLATIONS = {2: "bilinear", 3: "bicubic", "bilinear": "bilinear", "bicubic": "bicubic"}
+
+def get_resnet_preprocess_config(resnet_transform: transforms.Compose) -> Optional[FramePreprocessConfig]:
+    """
+    Reads the preprocessing parameters of torchvision's `weights.transforms()` (ImageClassification).
+    Returns None if the transform is not of that form (callers then fall back to the per-image PIL path).
+    """
+    try:
+        interpolation = _SUPPORTED_INTERPOLATIONS.get(resnet_transform.interpolation.value)
+        if interpolation is None:
+            return None
+
+        return FramePreprocessConfig(
+            resize_short_side=int(resnet_transform.resize_size[0]),
+            crop_height=int(resnet_transform.crop_size[0]),
+            crop_width=int(resnet_transform.crop_size[-1]),
+            interpolation=interpolation,
+            mean=list(resnet_transform.mean),
+            std=list(resnet_transform.std)
+        )
+    
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+def get_clip_preprocess_config(clip_processor: CLIPProcessor) -> Optional[FramePreprocessConfig]:
+    """
+    Reads the preprocessing parameters of a Hugging Face CLIP image processor.
+    Returns None if they cannot be expressed as resize + center crop + normalize.
+    """
+    try:
+        image_processor = clip_processor.image_processor
+        interpolation = _SUPPORTED_INTERPOLATIONS.get(int(image_processor.resample))
+        if (
+            interpolation is None 
+            or not image_processor.do_resize 
+            or not image_processor.do_center_crop 
+            or "shortest_edge" not in image_processor.size
+        ):
+            return None
+
+        return FramePreprocessConfig(
+            resize_short_side=int(image_processor.size["shortest_edge"]),
+            crop_height=int(image_processor.crop_size["height"]),
+            crop_width=int(image_processor.crop_size["width"]),
+            interpolation=interpolation,
+            mean=list(image_processor.image_mean),
+            std=list(image_processor.image_std)
+        )
+    
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+def get_thumbnail_short_side(
+    embedding_method: str,
+    resnet_transform: Optional[transforms.Compose] = None,
+    clip_processor: Optional[CLIPProcessor] = None
+) -> int:
+    """
+    Returns the short side the embedding model's preprocessing resizes frames to (224 for CLIP; 256 for the ResNet
+    transforms, before their 224 center crop), so candidate thumbnails are never upscaled before being embedded.
+    Falls back to `DEFAULT_THUMBNAIL_SHORT_SIDE` if it cannot be read from the preprocessing.
+    """
+    preprocess_config = None
+    if embedding_method == "resnet" and resnet_transform is not None:
+        preprocess_config = get_resnet_preprocess_config(resnet_transform)
+    elif embedding_method == "clip" and clip_processor is not None:
+        preprocess_config = get_clip_preprocess_config(clip_processor)
+
+    return preprocess_config["resize_short_side"] if preprocess_config else DEFAULT_THUMBNAIL_SHORT_SIDE
+
+def preprocess_frames_batch(
+    frames: np.ndarray,
+    preprocess_config: FramePreprocessConfig
+) -> torch.Tensor:
+    """
+    Resizes (short side), center-crops and normalizes a batch of RGB uint8 frames as batched tensor ops,
+    without converting each frame to a PIL image.
+
+    Args:
+        frames (np.ndarray): RGB uint8 frames of shape (N, H, W, 3), all of the same size.
+        preprocess_config (FramePreprocessConfig): See `get_resnet_preprocess_config` / `get_clip_preprocess_config`.
+
+    Returns:
+        torch.Tensor: Float tensor of shape (N, 3, crop_height, crop_width) on CPU.
+    """
+    if not frames.flags.writeable:
+        frames = frames.copy() # torch.from_numpy does not support read-only arrays
+    
+    batch = torch.from_numpy(np.ascontiguousarray(frames)).permute(0, 3, 1, 2).float()
+    height, width = batch.shape[-2:]
+
+    short_side = preprocess_config["resize_short_side"]
+    if width <= height:
+        resized_width, resized_height = short_side, int(short_side * height / width)
+    else:
+        resized_width, resized_height = int(short_side * width / height), short_side
+
+    if (resized_height, resized_width) != (height, width):
+        batch = F.interpolate(
+            batch, 
+            size=(resized_height, resized_width), 
+            mode=preprocess_config["interpolation"], 
+            align_corners=False, 
+            antialias=True
+        ).clamp_(0.0, 255.0)
+
+    crop_height, crop_width = preprocess_config["crop_height"], preprocess_config["crop_width"]
+    top = max(int(round((resized_height - crop_height) / 2.0)), 0)
+    left = max(int(round((resized_width - crop_width) / 2.0)), 0)
+    batch = batch[:, :, top:top + crop_height, left:left + crop_width]
+
+    mean = torch.tensor(preprocess_config["mean"], dtype=batch.dtype).view(1, 3, 1, 1)
+    std = torch.tensor(preprocess_config["std"], dtype=batch.dtype).view(1, 3, 1, 1)
+
+    return ((batch / 255.0 - mean) / std).contiguous()
+
+def _as_uint8_frame_batch(frames: Sequence[Union[Image.Image, np.ndarray]]) -> Optional[np.ndarray]:
+    """Returns the frames as one (N, H, W, 3) uint8 array if they are same-sized RGB uint8 arrays, else None."""
+    if isinstance(frames, np.ndarray):
+        return frames if frames.ndim == 4 and frames.dtype == np.uint8 else None
+
+    if not frames or not all(isinstance(frame, np.ndarray) and frame.dtype == np.uint8 for frame in frames):
+        return None
+
+    if any(frame.shape != frames[0].shape for frame in frames):
+        return None
+    
+    return np.stack(frames)
+
 def generate_clip_embeddings(
-    pil_images: List[Image.Image],
+    pil_images: Sequence[Union[Image.Image, np.ndarray]],
     clip_model: CLIPModel,
     clip_processor: CLIPProcessor,
     device: str = get_device(),
@@ -162,7 +789,7 @@ def generate_clip_embeddings(
     Generates CLIP embeddings for a list of PIL Images using Hugging Face model.
 
     Args:
-        pil_images (List[Image.Image]): List of PIL Image objects.
+        pil_images (Sequence[Union[Image.Image, np.ndarray]]): PIL images or RGB uint8 frames (e.g. `ThumbnailFrameStore.frames`).
         clip_model (CLIPModel): The loaded Hugging Face CLIP model.
         clip_processor (CLIPProcessor): The Hugging Face CLIP processor.
         device (str): Device to run CLIP on ('cuda', 'mps', or 'cpu').
@@ -171,24 +798,30 @@ def generate_clip_embeddings(
     Returns:
         Optional[np.ndarray]: A NumPy array of normalized embeddings, or None if error.
     """
-    if not pil_images:
+    if len(pil_images) == 0:
         return None
         
     print(f"Generating CLIP embeddings for {len(pil_images)} frames...")
     all_embeddings_list = []
     clip_model.eval() # Ensure model is in evaluation mode
+    preprocess_config = get_clip_preprocess_config(clip_processor)
 
     try:
         # Generate CLIP embeddings for sampled frames in batches.
         for i in range(0, len(pil_images), batch_size):
-            batch_pil_images = pil_images[i:i+batch_size]
-            inputs = clip_processor(
-                images=batch_pil_images,
-                return_tensors="pt"
-            ).to(device)
+            frame_batch = _as_uint8_frame_batch(pil_images[i:i+batch_size]) if preprocess_config else None
+            if frame_batch is not None:
+                # uint8 frames are preprocessed as one tensor op, without a round-trip through PIL
+                pixel_values = preprocess_frames_batch(frame_batch, preprocess_config).to(device)
+            else:
+                batch_pil_images = [_as_pil_image(frame) for frame in pil_images[i:i+batch_size]]
+                pixel_values = clip_processor(
+                    images=batch_pil_images,
+                    return_tensors="pt"
+                )['pixel_values'].to(device)
             
             with torch.no_grad():
-                image_features = clip_model.get_image_features(pixel_values=inputs['pixel_values'])
+                image_features = clip_model.get_image_features(pixel_values=pixel_values)
                 all_embeddings_list.append(image_features.cpu().numpy())
         
         if not all_embeddings_list:
@@ -209,7 +842,8 @@ def generate_clip_embeddings(
     
 def get_resnet_feature_extractor(
     model_name: str = DEFAULT_RESNET_MODEL_NAME,
-    device: str = get_device()
+    device: str = get_device(),
+    backend: InferenceBackend = DEFAULT_INFERENCE_BACKEND
 ) -> Optional[Tuple[nn.Module, transforms.Compose]]:
     """
     Loads a pre-trained ResNet model and modifies it to be a feature extractor.
@@ -218,6 +852,7 @@ def get_resnet_feature_extractor(
     Args:
         model_name (str): Name of the ResNet model (e.g., 'resnet18', 'resnet50', 'resnet101').
         device (str): Device to load the model onto ('cuda', 'mps', 'cpu').
+        backend (InferenceBackend): 'torch' (eager), 'torchscript', 'onnx' or 'onnx_int8' (the exported backends run on CPU).
 
     Returns:
         Optional[Tuple[nn.Module, transforms.Compose]]:
@@ -254,15 +889,19 @@ def get_resnet_feature_extractor(
 
         # Get the appropriate transforms
         preprocess = weights.transforms()
+
+        if backend != "torch":
+            model = wrap_image_encoder(model, model_name, backend)
+            device = "cpu"
         
-        print(f"ResNet model '{model_name}' (output dim: {output_dim}) loaded on {device} as feature extractor.")
+        print(f"ResNet model '{model_name}' (output dim: {output_dim}, backend: {backend}) loaded on {device} as feature extractor.")
         return model, preprocess
     except Exception as e:
         print(f"Error loading ResNet model '{model_name}': {e}")
         return None
     
 def generate_resnet_embeddings(
-    pil_images: List[Image.Image],
+    pil_images: Sequence[Union[Image.Image, np.ndarray]],
     resnet_model: nn.Module, 
     resnet_transform: transforms.Compose,
     device: str = get_device(),
@@ -273,7 +912,7 @@ def generate_resnet_embeddings(
     Generates ResNet embeddings for a list of PIL Images.
 
     Args:
-        pil_images (List[Image.Image]): List of PIL Image objects.
+        pil_images (Sequence[Union[Image.Image, np.ndarray]]): PIL images or RGB uint8 frames (e.g. `ThumbnailFrameStore.frames`).
         resnet_model (nn.Module): The pre-loaded and modified ResNet feature extractor.
         resnet_transform (transforms.Compose): The preprocessing transform for the ResNet model.
         device (str): Device the model is on ('cuda', 'mps', 'cpu').
@@ -283,7 +922,7 @@ def generate_resnet_embeddings(
     Returns:
         Optional[np.ndarray]: A NumPy array of embeddings, or None if an error occurs.
     """
-    if not pil_images:
+    if len(pil_images) == 0:
         print("No PIL images provided to generate_resnet_embeddings.")
         return None
     
@@ -294,16 +933,22 @@ def generate_resnet_embeddings(
     print(f"Generating ResNet embeddings for {len(pil_images)} frames...")
     all_embeddings_list = []
     resnet_model.eval() # Ensure model is in evaluation mode
+    preprocess_config = get_resnet_preprocess_config(resnet_transform)
 
     try:
         for i in range(0, len(pil_images), batch_size):
             batch_pil_images = pil_images[i:i+batch_size]
+            frame_batch = _as_uint8_frame_batch(batch_pil_images) if preprocess_config else None
             
-            # Apply transformations and create a batch tensor
-            # Ensure images are RGB if ResNet expects that (usually does)
-            batch_tensors = torch.stack(
-                [resnet_transform(img.convert("RGB")) for img in batch_pil_images]
-            ).to(device)
+            if frame_batch is not None:
+                # uint8 frames are preprocessed as one tensor op, without a round-trip through PIL
+                batch_tensors = preprocess_frames_batch(frame_batch, preprocess_config).to(device)
+            else:
+                # Apply transformations and create a batch tensor
+                # Ensure images are RGB if ResNet expects that (usually does)
+                batch_tensors = torch.stack(
+                    [resnet_transform(_as_pil_image(frame)) for frame in batch_pil_images]
+                ).to(device)
             
             with torch.no_grad():
                 features = resnet_model(batch_tensors)
@@ -333,32 +978,252 @@ def generate_resnet_embeddings(
         print(f"Error generating ResNet embeddings: {e}")
         return None
     
-def cluster_and_select_keyframes(
-    candidate_pil_images: List[Image.Image],
-    candidate_timestamps: List[float],
+_PIPELINE_END = object() # Sentinel marking the end of a pipeline stage's output
+
+def _preprocess_frames_batch(
+    frames: List[np.ndarray],
+    embedding_method: str,
+    resnet_transform: Optional[transforms.Compose] = None,
+    clip_processor: Optional[CLIPProcessor] = None,
+    preprocess_config: Optional[FramePreprocessConfig] = None
+) -> torch.Tensor:
+    """Converts a batch of RGB uint8 frames into the model's input tensor (on CPU)."""
+    if preprocess_config is not None:
+        frame_batch = _as_uint8_frame_batch(frames)
+        if frame_batch is not None:
+            return preprocess_frames_batch(frame_batch, preprocess_config)
+
+    pil_images = [_as_pil_image(frame) for frame in frames]
+
+    if embedding_method == "resnet":
+        return torch.stack([resnet_transform(img) for img in pil_images])
+    
+    return clip_processor(images=pil_images, return_tensors="pt")["pixel_values"]
+
+def generate_frame_embeddings_pipelined(
+    video_path: str,
+    embedding_method: str = "resnet",
+    clip_model: Optional[CLIPModel] = None,
+    clip_processor: Optional[CLIPProcessor] = None,
+    resnet_model: Optional[nn.Module] = None,
+    resnet_transform: Optional[transforms.Compose] = None,
+    device: str = get_device(),
+    frame_sample_rate: float = DEFAULT_FRAME_SAMPLE_RATE,
+    batch_size: int = 32,
+    frame_decoder: FrameDecoder = DEFAULT_FRAME_DECODER,
+    thumbnail_short_side: Optional[int] = None,
+    num_preprocess_workers: int = DEFAULT_NUM_PREPROCESS_WORKERS,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE,
+    frame_prefilter: Optional[FramePrefilter] = None
+) -> Tuple[Optional[np.ndarray], List[float]]:
+    """
+    Samples and embeds the frames of a video as a streaming pipeline:
+    decoder thread -> bounded queue -> preprocessing workers -> bounded queue -> model (calling thread).
+    Decoding and preprocessing overlap with inference, and at most `queue_size` batches are held per queue,
+    so the sampled frames never need to be held in memory all at once.
+
+    Args:
+        video_path (str): Path to the video file.
+        embedding_method (str): 'clip' or 'resnet'.
+        clip_model (CLIPModel): The loaded Hugging Face CLIP model (for 'clip').
+        clip_processor (CLIPProcessor): The Hugging Face CLIP processor (for 'clip').
+        resnet_model (nn.Module): The ResNet feature extractor (for 'resnet').
+        resnet_transform (transforms.Compose): The ResNet preprocessing transform (for 'resnet').
+        device (str): Device the model is on ('cuda', 'mps', 'cpu').
+        frame_sample_rate (float): Rate at which frames are sampled (FPS).
+        batch_size (int): Number of frames per model batch.
+        frame_decoder (FrameDecoder): Frame sampling engine ("opencv" or "ffmpeg").
+        thumbnail_short_side (Optional[int]): Frames are downscaled to this short side while decoding
+            (default: the model's input size, see `get_thumbnail_short_side`).
+        num_preprocess_workers (int): Number of preprocessing threads.
+        queue_size (int): Maximum number of batches buffered between two stages.
+        frame_prefilter (Optional[FramePrefilter]): If set, visually redundant frames are dropped in the decoder 
+            thread, before preprocessing and embedding.
+
+    Returns:
+        Tuple[Optional[np.ndarray], List[float]]: L2-normalized embeddings (one row per sampled frame, in 
+        timestamp order) and the corresponding timestamps. Returns (None, []) on error.
+    """
+    embedding_method = embedding_method.lower()
+    if embedding_method == "resnet":
+        model = resnet_model
+        if resnet_model is None or resnet_transform is None:
+            print("ResNet model or transform not provided.")
+            return None, []
+    elif embedding_method == "clip":
+        model = clip_model
+        if clip_model is None or clip_processor is None:
+            print("CLIP model or processor not provided.")
+            return None, []
+    else:
+        print(f"Unsupported embedding method: {embedding_method}. Use 'clip' or 'resnet'.")
+        return None, []
+
+    preprocess_config = (
+        get_resnet_preprocess_config(resnet_transform) if embedding_method == "resnet" 
+        else get_clip_preprocess_config(clip_processor)
+    )
+    if thumbnail_short_side is None:
+        thumbnail_short_side = get_thumbnail_short_side(embedding_method, resnet_transform, clip_processor)
+
+    frame_batches_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    tensor_batches_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    errors: List[Exception] = []
+
+    def put(target_queue: queue.Queue, item) -> bool:
+        # Blocks while the queue is full, but gives up if the pipeline is being stopped
+        while not stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def decode_worker():
+        try:
+            batch_index = 0
+            batch_frames, batch_timestamps = [], []
+
+            sampled_frames = iter_sampled_frames(video_path, frame_sample_rate, frame_decoder, thumbnail_short_side)
+            if frame_prefilter is not None:
+                sampled_frames = frame_prefilter.filter(sampled_frames)
+
+            for frame, timestamp in sampled_frames:
+                batch_frames.append(frame)
+                batch_timestamps.append(timestamp)
+
+                if len(batch_frames) == batch_size:
+                    if not put(frame_batches_queue, (batch_index, batch_frames, batch_timestamps)):
+                        return
+                    batch_index += 1
+                    batch_frames, batch_timestamps = [], []
+
+            if batch_frames:
+                put(frame_batches_queue, (batch_index, batch_frames, batch_timestamps))
+
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+
+        finally:
+            for _ in range(num_preprocess_workers):
+                put(frame_batches_queue, _PIPELINE_END)
+
+    def preprocess_worker():
+        try:
+            while not stop_event.is_set():
+                try:
+                    item = frame_batches_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _PIPELINE_END:
+                    break
+
+                batch_index, batch_frames, batch_timestamps = item
+                batch_tensor = _preprocess_frames_batch(
+                    batch_frames, embedding_method, resnet_transform, clip_processor, preprocess_config
+                )
+                if not put(tensor_batches_queue, (batch_index, batch_tensor, batch_timestamps)):
+                    return
+
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+
+        finally:
+            put(tensor_batches_queue, _PIPELINE_END)
+
+    workers = [threading.Thread(target=decode_worker, name="frame-decode-worker", daemon=True)]
+    workers += [
+        threading.Thread(target=preprocess_worker, name=f"frame-preprocess-worker-{i}", daemon=True)
+        for i in range(num_preprocess_workers)
+    ]
+
+    print(f"Sampling and generating {embedding_method} embeddings at ~{frame_sample_rate} FPS (pipelined, decoder: {frame_decoder})...")
+    model.eval() # Ensure model is in evaluation mode
+    embeddings_by_batch: Dict[int, np.ndarray] = {}
+    timestamps_by_batch: Dict[int, List[float]] = {}
+
+    for worker in workers:
+        worker.start()
+
+    try:
+        num_finished_preprocess_workers = 0
+        while num_finished_preprocess_workers < num_preprocess_workers and not errors:
+            try:
+                item = tensor_batches_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _PIPELINE_END:
+                num_finished_preprocess_workers += 1
+                continue
+
+            batch_index, batch_tensor, batch_timestamps = item
+            with torch.no_grad():
+                batch_tensor = batch_tensor.to(device)
+                if embedding_method == "resnet":
+                    features = resnet_model(batch_tensor)
+                else:
+                    features = clip_model.get_image_features(pixel_values=batch_tensor)
+
+            embeddings_by_batch[batch_index] = features.cpu().numpy()
+            timestamps_by_batch[batch_index] = batch_timestamps
+
+    except Exception as e:
+        errors.append(e)
+
+    finally:
+        # Workers poll the stop event, so none stays blocked on a full or empty queue
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+    if errors:
+        print(f"Error during pipelined frame embedding: {errors[0]}")
+        return None, []
+
+    if frame_prefilter is not None:
+        frame_prefilter.report()
+
+    if not embeddings_by_batch:
+        print("Could not generate any embeddings: no frames were sampled.")
+        return None, []
+
+    batch_indices = sorted(embeddings_by_batch)
+    embeddings_np = np.vstack([embeddings_by_batch[i] for i in batch_indices])
+    timestamps = [timestamp for i in batch_indices for timestamp in timestamps_by_batch[i]]
+
+    # L2 normalization (avoiding division by zero)
+    norms = np.linalg.norm(embeddings_np, axis=1, keepdims=True)
+    embeddings_np = embeddings_np / np.where(norms == 0, 1.0, norms)
+
+    print(f"Generated {embeddings_np.shape[0]} embeddings with dimension {embeddings_np.shape[1]}.")
+    return embeddings_np, timestamps
+
+def select_keyframe_indices(
     embeddings_np: np.ndarray,
-    num_keyframes: int
-) -> List[Tuple[Image.Image, float]]:
+    num_keyframes: int,
+    selector: KeyframeSelector = DEFAULT_KEYFRAME_SELECTOR,
+    pca_components: Optional[int] = None
+) -> List[int]:
     """
-    Performs K-Means clustering on embeddings and selects representative frames.
-    The keyframes are chosen as the frames closest to the centroids of the clusters formed by the CLIP embeddings.
+    Clusters (or segments) the candidate embeddings and selects representative frames.
+    With the KMeans selectors, the keyframes are the frames closest to the centroids of the clusters.
 
     Args:
-        candidate_pil_images (List[Image.Image]): List of all sampled PIL images.
-        candidate_timestamps (List[float]): Timestamps corresponding to candidate_pil_images.
-        embeddings_np (np.ndarray): NumPy array of embeddings for the candidate frames.
+        embeddings_np (np.ndarray): NumPy array of embeddings for the candidate frames (in timestamp order).
         num_keyframes (int): The desired number of keyframes (K).
+        selector (KeyframeSelector): Selection strategy, see `select_keyframe_indices_with_selector`.
+        pca_components (Optional[int]): Optional PCA dimension to cluster in.
 
     Returns:
-        List[Tuple[Image.Image, float]]: List of (PIL Image, timestamp) for selected keyframes.
+        List[int]: Sorted indices (into the candidate frames) of the selected keyframes.
     """
     if embeddings_np is None or len(embeddings_np) == 0:
         print("No embeddings provided for clustering.")
         return []
-    
-    if len(candidate_pil_images) != len(embeddings_np):
-        print("Mismatch between number of images and embeddings. Cannot cluster.")
-        return []
 
     # Ensure num_keyframes isn't more than available samples for clustering
     actual_num_clusters = min(num_keyframes, embeddings_np.shape[0])
@@ -369,51 +1234,121 @@ def cluster_and_select_keyframes(
         print("No clusters to create.")
         return []
 
-    print(f"Clustering {embeddings_np.shape[0]} embeddings into {actual_num_clusters} clusters...")
+    print(f"Selecting {actual_num_clusters} keyframes from {embeddings_np.shape[0]} embeddings (selector: {selector})...")
     try:
-        kmeans = KMeans(n_clusters=actual_num_clusters, random_state=0, n_init='auto')
-        cluster_labels = kmeans.fit_predict(embeddings_np)
-        
-        # Keep track of original indices of frames already selected to avoid duplicates
-        # if multiple cluster centroids map to the same closest actual frame.
-        selected_keyframes_data = []
-        selected_original_indices = set()
-        print("Selecting representative keyframes from clusters...")
-
-        for i in range(actual_num_clusters):
-            # Get indices of all frames belonging to the current cluster
-            cluster_member_original_indices = np.where(cluster_labels == i)[0]
-
-            if len(cluster_member_original_indices) == 0: 
-                continue
-            
-            # Get the embeddings of the frames in the current cluster
-            cluster_member_embeddings = embeddings_np[cluster_member_original_indices]
-            # Get the centroid for the current cluster
-            cluster_centroid = kmeans.cluster_centers_[i]
-            
-            # Find the frame in the cluster that is closest to the centroid
-            distances_to_centroid = euclidean_distances(cluster_member_embeddings, cluster_centroid.reshape(1, -1))
-            closest_index_within_cluster = np.argmin(distances_to_centroid)
-
-            # Map this back to the original index in the candidate_pil_images list
-            original_frame_index = cluster_member_original_indices[closest_index_within_cluster]
-            
-            if original_frame_index not in selected_original_indices:
-                selected_keyframes_data.append(
-                    (candidate_pil_images[original_frame_index], candidate_timestamps[original_frame_index])
-                )
-                selected_original_indices.add(original_frame_index)
-        
-        selected_keyframes_data.sort(key=lambda x: x[1]) # Sort by timestamp
-        print(f"Selected {len(selected_keyframes_data)} keyframes after clustering.")
-        return selected_keyframes_data
+        selected_indices = select_keyframe_indices_with_selector(
+            embeddings_np, actual_num_clusters, selector=selector, pca_components=pca_components
+        )
+        print(f"Selected {len(selected_indices)} keyframes after clustering.")
+        return selected_indices
     
     except Exception as e:
         print(f"Error during clustering and keyframe selection: {e}")
         return []
 
-def extract_keyframes_by_clustering(
+def cluster_and_select_keyframes(
+    candidate_pil_images: List[Image.Image],
+    candidate_timestamps: List[float],
+    embeddings_np: np.ndarray,
+    num_keyframes: int,
+    selector: KeyframeSelector = DEFAULT_KEYFRAME_SELECTOR
+) -> List[Tuple[Image.Image, float]]:
+    """
+    Performs K-Means clustering on embeddings and selects representative frames (see `select_keyframe_indices`).
+
+    Args:
+        candidate_pil_images (List[Image.Image]): List of all sampled PIL images.
+        candidate_timestamps (List[float]): Timestamps corresponding to candidate_pil_images.
+        embeddings_np (np.ndarray): NumPy array of embeddings for the candidate frames.
+        num_keyframes (int): The desired number of keyframes (K).
+        selector (KeyframeSelector): Selection strategy, see `select_keyframe_indices_with_selector`.
+
+    Returns:
+        List[Tuple[Image.Image, float]]: List of (PIL Image, timestamp) for selected keyframes.
+    """
+    if embeddings_np is not None and len(candidate_pil_images) != len(embeddings_np):
+        print("Mismatch between number of images and embeddings. Cannot cluster.")
+        return []
+
+    selected_indices = select_keyframe_indices(embeddings_np, num_keyframes, selector)
+    selected_keyframes_data = [(candidate_pil_images[i], candidate_timestamps[i]) for i in selected_indices]
+    selected_keyframes_data.sort(key=lambda x: x[1]) # Sort by timestamp
+
+    return selected_keyframes_data
+
+def _select_candidate_indices(
+    embeddings_np: np.ndarray,
+    num_keyframes: int,
+    selector: KeyframeSelector = DEFAULT_KEYFRAME_SELECTOR
+) -> List[int]:
+    """Clusters the candidate embeddings, or keeps every candidate if there are no more than `num_keyframes`."""
+    if embeddings_np.shape[0] <= num_keyframes:
+        print(f"Number of sampled frames ({embeddings_np.shape[0]}) is less than or equal to "
+              f"desired keyframes ({num_keyframes}). Returning all sampled frames as keyframes.")
+        return list(range(embeddings_np.shape[0]))
+    
+    return select_keyframe_indices(embeddings_np, num_keyframes, selector)
+
+def _select_keyframes_with_thumbnail_store(
+    video_path: str,
+    num_keyframes: int,
+    embedding_method: str,
+    clip_model: Optional[CLIPModel],
+    clip_processor: Optional[CLIPProcessor],
+    resnet_model: Optional[nn.Module],
+    resnet_transform: Optional[transforms.Compose],
+    device: str,
+    frame_sample_rate: float,
+    batch_size: int,
+    frame_decoder: FrameDecoder,
+    thumbnail_short_side: int,
+    thumbnail_memmap_path: Optional[str],
+    keyframe_selector: KeyframeSelector,
+    frame_prefilter: Optional[FramePrefilter]
+) -> Tuple[List[int], List[float], Optional[np.ndarray]]:
+    """
+    Non-pipelined keyframe selection: samples every candidate thumbnail first, then embeds and clusters them.
+
+    Returns:
+        Tuple[List[int], List[float], Optional[np.ndarray]]: Indices of the selected keyframes, the timestamps 
+        and the embeddings of all candidate frames.
+    """
+    # Step 1: Sample downscaled candidate frames from the video
+    frame_store, candidate_timestamps = sample_frames_to_thumbnail_store(
+        video_path, 
+        frame_sample_rate, 
+        decoder=frame_decoder, 
+        thumbnail_short_side=thumbnail_short_side, 
+        memmap_path=thumbnail_memmap_path,
+        frame_prefilter=frame_prefilter
+    )
+
+    if frame_store is None or len(frame_store) == 0:
+        print("Keyframe extraction failed: No frames were sampled.")
+        return [], [], None
+
+    try:
+        # Step 2: Generate embeddings for the sampled thumbnails
+        if embedding_method.lower() == 'resnet':
+            embeddings_np = generate_resnet_embeddings(
+                frame_store.frames, resnet_model, resnet_transform, device, batch_size
+            )
+        elif embedding_method.lower() == 'clip':
+            embeddings_np = generate_clip_embeddings(
+                frame_store.frames, clip_model, clip_processor, device, batch_size
+            )
+
+        if embeddings_np is None or embeddings_np.shape[0] == 0:
+            print("Keyframe extraction failed: Could not generate embeddings.")
+            return [], [], None
+        
+        # Step 3: Cluster embeddings and select representative keyframes
+        return _select_candidate_indices(embeddings_np, num_keyframes, keyframe_selector), candidate_timestamps, embeddings_np
+
+    finally:
+        frame_store.close()
+
+def extract_keyframes_and_embeddings_by_clustering(
     video_path: str,
     num_keyframes: int,
     clip_model: Optional[CLIPModel] = None,
@@ -423,11 +1358,24 @@ def extract_keyframes_by_clustering(
     device: str = get_device(),
     frame_sample_rate: int = 1,
     batch_size: int = 32,
-    embedding_method: str = 'resnet'  # 'clip' or 'resnet'
-) -> List[Tuple[Image.Image, float]]:
+    embedding_method: str = 'resnet',  # 'clip' or 'resnet'
+    frame_decoder: FrameDecoder = DEFAULT_FRAME_DECODER,
+    thumbnail_short_side: Optional[int] = None,
+    thumbnail_memmap_path: Optional[str] = None,
+    use_pipeline: bool = True,
+    keyframe_selector: KeyframeSelector = DEFAULT_KEYFRAME_SELECTOR,
+    frame_prefilter: Optional[FramePrefilter] = None,
+    frame_embedding_cache: Optional[FrameEmbeddingCache] = None,
+    video_sha256: Optional[str] = None,
+    embedding_model_name: Optional[str] = None,
+    inference_backend: InferenceBackend = DEFAULT_INFERENCE_BACKEND
+) -> Tuple[List[Tuple[Image.Image, float]], Optional[np.ndarray]]:
     """
-    Extracts keyframes from a video using semantic clustering of CLIP embeddings.
+    Extracts keyframes from a video using semantic clustering of CLIP or ResNet embeddings.
     This function orchestrates frame sampling, embedding, and clustering.
+    The embeddings of the selected keyframes are returned as well, so that with `embedding_method='clip'` 
+    they can be indexed directly instead of running CLIP a second time over the keyframes.
+    Candidate frames are embedded as downscaled thumbnails; only the selected keyframes are re-decoded at full resolution.
 
     Args:
         video_path (str): Path to the video file.
@@ -437,59 +1385,172 @@ def extract_keyframes_by_clustering(
         device (str): Device to run CLIP on ('cuda', 'mps', or 'cpu').
         frame_sample_rate (int): Rate at which to initially sample frames (FPS).
         batch_size (int): Batch size for processing frames with CLIP.
+        frame_decoder (FrameDecoder): Frame sampling engine ("opencv" or "ffmpeg").
+        thumbnail_short_side (Optional[int]): Short side (in pixels) of the candidate thumbnails that are embedded
+            (default: the model's input size, see `get_thumbnail_short_side`).
+        thumbnail_memmap_path (Optional[str]): Optional file path to memory-map the candidate thumbnails into 
+            (only used when `use_pipeline` is False).
+        use_pipeline (bool): Whether to overlap decoding, preprocessing and inference (see `generate_frame_embeddings_pipelined`)
+            instead of sampling every frame before embedding.
+        keyframe_selector (KeyframeSelector): Keyframe selection strategy ("auto", "kmeans", "minibatch_kmeans" 
+            or "temporal_segmentation").
+        frame_prefilter (Optional[FramePrefilter]): Optional shot-boundary / near-duplicate pre-filter applied to the 
+            sampled frames before embedding (a fresh instance per video).
+        frame_embedding_cache (Optional[FrameEmbeddingCache]): If set, the sampled frames' embeddings are loaded from 
+            (or saved to) this cache, so re-clustering a video skips decoding and embedding.
+        video_sha256 (Optional[str]): SHA-256 of the video file content (computed if a cache is used and it is not given).
+        embedding_model_name (Optional[str]): Name of the embedding model, used in the cache key 
+            (defaults to `DEFAULT_CLIP_MODEL_NAME` / `DEFAULT_RESNET_MODEL_NAME`).
+        inference_backend (InferenceBackend): Backend the embedding model runs on, used in the cache key 
+            (with its precision), so that e.g. int8 and fp32 embeddings are never mixed.
 
     Returns:
-        List[Tuple[Image.Image, float]]: List of (PIL Image, timestamp) tuples for keyframes.
+        Tuple[List[Tuple[Image.Image, float]], Optional[np.ndarray]]: List of (PIL Image, timestamp) tuples for 
+        keyframes, and the L2-normalized embeddings of those keyframes (one row per keyframe, None on failure).
     """
     if embedding_method == "clip":
         if clip_model is None or clip_processor is None:
             print("CLIP model or processor not provided. Cannot extract keyframes.")
-            return []
+            return [], None
     elif embedding_method == "resnet":
         if resnet_model is None or resnet_transform is None:
             print("ResNet model or transform not provided. Cannot extract keyframes.")
-            return []
+            return [], None
     else:
         print(f"Unsupported embedding method: {embedding_method}. Use 'clip' or 'resnet'.")
-        return []
+        return [], None
 
     print(f"\nStarting keyframe extraction for '{video_path}'...")
+    if thumbnail_short_side is None:
+        thumbnail_short_side = get_thumbnail_short_side(embedding_method, resnet_transform, clip_processor)
+
+    cached_frame_embeddings = None
+    if frame_embedding_cache is not None:
+        video_sha256 = video_sha256 or compute_file_sha256(video_path)
+        cache_key = FrameEmbeddingCache.make_key(
+            embedding_model_name or (DEFAULT_CLIP_MODEL_NAME if embedding_method == "clip" else DEFAULT_RESNET_MODEL_NAME),
+            frame_sample_rate,
+            decoder=frame_decoder,
+            thumbnail=thumbnail_short_side,
+            prefilter=frame_prefilter.config_key if frame_prefilter is not None else "none",
+            backend=inference_backend,
+            precision=get_inference_backend_precision(inference_backend)
+        )
+        cached_frame_embeddings = frame_embedding_cache.load(video_sha256, cache_key)
+
+    if cached_frame_embeddings is not None:
+        # Steps 1 & 2 were already done by a previous run
+        embeddings_np, candidate_timestamps = cached_frame_embeddings
+        selected_indices = _select_candidate_indices(embeddings_np, num_keyframes, keyframe_selector)
+
+    elif use_pipeline:
+        # Steps 1 & 2: Sample and embed downscaled frames in a streaming decode -> preprocess -> embed pipeline
+        embeddings_np, candidate_timestamps = generate_frame_embeddings_pipelined(
+            video_path,
+            embedding_method=embedding_method,
+            clip_model=clip_model,
+            clip_processor=clip_processor,
+            resnet_model=resnet_model,
+            resnet_transform=resnet_transform,
+            device=device,
+            frame_sample_rate=frame_sample_rate,
+            batch_size=batch_size,
+            frame_decoder=frame_decoder,
+            thumbnail_short_side=thumbnail_short_side,
+            frame_prefilter=frame_prefilter
+        )
 
-    # Step 1: Sample frames from the video
-    candidate_pil_images, candidate_timestamps, _ = sample_frames_from_video(
-        video_path, frame_sample_rate
-    )
-
-    if not candidate_pil_images:
-        print("Keyframe extraction failed: No frames were sampled.")
-        return []
+        if embeddings_np is None or embeddings_np.shape[0] == 0:
+            print("Keyframe extraction failed: Could not sample or embed any frames.")
+            return [], None
 
-    # Handle case where sampled frames are fewer than desired keyframes
-    if len(candidate_pil_images) <= num_keyframes:
-        print(f"Number of sampled frames ({len(candidate_pil_images)}) is less than or equal to "
-              f"desired keyframes ({num_keyframes}). Returning all sampled frames as keyframes.")
-        return sorted(list(zip(candidate_pil_images, candidate_timestamps)), key=lambda x: x[1])
+        # Step 3: Cluster embeddings and select representative keyframes
+        selected_indices = _select_candidate_indices(embeddings_np, num_keyframes, keyframe_selector)
 
-    # Step 2: Generate embeddings for the sampled frames
-    if embedding_method.lower() == 'resnet':
-        embeddings_np = generate_resnet_embeddings(
-            candidate_pil_images, resnet_model, resnet_transform, device, batch_size
-        )
-    elif embedding_method.lower() == 'clip':
-        embeddings_np = generate_clip_embeddings(
-            candidate_pil_images, clip_model, clip_processor, device, batch_size
+    else:
+        selected_indices, candidate_timestamps, embeddings_np = _select_keyframes_with_thumbnail_store(
+            video_path,
+            num_keyframes,
+            embedding_method=embedding_method,
+            clip_model=clip_model,
+            clip_processor=clip_processor,
+            resnet_model=resnet_model,
+            resnet_transform=resnet_transform,
+            device=device,
+            frame_sample_rate=frame_sample_rate,
+            batch_size=batch_size,
+            frame_decoder=frame_decoder,
+            thumbnail_short_side=thumbnail_short_side,
+            thumbnail_memmap_path=thumbnail_memmap_path,
+            keyframe_selector=keyframe_selector,
+            frame_prefilter=frame_prefilter
         )
 
-    if embeddings_np is None or embeddings_np.shape[0] == 0:
-        print("Keyframe extraction failed: Could not generate embeddings.")
-        return []
-    
-    # Step 3: Cluster embeddings and select representative keyframes
-    selected_keyframes = cluster_and_select_keyframes(
-        candidate_pil_images, candidate_timestamps, embeddings_np, num_keyframes
-    )
+    if frame_embedding_cache is not None and cached_frame_embeddings is None and embeddings_np is not None:
+        frame_embedding_cache.save(video_sha256, cache_key, embeddings_np, candidate_timestamps)
+
+    if not selected_indices:
+        return [], None
+
+    # Step 4: Re-decode the selected keyframes at full resolution
+    selected_timestamps = [candidate_timestamps[i] for i in selected_indices]
+    full_resolution_frames = decode_frames_at_timestamps(video_path, selected_timestamps)
+
+    # Selected indices are sorted, so keyframes come out in timestamp order
+    decoded_positions = [i for i, frame in enumerate(full_resolution_frames) if frame is not None]
+    selected_keyframes = [(full_resolution_frames[i], selected_timestamps[i]) for i in decoded_positions]
+    selected_embeddings = embeddings_np[[selected_indices[i] for i in decoded_positions]]
     
     print(f"Keyframe extraction process completed. Found {len(selected_keyframes)} keyframes.")
+    return selected_keyframes, selected_embeddings
+
+def extract_keyframes_by_clustering(
+    video_path: str,
+    num_keyframes: int,
+    clip_model: Optional[CLIPModel] = None,
+    clip_processor: Optional[CLIPProcessor] = None,
+    resnet_model: Optional[nn.Module] = None,
+    resnet_transform: Optional[transforms.Compose] = None,
+    device: str = get_device(),
+    frame_sample_rate: int = 1,
+    batch_size: int = 32,
+    embedding_method: str = 'resnet',  # 'clip' or 'resnet'
+    frame_decoder: FrameDecoder = DEFAULT_FRAME_DECODER,
+    thumbnail_short_side: Optional[int] = None,
+    thumbnail_memmap_path: Optional[str] = None,
+    use_pipeline: bool = True,
+    keyframe_selector: KeyframeSelector = DEFAULT_KEYFRAME_SELECTOR,
+    frame_prefilter: Optional[FramePrefilter] = None,
+    frame_embedding_cache: Optional[FrameEmbeddingCache] = None,
+    inference_backend: InferenceBackend = DEFAULT_INFERENCE_BACKEND
+) -> List[Tuple[Image.Image, float]]:
+    """
+    Extracts keyframes from a video using semantic clustering of frame embeddings.
+    See `extract_keyframes_and_embeddings_by_clustering` for the arguments.
+
+    Returns:
+        List[Tuple[Image.Image, float]]: List of (PIL Image, timestamp) tuples for keyframes.
+    """
+    selected_keyframes, _ = extract_keyframes_and_embeddings_by_clustering(
+        video_path=video_path,
+        num_keyframes=num_keyframes,
+        clip_model=clip_model,
+        clip_processor=clip_processor,
+        resnet_model=resnet_model,
+        resnet_transform=resnet_transform,
+        device=device,
+        frame_sample_rate=frame_sample_rate,
+        batch_size=batch_size,
+        embedding_method=embedding_method,
+        frame_decoder=frame_decoder,
+        thumbnail_short_side=thumbnail_short_side,
+        thumbnail_memmap_path=thumbnail_memmap_path,
+        use_pipeline=use_pipeline,
+        keyframe_selector=keyframe_selector,
+        frame_prefilter=frame_prefilter,
+        frame_embedding_cache=frame_embedding_cache,
+        inference_backend=inference_backend
+    )
     return selected_keyframes
 
 def plot_keyframes(
@@ -1,4 +1,5 @@
 import uuid 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Union 
 
 import numpy as np
@@ -82,6 +83,62 @@ class QdrantClient:
             print(f"Error upserting points to '{collection_name}': {e}")
             return False
         
+    def upsert_points_batched(
+            self,
+            collection_name: str,
+            points: List[PointStruct],
+            batch_size: int = settings.qdrant.upsert_batch_size,
+            parallel: int = settings.qdrant.upsert_parallel
+        ) -> bool:
+        """
+        Upserts a large number of points in chunks of `batch_size`.
+        All chunks but the last are sent without waiting for them to be applied (`wait=False`), `parallel` at a time; 
+        the last chunk is sent with `wait=True`. Updates are applied in order, so its completion confirms the whole batch.
+
+        Args:
+            collection_name: The name of the collection.
+            points: A list of PointStruct objects to be upserted.
+            batch_size: The maximum number of points per upsert request.
+            parallel: The number of upsert requests in flight at once.
+
+        Returns:
+            True if every chunk was accepted and the batch was applied, False otherwise.
+        """
+        if not points:
+            return True
+
+        batch_size = max(1, batch_size)
+        chunks = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+        *pending_chunks, last_chunk = chunks
+
+        def upsert_chunk(chunk: List[PointStruct]) -> UpdateStatus:
+            return self.client.upsert(
+                collection_name=collection_name,
+                wait=False,
+                points=chunk
+            ).status
+
+        try:
+            if pending_chunks:
+                with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+                    statuses = list(executor.map(upsert_chunk, pending_chunks))
+
+                if any(status not in (UpdateStatus.ACKNOWLEDGED, UpdateStatus.COMPLETED) for status in statuses):
+                    print(f"Error upserting points to '{collection_name}': statuses {statuses}")
+                    return False
+
+            operation_info = self.client.upsert(
+                collection_name=collection_name,
+                wait=True,
+                points=last_chunk
+            )
+
+            return operation_info.status == UpdateStatus.COMPLETED
+
+        except Exception as e:
+            print(f"Error upserting {len(points)} points to '{collection_name}': {e}")
+            return False
+
     def update_payload(
             self,
             collection_name: str,
@@ -9,6 +9,7 @@ from qdrant_client.http.models import PointStruct
 from core.config.config import settings 
 from core.vector_store.schemas import SearchResult
 from core.vector_store.qdrant_client import QdrantClient
+from core.utils.audio_track import AudioByteRange
 
 AUDIO_SEGMENT_EMBEDDING_VECTOR_NAME = "audio_segment_clap_embedding" # using CLAP
 AUDIO_SEGMENT_EMBEDDING_VECTOR_SIZE = 512 # using CLAP
@@ -18,7 +19,7 @@ AUDIO_SEGMENT_TRANSCRIPT_EMBEDDING_VECTOR_SIZE = 384 # since we are using senten
 class AudioSegmentMetadata(BaseModel):
     """Metadata for audio segments."""
     id: str = Field(description="Unique identifier for the audio segment, typically matching the Qdrant point ID and part of the MinIO object name.")
-    minio_path: str = Field(description="Full path to the audio segment in MinIO.")
+    minio_path: str = Field(description="Full path to the audio segment in MinIO, or to the video's audio track if the segment is stored as a byte range of it.")
     video_id: Optional[str] = Field(default=None, description="Unique ID for the video.")
 
     start_time: float = Field(description="Start time of the segment within the original audio file (in seconds).")
@@ -30,6 +31,23 @@ class AudioSegmentMetadata(BaseModel):
     emotion: str = Field(..., description="Emotion label associated with the audio segment.")
     emotion_confidence_score: Optional[float] = Field(..., description="Confidence score for the predicted emotion label.")
 
+    byte_start: Optional[int] = Field(default=None, description="Offset of the first FLAC frame of the segment in the audio track (None for a stand-alone segment object).")
+    byte_end: Optional[int] = Field(default=None, description="Offset just past the last FLAC frame of the segment in the audio track.")
+    byte_range_first_sample: Optional[int] = Field(default=None, description="Index (in the audio track) of the first sample of the frame at `byte_start`.")
+
+    def get_byte_range(self) -> Optional[AudioByteRange]:
+        """Returns the location of the segment in the video's audio track, or None for a stand-alone segment object."""
+        if self.byte_start is None or self.byte_end is None or self.byte_range_first_sample is None:
+            return None
+
+        return AudioByteRange(
+            byte_start=self.byte_start,
+            byte_end=self.byte_end,
+            first_sample=self.byte_range_first_sample,
+            start_sample=int(self.start_time * self.sample_rate),
+            end_sample=int(self.end_time * self.sample_rate)
+        )
+
 class AudioSegmentRetriever:
     """Handles indexing and retrieval of audio segments."""
     def __init__(
@@ -64,14 +82,7 @@ class AudioSegmentRetriever:
             audio_segment_transcript_embedding: np.ndarray, 
             metadata: AudioSegmentMetadata
         ) -> bool:
-        point = PointStruct(
-            id=segment_id,
-            vector={
-                AUDIO_SEGMENT_EMBEDDING_VECTOR_NAME: audio_segment_embedding.tolist(), 
-                AUDIO_SEGMENT_TRANSCRIPT_EMBEDDING_VECTOR_NAME: audio_segment_transcript_embedding.tolist()
-            },
-            payload=metadata.model_dump()
-        )
+        point = self._make_point(segment_id, audio_segment_embedding, audio_segment_transcript_embedding, metadata)
 
         success = self.client.upsert_points(
             self.collection_name,
@@ -83,6 +94,49 @@ class AudioSegmentRetriever:
 
         return success
 
+    def index_segments_batch(
+            self,
+            segment_ids: List[str],
+            audio_segment_embeddings: np.ndarray,
+            audio_segment_transcript_embeddings: np.ndarray,
+            metadata_list: List[AudioSegmentMetadata],
+            batch_size: int = settings.qdrant.upsert_batch_size,
+            parallel: int = settings.qdrant.upsert_parallel
+        ) -> bool:
+        """
+        Indexes many audio segments with chunked (and optionally parallel) upserts, confirmed once at the end.
+        The i-th segment uses the i-th row of both embedding arrays and the i-th metadata.
+        """
+        points = [
+            self._make_point(segment_id, audio_embedding, transcript_embedding, metadata)
+            for segment_id, audio_embedding, transcript_embedding, metadata in zip(
+                segment_ids, audio_segment_embeddings, audio_segment_transcript_embeddings, metadata_list
+            )
+        ]
+
+        success = self.client.upsert_points_batched(self.collection_name, points, batch_size=batch_size, parallel=parallel)
+
+        if success:
+            print(f"✓ Indexed {len(points)} audio segments with audio and transcript embeddings.")
+
+        return success
+
+    def _make_point(
+            self,
+            segment_id: str,
+            audio_segment_embedding: np.ndarray, 
+            audio_segment_transcript_embedding: np.ndarray, 
+            metadata: AudioSegmentMetadata
+        ) -> PointStruct:
+        return PointStruct(
+            id=segment_id,
+            vector={
+                AUDIO_SEGMENT_EMBEDDING_VECTOR_NAME: audio_segment_embedding.tolist(), 
+                AUDIO_SEGMENT_TRANSCRIPT_EMBEDDING_VECTOR_NAME: audio_segment_transcript_embedding.tolist()
+            },
+            payload=metadata.model_dump()
+        )
+
     def update_segment_metadata(
             self,
             segment_id: str,
@@ -65,10 +65,52 @@ class VideoKeyframeRetriever:
         """
         Indexes a video keyframe with its CLIP image embedding and description embedding.
         """
+        point = self._make_point(keyframe_id, keyframe_image_embedding, keyframe_description_embedding, metadata)
+        success = self.client.upsert_points(self.collection_name, [point])
+
+        if success:
+            print(f"✓ Indexed video keyframe '{keyframe_id}' with image and description embeddings.")
+
+        return success
+
+    def index_keyframes_batch(
+            self,
+            keyframe_ids: List[str],
+            keyframe_image_embeddings: np.ndarray,
+            keyframe_description_embeddings: np.ndarray,
+            metadata_list: List[VideoKeyframeMetadata],
+            batch_size: int = settings.qdrant.upsert_batch_size,
+            parallel: int = settings.qdrant.upsert_parallel
+        ) -> bool:
+        """
+        Indexes many video keyframes with chunked (and optionally parallel) upserts, confirmed once at the end.
+        The i-th keyframe uses the i-th row of both embedding arrays and the i-th metadata.
+        """
+        points = [
+            self._make_point(keyframe_id, image_embedding, description_embedding, metadata)
+            for keyframe_id, image_embedding, description_embedding, metadata in zip(
+                keyframe_ids, keyframe_image_embeddings, keyframe_description_embeddings, metadata_list
+            )
+        ]
+
+        success = self.client.upsert_points_batched(self.collection_name, points, batch_size=batch_size, parallel=parallel)
+
+        if success:
+            print(f"✓ Indexed {len(points)} video keyframes with image and description embeddings.")
+
+        return success
+
+    def _make_point(
+            self,
+            keyframe_id: str,
+            keyframe_image_embedding: np.ndarray, 
+            keyframe_description_embedding: np.ndarray,
+            metadata: VideoKeyframeMetadata
+        ) -> PointStruct:
         if not metadata.description:
             print(f"Warning: Indexing keyframe {keyframe_id} without a description in metadata. Text-to-image search might be ineffective.")
-            
-        point = PointStruct(
+
+        return PointStruct(
             id=keyframe_id, 
             vector={
                 KEYFRAME_IMAGE_EMBEDDING_VECTOR_NAME: keyframe_image_embedding.tolist(),
@@ -77,13 +119,6 @@ class VideoKeyframeRetriever:
             payload=metadata.model_dump()
         )
 
-        success = self.client.upsert_points(self.collection_name, [point])
-
-        if success:
-            print(f"✓ Indexed video keyframe '{keyframe_id}' with image and description embeddings.")
-
-        return success
-
     def update_keyframe_metadata(
             self,
             keyframe_id: str, 
@@ -12,9 +12,18 @@ from core.utils.audio_processor import ProcessedAudioSegment
 from core.vector_store.schemas import SearchResult
 from core.utils.minio_client import MinIOClient
 from core.utils.audio_processor import DEFAULT_SAMPLING_RATE
+from core.utils.audio_track import AudioTrackIndex
+from core.utils.audio_ingestion import DecodedAudio
 from core.vector_store.retrievers.video_keyframe_retriever import VideoKeyframeMetadata, VideoKeyframeRetriever
 from core.vector_store.retrievers.audio_segment_retriever import AudioSegmentRetriever, AudioSegmentMetadata 
 
+def make_point_id(video_id: str, kind: str, index: int) -> str:
+    """
+    Deterministic point/object ID of the `index`-th keyframe or audio segment of a video, so that re-running 
+    an interrupted indexing stage overwrites the points it already wrote instead of duplicating them.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{video_id}/{kind}/{index}"))
+
 def index_keyframes(
     video_id: str,
     extracted_keyframes_data: List[Tuple[Image.Image, float]],
@@ -24,37 +33,37 @@ def index_keyframes(
     minio_client: MinIOClient,
     video_keyframe_retriever: VideoKeyframeRetriever
 ):
-    """End-to-end function for indexing keyframes into the vector store."""
-    successfully_indexed_count = 0
+    """
+    End-to-end function for indexing keyframes into the vector store.
+    Keyframe images are uploaded to MinIO concurrently; the points are then upserted to Qdrant in bulk.
+    """
+    keyframe_ids, image_embeddings, description_embeddings, metadata_list = [], [], [], []
 
     try:
-        for i, (pil_image, timestamp) in enumerate(extracted_keyframes_data):
-            keyframe_image_clip_emb = keyframe_images_clip_embeddings[i]
-            keyframe_desc_sent_emb = keyframe_descriptions_sent_embeddings[i]
-            keyframe_desc_text = keyframe_descriptions[i]["description"]
-
-            keyframe_id = str(uuid.uuid4())
-
-            # Store keyframe image in MinIO 
+        # Store keyframe images in MinIO 
+        upload_items = []
+        for i, (pil_image, _) in enumerate(extracted_keyframes_data):
             img_byte_arr = io.BytesIO()
             pil_image.save(
                 img_byte_arr,
                 format='JPEG',
                 quality=85
             )
-            image_bytes = img_byte_arr.getvalue()
+            upload_items.append((img_byte_arr.getvalue(), make_point_id(video_id, "keyframe", i)))
 
-            minio_path = minio_client.store_video_keyframe(
-                image_data=image_bytes, 
-                keyframe_id=keyframe_id, 
-                image_format="JPEG"
-            )
+        minio_paths = minio_client.store_video_keyframes_batch(upload_items, image_format="JPEG")
+
+        for i, (_, timestamp) in enumerate(extracted_keyframes_data):
+            keyframe_image_clip_emb = keyframe_images_clip_embeddings[i]
+            keyframe_desc_sent_emb = keyframe_descriptions_sent_embeddings[i]
+            keyframe_desc_text = keyframe_descriptions[i]["description"]
+
+            keyframe_id = upload_items[i][1]
+            minio_path = minio_paths[i]
 
             if not minio_path:
                 print(f"Failed to store keyframe image in MinIO for keyframe {i + 1}. Skipping.")
                 continue
-            else:
-                print(f"Stored keyframe image in MinIO at path: {minio_path}") 
 
             # Prepare video keyframe metadata and index 
             video_keyframe_metadata = VideoKeyframeMetadata(
@@ -66,20 +75,24 @@ def index_keyframes(
                 minio_path=minio_path
             )
 
-            success_indexing = video_keyframe_retriever.index_keyframe(
-                keyframe_id=keyframe_id,
-                keyframe_image_embedding=keyframe_image_clip_emb,
-                keyframe_description_embedding=keyframe_desc_sent_emb,
-                metadata=video_keyframe_metadata
-            )
+            keyframe_ids.append(keyframe_id)
+            image_embeddings.append(keyframe_image_clip_emb)
+            description_embeddings.append(keyframe_desc_sent_emb)
+            metadata_list.append(video_keyframe_metadata)
+
+        success_indexing = video_keyframe_retriever.index_keyframes_batch(
+            keyframe_ids=keyframe_ids,
+            keyframe_image_embeddings=image_embeddings,
+            keyframe_description_embeddings=description_embeddings,
+            metadata_list=metadata_list
+        )
 
-            if success_indexing:
-                successfully_indexed_count += 1
-                print(f"Successfully indexed keyframe {i + 1} with ID: {keyframe_id}")
-            else:
-                print(f"Failed to index keyframe {i + 1} with ID: {keyframe_id}. Skipping.")
+        if success_indexing:
+            print(f"Successfully indexed {len(keyframe_ids)} keyframes for video_id: {video_id}")
+        else:
+            print(f"Failed to index the keyframes of video_id: {video_id}")
 
-        return True 
+        return success_indexing
     
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -246,29 +259,54 @@ def index_audio_segments(
     audio_segments_transcript_sentence_embeddings: np.ndarray, 
     minio_client: MinIOClient,
     audio_segment_retriever: AudioSegmentRetriever, 
-    sampling_rate: int = DEFAULT_SAMPLING_RATE
+    sampling_rate: int = DEFAULT_SAMPLING_RATE,
+    audio_track: Optional[AudioTrackIndex] = None,
+    decoded_audio: Optional[DecodedAudio] = None
 ):
-    """End-to-end function for indexing audio segments into the vector store."""
-    successfully_indexed_count = 0
+    """
+    End-to-end function for indexing audio segments into the vector store.
+
+    With an `audio_track` (the video's FLAC track, already uploaded to MinIO), every segment is stored as the byte
+    range of the frames covering it in that track, so no audio is uploaded. Otherwise each segment is sliced out of
+    `decoded_audio` and uploaded to MinIO as a WAV object (concurrently). The points are then upserted to Qdrant in bulk.
+    """
+    segment_ids, audio_embeddings, transcript_embeddings, metadata_list = [], [], [], []
 
     try:
+        segment_ids_to_index = [
+            make_point_id(video_id, "audio_segment", i) for i in range(len(processed_audio_segments))
+        ]
+
+        byte_ranges = [None] * len(processed_audio_segments)
+        if audio_track is not None:
+            sampling_rate = audio_track.sampling_rate
+            minio_paths = [audio_track.minio_path] * len(processed_audio_segments)
+            byte_ranges = [
+                audio_track.byte_range(audio_segment["start"], audio_segment["end"])
+                for audio_segment in processed_audio_segments
+            ]
+        elif decoded_audio is not None:
+            minio_paths = minio_client.store_audio_segments_batch(
+                [
+                    (decoded_audio.segment(audio_segment["start"], audio_segment["end"], sampling_rate), segment_id)
+                    for audio_segment, segment_id in zip(processed_audio_segments, segment_ids_to_index)
+                ],
+                sampling_rate
+            )
+        else:
+            raise ValueError("Either the audio track or the decoded audio is required to store the audio segments.")
+
         for i, audio_segment in enumerate(processed_audio_segments):
             audio_segment_clap_embedding = audio_segments_clap_embeddings[i]
             audio_segments_transcript_sentence_embedding = audio_segments_transcript_sentence_embeddings[i]
 
-            segment_id = str(uuid.uuid4())
-
-            minio_path = minio_client.store_audio_segment(
-                audio_segment["audio"], 
-                sampling_rate, 
-                segment_id
-            )
+            segment_id = segment_ids_to_index[i]
+            minio_path = minio_paths[i]
+            byte_range = byte_ranges[i]
 
             if not minio_path:
                 print(f"Failed to store audio segment in MinIO for segment {i + 1}. Skipping.")
                 continue
-            else:
-                print(f"Stored audio segment in MinIO at path: {minio_path}") 
 
             # Prepare audio segment metadata and index 
             audio_segment_metadata = AudioSegmentMetadata(
@@ -277,27 +315,34 @@ def index_audio_segments(
                 video_id=video_id,
                 start_time=audio_segment["start"], 
                 end_time=audio_segment["end"],
-                duration=audio_segment["end"]-audio_segment["end"], 
+                duration=audio_segment["end"]-audio_segment["start"], 
                 sample_rate=sampling_rate, 
                 transcript=audio_segment["transcript"], 
                 emotion=audio_segment["emotion"],
-                emotion_confidence_score=audio_segment["emotion_confidence_score"]
+                emotion_confidence_score=audio_segment["emotion_confidence_score"],
+                byte_start=byte_range.byte_start if byte_range else None,
+                byte_end=byte_range.byte_end if byte_range else None,
+                byte_range_first_sample=byte_range.first_sample if byte_range else None
             )
 
-            success_indexing = audio_segment_retriever.index_segment(
-                segment_id=segment_id,
-                audio_segment_embedding=audio_segment_clap_embedding,
-                audio_segment_transcript_embedding=audio_segments_transcript_sentence_embedding,
-                metadata=audio_segment_metadata
-            )
+            segment_ids.append(segment_id)
+            audio_embeddings.append(audio_segment_clap_embedding)
+            transcript_embeddings.append(audio_segments_transcript_sentence_embedding)
+            metadata_list.append(audio_segment_metadata)
+
+        success_indexing = audio_segment_retriever.index_segments_batch(
+            segment_ids=segment_ids,
+            audio_segment_embeddings=audio_embeddings,
+            audio_segment_transcript_embeddings=transcript_embeddings,
+            metadata_list=metadata_list
+        )
 
-            if success_indexing:
-                successfully_indexed_count += 1
-                print(f"Successfully indexed audio segment {i + 1} with ID: {segment_id}")
-            else:
-                print(f"Failed to index audio segment {i + 1} with ID: {segment_id}. Skipping.")
+        if success_indexing:
+            print(f"Successfully indexed {len(segment_ids)} audio segments for video_id: {video_id}")
+        else:
+            print(f"Failed to index the audio segments of video_id: {video_id}")
 
-        return True 
+        return success_indexing
     
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -0,0 +1,106 @@
+"""
+Benchmarks the frame sampling engines in `core.utils.video_processor` against the
+original decode-every-frame `cap.read()` loop.
+
+Usage (from the osce-video-grader directory):
+    python -m evals.benchmark_frame_sampling sample_osce_videos/long-osce-recording.mp4 --frame-sample-rate 1 --repeats 3
+"""
+import time
+import argparse
+from typing import List, Callable, Dict
+
+import cv2
+import numpy as np
+
+from core.utils.video_processor import (
+    iter_sampled_frames,
+    get_video_metadata,
+    DEFAULT_FPS
+)
+
+# Frames are decoded and converted but not kept, so that long recordings do not exhaust memory.
+
+def sample_frames_read_all(
+    video_path: str,
+    frame_sample_rate: float
+) -> List[float]:
+    """Baseline: the original loop that decodes and colour-converts with `cap.read()` on every frame."""
+    timestamps = []
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+
+    frame_count = 0
+    last_sampled_time = -1.0
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        current_time_sec = frame_count / fps
+        if current_time_sec >= last_sampled_time + (1.0 / frame_sample_rate):
+            _ = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            timestamps.append(current_time_sec)
+            last_sampled_time = current_time_sec
+        frame_count += 1
+
+    cap.release()
+    return timestamps
+
+def _make_engine(decoder: str) -> Callable[[str, float], List[float]]:
+    def run(video_path: str, frame_sample_rate: float) -> List[float]:
+        return [timestamp for _, timestamp in iter_sampled_frames(video_path, frame_sample_rate, decoder=decoder)]
+    return run
+
+ENGINES: Dict[str, Callable[[str, float], List[float]]] = {
+    "read_all (baseline)": sample_frames_read_all,
+    "opencv grab/retrieve": _make_engine("opencv"),
+    "ffmpeg fps filter": _make_engine("ffmpeg"),
+}
+
+def benchmark(
+    video_path: str,
+    frame_sample_rate: float,
+    repeats: int
+):
+    metadata = get_video_metadata(video_path)
+    print(f"\nVideo: {video_path}")
+    print(f"Metadata: {metadata}")
+    print(f"Sampling at {frame_sample_rate} FPS, {repeats} repeat(s) per engine.\n")
+
+    baseline_timestamps = None
+    baseline_time = None
+
+    print(f"{'Engine':<24} {'Best (s)':>10} {'Mean (s)':>10} {'Frames':>8} {'Speedup':>8} {'Max |dt| (s)':>13}")
+    for engine_name, engine in ENGINES.items():
+        timings = []
+        timestamps = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            timestamps = engine(video_path, frame_sample_rate)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        if baseline_time is None:
+            baseline_time = best
+            baseline_timestamps = timestamps
+
+        num_common = min(len(timestamps), len(baseline_timestamps))
+        max_timestamp_drift = (
+            float(np.max(np.abs(np.array(timestamps[:num_common]) - np.array(baseline_timestamps[:num_common]))))
+            if num_common else float("nan")
+        )
+
+        print(
+            f"{engine_name:<24} {best:>10.2f} {np.mean(timings):>10.2f} {len(timestamps):>8} "
+            f"{baseline_time / best:>7.2f}x {max_timestamp_drift:>13.3f}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark frame sampling engines.")
+    parser.add_argument("video_paths", nargs="+", help="Video files to benchmark (ideally 20-40 min OSCE recordings).")
+    parser.add_argument("--frame-sample-rate", type=float, default=1.0, help="Frames sampled per second.")
+    parser.add_argument("--repeats", type=int, default=1, help="Number of runs per engine.")
+    args = parser.parse_args()
+
+    for path in args.video_paths:
+        benchmark(path, args.frame_sample_rate, args.repeats)
@@ -0,0 +1,167 @@
+"""
+Parity check and throughput benchmark of the inference backends in `core.utils.inference_backends`
+(TorchScript, ONNX Runtime fp32 and ONNX Runtime dynamic int8) against eager fp32 PyTorch on CPU,
+for the ResNet feature extractor, the CLIP image/text encoders and the MiniLM sentence encoder.
+
+Parity is the cosine similarity between each backend's embeddings and the eager fp32 embeddings of the
+same inputs; a backend passes if the minimum similarity is above `--min-cosine-similarity`.
+
+Usage (from the osce-video-grader directory):
+    python -m evals.benchmark_inference_backends --image-dir sample_images/osce --backends torchscript onnx onnx_int8
+"""
+import os
+import time
+import argparse
+from typing import List, Callable, Tuple
+
+import numpy as np
+from PIL import Image
+
+from core.utils.video_processor import (
+    get_resnet_feature_extractor,
+    generate_resnet_embeddings,
+    generate_clip_embeddings,
+    DEFAULT_RESNET_MODEL_NAME
+)
+from core.utils.embedding_utils import (
+    load_clip_model_and_processor,
+    load_sentence_transformer_model,
+    generate_clip_text_embeddings_batch,
+    generate_sentence_embeddings_batch,
+    DEFAULT_CLIP_MODEL_NAME,
+    DEFAULT_SENTENCE_TRANSFORMER_MODEL
+)
+
+SAMPLE_TEXTS = [
+    "The student washes their hands before examining the patient.",
+    "The examiner asks the candidate to explain the procedure.",
+    "The candidate introduces themselves and confirms the patient's identity.",
+    "Auscultation of the chest with a stethoscope.",
+    "The patient is lying on the examination couch.",
+    "The student palpates the abdomen in all four quadrants.",
+    "Measuring blood pressure on the left arm.",
+    "The candidate summarises the findings to the examiner.",
+]
+
+def load_images(image_dir: str, num_images: int) -> List[Image.Image]:
+    image_paths = sorted(
+        os.path.join(image_dir, filename) for filename in os.listdir(image_dir)
+        if filename.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+    images = [Image.open(path).convert("RGB") for path in image_paths]
+    if not images:
+        raise ValueError(f"No images found in {image_dir}")
+
+    # Repeat the sample images to reach the requested batch volume
+    return [images[i % len(images)] for i in range(num_images)]
+
+def time_embedding_fn(fn: Callable[[], np.ndarray], repeats: int) -> Tuple[np.ndarray, float]:
+    embeddings = fn() # Warm-up (also triggers lazy initialisation)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        embeddings = fn()
+        timings.append(time.perf_counter() - start)
+
+    return embeddings, min(timings)
+
+def cosine_similarities(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    return np.sum(reference * candidate, axis=1)
+
+def report(
+    model_label: str,
+    backend: str,
+    reference: np.ndarray,
+    candidate: np.ndarray,
+    reference_time: float,
+    candidate_time: float,
+    num_items: int,
+    min_cosine_similarity: float
+) -> bool:
+    similarities = cosine_similarities(reference, candidate)
+    passed = bool(similarities.min() >= min_cosine_similarity)
+    print(
+        f"{model_label:<14} {backend:<12} {num_items / candidate_time:>10.1f} {reference_time / candidate_time:>8.2f}x "
+        f"{similarities.mean():>10.5f} {similarities.min():>10.5f}  {'PASS' if passed else 'FAIL'}"
+    )
+    return passed
+
+def benchmark(
+    image_dir: str,
+    backends: List[str],
+    num_images: int,
+    batch_size: int,
+    repeats: int,
+    min_cosine_similarity: float
+) -> bool:
+    device = "cpu"
+    images = load_images(image_dir, num_images)
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(num_images)]
+    all_passed = True
+
+    resnet_model, resnet_transform = get_resnet_feature_extractor(DEFAULT_RESNET_MODEL_NAME, device=device)
+    clip_model, clip_processor = load_clip_model_and_processor(DEFAULT_CLIP_MODEL_NAME, device=device)
+    sentence_model = load_sentence_transformer_model(DEFAULT_SENTENCE_TRANSFORMER_MODEL)
+
+    def resnet_fn(model):
+        return lambda: generate_resnet_embeddings(images, model, resnet_transform, device, batch_size)
+
+    def clip_image_fn(model):
+        return lambda: generate_clip_embeddings(images, model, clip_processor, device, batch_size)
+
+    def clip_text_fn(model):
+        return lambda: generate_clip_text_embeddings_batch(texts, model, clip_processor, device, batch_size)
+
+    def sentence_fn(model):
+        return lambda: generate_sentence_embeddings_batch(texts, model, batch_size)
+
+    reference_results = {
+        "resnet": time_embedding_fn(resnet_fn(resnet_model), repeats),
+        "clip image": time_embedding_fn(clip_image_fn(clip_model), repeats),
+        "clip text": time_embedding_fn(clip_text_fn(clip_model), repeats),
+        "minilm": time_embedding_fn(sentence_fn(sentence_model), repeats),
+    }
+
+    print(f"\n{num_images} inputs, batch size {batch_size}, best of {repeats} run(s), reference: eager fp32 PyTorch (CPU).")
+    print(f"{'Model':<14} {'Backend':<12} {'Items/s':>10} {'Speedup':>9} {'Mean cos':>10} {'Min cos':>10}  Parity")
+    for model_label, (_, reference_time) in reference_results.items():
+        print(f"{model_label:<14} {'torch':<12} {num_images / reference_time:>10.1f} {1.0:>8.2f}x")
+
+    for backend in backends:
+        backend_resnet_model, _ = get_resnet_feature_extractor(DEFAULT_RESNET_MODEL_NAME, device=device, backend=backend)
+        backend_clip_model, _ = load_clip_model_and_processor(DEFAULT_CLIP_MODEL_NAME, device=device, backend=backend)
+        backend_sentence_model = load_sentence_transformer_model(DEFAULT_SENTENCE_TRANSFORMER_MODEL, backend=backend)
+
+        backend_fns = {
+            "resnet": resnet_fn(backend_resnet_model),
+            "clip image": clip_image_fn(backend_clip_model),
+            "clip text": clip_text_fn(backend_clip_model),
+            "minilm": sentence_fn(backend_sentence_model),
+        }
+
+        for model_label, fn in backend_fns.items():
+            reference_embeddings, reference_time = reference_results[model_label]
+            embeddings, elapsed = time_embedding_fn(fn, repeats)
+            all_passed &= report(
+                model_label, backend, reference_embeddings, embeddings,
+                reference_time, elapsed, num_images, min_cosine_similarity
+            )
+
+    return all_passed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parity check and benchmark of the exported inference backends.")
+    parser.add_argument("--image-dir", default=os.path.join("sample_images", "osce"), help="Directory of sample frames.")
+    parser.add_argument("--backends", nargs="+", default=["torchscript", "onnx", "onnx_int8"], help="Backends to compare against eager PyTorch.")
+    parser.add_argument("--num-images", type=int, default=128, help="Number of images/texts embedded per run.")
+    parser.add_argument("--batch-size", type=int, default=32, help="Batch size.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of timed runs per backend.")
+    parser.add_argument("--min-cosine-similarity", type=float, default=0.98, help="Parity threshold (per embedding).")
+    args = parser.parse_args()
+
+    passed = benchmark(
+        args.image_dir, args.backends, args.num_images, args.batch_size, args.repeats, args.min_cosine_similarity
+    )
+    exit(0 if passed else 1)
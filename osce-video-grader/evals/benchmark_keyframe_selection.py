@@ -0,0 +1,117 @@
+"""
+Benchmarks the keyframe selectors in `core.utils.keyframe_selection` against the original
+KMeans + per-cluster `euclidean_distances` loop, on synthetic "video-like" embeddings
+(piecewise-constant scenes with noise, L2-normalized) of 1k-10k candidate frames.
+
+Quality is reported as the mean distance of every candidate frame to its nearest selected
+keyframe (lower means the keyframes cover the video better).
+
+Usage (from the osce-video-grader directory):
+    python -m evals.benchmark_keyframe_selection --num-candidates 1000 5000 10000 --dims 512 2048 --num-keyframes 20
+"""
+import time
+import argparse
+from typing import List, Callable, Dict
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics.pairwise import euclidean_distances
+
+from core.utils.keyframe_selection import select_keyframe_indices_with_selector
+
+def select_by_kmeans_loop(
+    embeddings_np: np.ndarray,
+    num_keyframes: int
+) -> List[int]:
+    """Baseline: the original full KMeans followed by a Python loop over clusters."""
+    kmeans = KMeans(n_clusters=num_keyframes, random_state=0, n_init='auto')
+    cluster_labels = kmeans.fit_predict(embeddings_np)
+
+    selected_indices = set()
+    for i in range(num_keyframes):
+        member_indices = np.where(cluster_labels == i)[0]
+        if len(member_indices) == 0:
+            continue
+        distances = euclidean_distances(embeddings_np[member_indices], kmeans.cluster_centers_[i].reshape(1, -1))
+        selected_indices.add(int(member_indices[np.argmin(distances)]))
+
+    return sorted(selected_indices)
+
+def _make_selector(selector: str, **kwargs) -> Callable[[np.ndarray, int], List[int]]:
+    def run(embeddings_np: np.ndarray, num_keyframes: int) -> List[int]:
+        return select_keyframe_indices_with_selector(embeddings_np, num_keyframes, selector=selector, **kwargs)
+    return run
+
+SELECTORS: Dict[str, Callable[[np.ndarray, int], List[int]]] = {
+    "kmeans loop (baseline)": select_by_kmeans_loop,
+    "kmeans": _make_selector("kmeans"),
+    "kmeans + pca64": _make_selector("kmeans", pca_components=64),
+    "minibatch_kmeans": _make_selector("minibatch_kmeans"),
+    "minibatch + pca64": _make_selector("minibatch_kmeans", pca_components=64),
+    "temporal_segmentation": _make_selector("temporal_segmentation"),
+}
+
+def generate_video_like_embeddings(
+    num_frames: int,
+    dim: int,
+    num_scenes: int,
+    noise: float = 0.3,
+    seed: int = 0
+) -> np.ndarray:
+    """Generates time-ordered embeddings made of `num_scenes` contiguous scenes (some scenes recur)."""
+    rng = np.random.default_rng(seed)
+    scene_centers = rng.normal(size=(max(num_scenes // 2, 1), dim))
+    scene_lengths = rng.multinomial(num_frames - num_scenes, np.ones(num_scenes) / num_scenes) + 1
+    scene_ids = rng.integers(0, len(scene_centers), size=num_scenes)
+
+    embeddings_np = np.repeat(scene_centers[scene_ids], scene_lengths, axis=0)
+    embeddings_np = embeddings_np + noise * rng.normal(size=embeddings_np.shape)
+    return (embeddings_np / np.linalg.norm(embeddings_np, axis=1, keepdims=True)).astype(np.float32)
+
+def coverage_error(
+    embeddings_np: np.ndarray,
+    selected_indices: List[int]
+) -> float:
+    """Mean distance of each frame to its nearest selected keyframe."""
+    return float(euclidean_distances(embeddings_np, embeddings_np[selected_indices]).min(axis=1).mean())
+
+def benchmark(
+    num_candidates: int,
+    dim: int,
+    num_keyframes: int,
+    repeats: int
+):
+    embeddings_np = generate_video_like_embeddings(num_candidates, dim, num_scenes=max(num_keyframes * 2, 1))
+    print(f"\nCandidates: {num_candidates}, dim: {dim}, keyframes: {num_keyframes}, {repeats} repeat(s) per selector.")
+    print(f"{'Selector':<24} {'Best (s)':>10} {'Mean (s)':>10} {'Selected':>9} {'Speedup':>8} {'Coverage err':>13}")
+
+    baseline_time = None
+    for selector_name, selector in SELECTORS.items():
+        timings = []
+        selected_indices = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            selected_indices = selector(embeddings_np, num_keyframes)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        if baseline_time is None:
+            baseline_time = best
+
+        print(
+            f"{selector_name:<24} {best:>10.3f} {np.mean(timings):>10.3f} {len(selected_indices):>9} "
+            f"{baseline_time / best:>7.2f}x {coverage_error(embeddings_np, selected_indices):>13.4f}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark keyframe selectors.")
+    parser.add_argument("--num-candidates", type=int, nargs="+", default=[1000, 5000, 10000], help="Numbers of candidate frames.")
+    parser.add_argument("--dims", type=int, nargs="+", default=[512, 2048], help="Embedding dimensions (512: CLIP/ResNet34, 2048: ResNet50).")
+    parser.add_argument("--num-keyframes", type=int, default=20, help="Number of keyframes to select.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of runs per selector.")
+    args = parser.parse_args()
+
+    for num_candidates in args.num_candidates:
+        for dim in args.dims:
+            benchmark(num_candidates, dim, args.num_keyframes, args.repeats)
@@ -0,0 +1,94 @@
+"""
+Benchmarks the word-to-speaker alignment of `core.utils.audio_processor.transcribe_and_diarize`:
+the sorted interval join (`align_words_to_speakers`) against the original per-word pandas mask,
+on synthetic transcripts (words) and diarization output (speaker turns, optionally overlapping).
+
+Agreement is the fraction of words given the same speaker by both methods. They differ only for
+words straddling a turn boundary or a gap, which the interval join assigns by largest overlap.
+
+Usage (from the osce-video-grader directory):
+    python -m evals.benchmark_speaker_alignment --num-words 1000 5000 20000 --words-per-turn 10
+"""
+import time
+import argparse
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.utils.audio_processor import align_words_to_speakers, UNKNOWN_SPEAKER
+
+def align_words_with_dataframe_mask(
+    word_starts: np.ndarray,
+    word_ends: np.ndarray,
+    speaker_df: pd.DataFrame
+) -> List[str]:
+    """Baseline: the original per-word boolean mask over a DataFrame of speaker turns (midpoint containment)."""
+    word_speakers = []
+    for start, end in zip(word_starts, word_ends):
+        word_midpoint = start + (end - start) / 2
+        speaker = speaker_df[(speaker_df['start'] <= word_midpoint) & (speaker_df['end'] >= word_midpoint)]
+        word_speakers.append(speaker.iloc[0]['speaker'] if not speaker.empty else UNKNOWN_SPEAKER)
+
+    return word_speakers
+
+def generate_conversation(
+    num_words: int,
+    words_per_turn: int,
+    overlap_seconds: float,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """Generates ~0.35 s words in alternating two-speaker turns, with short pauses and optional cross-talk."""
+    rng = np.random.default_rng(seed)
+    word_durations = rng.uniform(0.15, 0.5, num_words)
+    pauses = rng.exponential(0.08, num_words)
+    word_starts = np.cumsum(word_durations + pauses) - word_durations
+    word_ends = word_starts + word_durations
+
+    num_turns = int(np.ceil(num_words / words_per_turn))
+    first_words = np.arange(num_turns) * words_per_turn
+    last_words = np.minimum(first_words + words_per_turn, num_words) - 1
+    turn_starts = word_starts[first_words] - overlap_seconds
+    turn_ends = word_ends[last_words] + overlap_seconds
+    turn_speakers = [f"SPEAKER_{i % 2:02d}" for i in range(num_turns)]
+
+    return word_starts, word_ends, turn_starts, turn_ends, turn_speakers
+
+def benchmark(
+    num_words: int,
+    words_per_turn: int,
+    overlap_seconds: float,
+    repeats: int
+):
+    word_starts, word_ends, turn_starts, turn_ends, turn_speakers = generate_conversation(num_words, words_per_turn, overlap_seconds)
+    speaker_df = pd.DataFrame({"start": turn_starts, "end": turn_ends, "speaker": turn_speakers})
+
+    timings = {"dataframe mask (baseline)": [], "interval join": []}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        baseline_speakers = align_words_with_dataframe_mask(word_starts, word_ends, speaker_df)
+        timings["dataframe mask (baseline)"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        joined_speakers = align_words_to_speakers(word_starts, word_ends, turn_starts, turn_ends, turn_speakers)
+        timings["interval join"].append(time.perf_counter() - start)
+
+    agreement = float(np.mean(np.asarray(baseline_speakers, dtype=object) == joined_speakers))
+    baseline_time = min(timings["dataframe mask (baseline)"])
+
+    print(f"\nWords: {num_words}, turns: {len(turn_starts)}, turn overlap: {overlap_seconds}s, {repeats} repeat(s).")
+    print(f"{'Method':<28} {'Best (s)':>10} {'Speedup':>8}")
+    for method, method_timings in timings.items():
+        print(f"{method:<28} {min(method_timings):>10.4f} {baseline_time / min(method_timings):>7.1f}x")
+    print(f"Agreement: {agreement:.4f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark word-to-speaker alignment.")
+    parser.add_argument("--num-words", type=int, nargs="+", default=[1000, 5000, 20000], help="Numbers of transcribed words.")
+    parser.add_argument("--words-per-turn", type=int, default=10, help="Average number of words per speaker turn.")
+    parser.add_argument("--overlap-seconds", type=float, default=0.2, help="Cross-talk between consecutive turns.")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of runs per method.")
+    args = parser.parse_args()
+
+    for num_words in args.num_words:
+        benchmark(num_words, args.words_per_turn, args.overlap_seconds, args.repeats)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tests import `core` and `backend` as top-level packages, as the application does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
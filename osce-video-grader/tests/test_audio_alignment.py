@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+audio_processor = pytest.importorskip("core.utils.audio_processor")
+align_words_to_speakers = audio_processor.align_words_to_speakers
+group_words_into_segments = audio_processor.group_words_into_segments
+UNKNOWN_SPEAKER = audio_processor.UNKNOWN_SPEAKER
+
+def align_by_brute_force(word_starts, word_ends, turn_starts, turn_ends, turn_speakers):
+    """Reference O(words x turns) join: largest overlap (earliest turn on ties), else the turn containing the midpoint."""
+    order = np.argsort(turn_starts, kind="stable")
+    turn_starts, turn_ends = np.asarray(turn_starts)[order], np.asarray(turn_ends)[order]
+    turn_speakers = np.asarray(turn_speakers, dtype=object)[order]
+
+    word_speakers = []
+    for word_start, word_end in zip(word_starts, word_ends):
+        overlaps = np.minimum(turn_ends, word_end) - np.maximum(turn_starts, word_start)
+        if overlaps.max() > 0:
+            word_speakers.append(turn_speakers[np.argmax(overlaps)])
+            continue
+
+        midpoint = word_start + (word_end - word_start) / 2
+        containing_turns = np.flatnonzero((turn_starts <= midpoint) & (turn_ends >= midpoint))
+        word_speakers.append(turn_speakers[containing_turns[0]] if len(containing_turns) else UNKNOWN_SPEAKER)
+
+    return np.array(word_speakers, dtype=object)
+
+def test_word_gets_the_speaker_it_overlaps_the_most():
+    word_speakers = align_words_to_speakers(
+        word_starts=[0.0, 1.8, 4.0],
+        word_ends=[0.5, 2.4, 4.5],
+        turn_starts=[2.0, 0.0],
+        turn_ends=[5.0, 2.1],
+        turn_speakers=["B", "A"]
+    )
+
+    assert word_speakers.tolist() == ["A", "B", "B"]
+
+def test_ties_go_to_the_earliest_turn():
+    word_speakers = align_words_to_speakers([1.0], [2.0], [0.0, 1.5], [1.5, 3.0], ["A", "B"])
+
+    assert word_speakers.tolist() == ["A"]
+
+def test_words_without_overlap_fall_back_to_the_midpoint_or_unknown():
+    word_speakers = align_words_to_speakers(
+        word_starts=[1.0, 10.0],
+        word_ends=[1.0, 10.5], # A zero-length word inside a turn, and a word after every turn
+        turn_starts=[0.0],
+        turn_ends=[2.0],
+        turn_speakers=["A"]
+    )
+
+    assert word_speakers.tolist() == ["A", UNKNOWN_SPEAKER]
+
+def test_empty_inputs():
+    assert align_words_to_speakers([], [], [0.0], [1.0], ["A"]).tolist() == []
+    assert align_words_to_speakers([0.0], [1.0], [], [], []).tolist() == [UNKNOWN_SPEAKER]
+
+def test_long_turn_does_not_hide_the_short_turns_inside_it():
+    # A whole-recording turn (e.g. background speech) with short interjections inside it
+    rng = np.random.default_rng(0)
+    short_turn_starts = np.sort(rng.uniform(0, 3600, 2000))
+    turn_starts = np.append(0.0, short_turn_starts)
+    turn_ends = np.append(3600.0, short_turn_starts + rng.uniform(0.5, 3.0, 2000))
+    turn_speakers = ["LONG"] + [f"S{i % 3}" for i in range(2000)]
+    word_starts = np.sort(rng.uniform(0, 3600, 5000))
+    word_ends = word_starts + 0.3
+
+    expected = align_by_brute_force(word_starts, word_ends, turn_starts, turn_ends, turn_speakers)
+
+    np.testing.assert_array_equal(
+        align_words_to_speakers(word_starts, word_ends, turn_starts, turn_ends, turn_speakers), expected
+    )
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_the_brute_force_join(seed):
+    rng = np.random.default_rng(seed)
+    num_turns, num_words = rng.integers(1, 40), rng.integers(1, 80)
+
+    # Rounded times produce ties, and some zero-length turns and words
+    turn_starts = np.round(rng.uniform(0, 60, num_turns), 1)
+    turn_ends = turn_starts + np.round(rng.exponential(3, num_turns), 1) * (rng.random(num_turns) > 0.1)
+    word_starts = np.round(rng.uniform(-2, 65, num_words), 1)
+    word_ends = word_starts + np.round(rng.exponential(0.4, num_words), 1) * (rng.random(num_words) > 0.2)
+    turn_speakers = [f"S{i % 3}" for i in range(num_turns)]
+
+    np.testing.assert_array_equal(
+        align_words_to_speakers(word_starts, word_ends, turn_starts, turn_ends, turn_speakers),
+        align_by_brute_force(word_starts, word_ends, turn_starts, turn_ends, turn_speakers)
+    )
+
+def test_group_words_into_segments():
+    words = [
+        {"start": 0.0, "end": 0.4, "text": "Hello"},
+        {"start": 0.5, "end": 0.9, "text": "there."},
+        {"start": 1.2, "end": 1.6, "text": "Hi."},
+    ]
+
+    segments = group_words_into_segments(words, np.array(["A", "A", "B"], dtype=object))
+
+    assert segments == [
+        {"start": 0.0, "end": 0.9, "text": "Hello there. ", "speaker": "A"},
+        {"start": 1.2, "end": 1.6, "text": "Hi. ", "speaker": "B"},
+    ]
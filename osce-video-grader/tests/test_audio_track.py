@@ -0,0 +1,84 @@
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from core.utils.audio_track import (
+    STREAMINFO_HEADER_SIZE,
+    decode_flac_range,
+    encode_flac_track,
+    encode_flac_track_file,
+    index_flac_frames
+)
+
+SAMPLING_RATE = 16000
+
+@pytest.fixture(scope="module")
+def waveform() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(SAMPLING_RATE * 7) / SAMPLING_RATE # 7 s: dozens of FLAC frames
+    return (0.5 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.normal(size=t.shape)).astype(np.float32)
+
+@pytest.fixture(scope="module")
+def flac_track(waveform):
+    data, track_index = encode_flac_track(waveform, SAMPLING_RATE)
+    decoded_waveform, _ = sf.read(io.BytesIO(data), dtype="float32") # The 16-bit quantized reference
+    return data, track_index, decoded_waveform
+
+def test_frame_index_covers_the_whole_track(waveform, flac_track):
+    data, track_index, _ = flac_track
+
+    assert track_index.num_frames > 10
+    assert track_index.frame_sample_offsets[0] == 0
+    assert track_index.frame_sample_offsets[-1] == len(waveform)
+    assert np.all(np.diff(track_index.frame_sample_offsets) > 0)
+    assert track_index.frame_byte_offsets[0] > STREAMINFO_HEADER_SIZE
+    assert track_index.frame_byte_offsets[-1] == len(data)
+    assert np.all(np.diff(track_index.frame_byte_offsets) > 0)
+
+    # Every indexed offset is a frame sync code
+    for offset in track_index.frame_byte_offsets[:-1].tolist():
+        assert data[offset] == 0xFF and data[offset + 1] & 0xFE == 0xF8
+
+@pytest.mark.parametrize("start_time, end_time", [
+    (0.0, 0.5),
+    (1.234, 2.5),
+    (2.0, 2.0001),
+    (3.3, 7.0),
+    (0.0, 7.0),
+])
+def test_decoded_byte_range_matches_the_full_decode(flac_track, start_time, end_time):
+    data, track_index, decoded_waveform = flac_track
+    byte_range = track_index.byte_range(start_time, end_time)
+
+    segment, sampling_rate = decode_flac_range(
+        data[:STREAMINFO_HEADER_SIZE], data[byte_range.byte_start:byte_range.byte_end], byte_range
+    )
+
+    assert sampling_rate == SAMPLING_RATE
+    np.testing.assert_array_equal(segment, decoded_waveform[byte_range.start_sample:byte_range.end_sample])
+
+def test_byte_range_is_made_of_whole_frames(flac_track):
+    _, track_index, _ = flac_track
+    byte_range = track_index.byte_range(1.0, 1.5)
+
+    assert byte_range.byte_start in track_index.frame_byte_offsets
+    assert byte_range.byte_end in track_index.frame_byte_offsets
+    assert byte_range.first_sample <= byte_range.start_sample < byte_range.end_sample
+
+def test_file_encoding_produces_the_same_index(waveform, flac_track, tmp_path):
+    data, track_index, _ = flac_track
+
+    file_track_index = encode_flac_track_file(waveform, SAMPLING_RATE, str(tmp_path / "track.flac"))
+
+    assert (tmp_path / "track.flac").read_bytes() == data
+    np.testing.assert_array_equal(file_track_index.frame_byte_offsets, track_index.frame_byte_offsets)
+    np.testing.assert_array_equal(file_track_index.frame_sample_offsets, track_index.frame_sample_offsets)
+
+def test_non_flac_data_is_rejected():
+    with pytest.raises(ValueError, match="Not a FLAC stream"):
+        index_flac_frames(b"RIFF" + b"\x00" * 64, SAMPLING_RATE)
+
+    with pytest.raises(ValueError, match="Invalid FLAC STREAMINFO header"):
+        decode_flac_range(b"RIFF" + b"\x00" * 38, b"", None)
@@ -0,0 +1,125 @@
+"""
+Parity of the exported inference backends with eager PyTorch, on small randomly initialized models of the same
+architectures as the production ResNet, CLIP and MiniLM encoders (no weights are downloaded).
+"""
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+torchvision = pytest.importorskip("torchvision")
+transformers = pytest.importorskip("transformers")
+sentence_transformers = pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from core.config.config import settings
+from core.utils.inference_backends import wrap_clip_model, wrap_image_encoder, wrap_sentence_transformer
+
+EXPORTED_BACKENDS = ["torchscript", "onnx", "onnx_int8"]
+MIN_COSINE_SIMILARITY = 0.98
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.inference, "export_dir", str(tmp_path / "exports"))
+
+def as_numpy(features) -> np.ndarray:
+    if isinstance(features, torch.Tensor):
+        features = features.detach().cpu().numpy()
+    return np.asarray(features, dtype=np.float64).reshape(len(features), -1)
+
+def assert_parity(reference, actual):
+    reference, actual = as_numpy(reference), as_numpy(actual)
+    assert reference.shape == actual.shape
+
+    cosine_similarities = (reference * actual).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(actual, axis=1)
+    )
+    assert cosine_similarities.min() >= MIN_COSINE_SIMILARITY, cosine_similarities
+
+def make_resnet():
+    """Headless ResNet-18, as returned by `get_resnet_feature_extractor`."""
+    torch.manual_seed(0)
+    model = torchvision.models.resnet18(weights=None)
+    model.fc = torch.nn.Identity()
+    return model.eval()
+
+def make_clip_model():
+    torch.manual_seed(0)
+    config = transformers.CLIPConfig(
+        text_config={
+            "vocab_size": 1000, "hidden_size": 64, "intermediate_size": 128,
+            "num_attention_heads": 4, "num_hidden_layers": 2, "max_position_embeddings": 77
+        },
+        vision_config={
+            "hidden_size": 64, "intermediate_size": 128, "num_attention_heads": 4,
+            "num_hidden_layers": 2, "image_size": 224, "patch_size": 32
+        },
+        projection_dim=32
+    )
+    return transformers.CLIPModel(config).eval()
+
+def make_sentence_transformer(model_dir):
+    """A tiny BERT with mean pooling and normalization: the same structure as all-MiniLM-L6-v2."""
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + (
+        "the doctor asks patient about chest pain and breathing then washes both hands before examination"
+    ).split()
+    model_dir.mkdir()
+    (model_dir / "vocab.txt").write_text("\n".join(vocab) + "\n")
+    transformers.BertTokenizer(str(model_dir / "vocab.txt")).save_pretrained(str(model_dir))
+
+    torch.manual_seed(0)
+    bert_config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=4,
+        intermediate_size=128, max_position_embeddings=64
+    )
+    transformers.BertModel(bert_config).save_pretrained(str(model_dir))
+
+    transformer = sentence_transformers.models.Transformer(str(model_dir), max_seq_length=32)
+    pooling = sentence_transformers.models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode="mean")
+    return sentence_transformers.SentenceTransformer(
+        modules=[transformer, pooling, sentence_transformers.models.Normalize()], device="cpu"
+    )
+
+@pytest.mark.parametrize("backend", EXPORTED_BACKENDS)
+def test_resnet_backend_parity(backend):
+    model = make_resnet()
+    pixel_values = torch.randn(4, 3, 224, 224)
+    with torch.no_grad():
+        reference = model(pixel_values)
+
+    wrapped_model = wrap_image_encoder(model, f"resnet18-{backend}", backend)
+
+    assert_parity(reference, wrapped_model(pixel_values))
+
+@pytest.mark.parametrize("backend", EXPORTED_BACKENDS)
+def test_clip_backend_parity(backend):
+    model = make_clip_model()
+    pixel_values = torch.randn(3, 3, 224, 224)
+    input_ids = torch.randint(0, 1000, (3, 12))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[0, 8:] = 0 # A padded sequence
+    with torch.no_grad():
+        reference_image_features = model.get_image_features(pixel_values=pixel_values)
+        reference_text_features = model.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+
+    wrapped_model = wrap_clip_model(model, f"clip-{backend}", backend)
+
+    assert_parity(reference_image_features, wrapped_model.get_image_features(pixel_values=pixel_values))
+    assert_parity(
+        reference_text_features,
+        wrapped_model.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+    )
+
+@pytest.mark.parametrize("backend", EXPORTED_BACKENDS)
+def test_sentence_transformer_backend_parity(backend, tmp_path):
+    model = make_sentence_transformer(tmp_path / "tiny-minilm")
+    sentences = [
+        "the doctor washes both hands",
+        "the doctor asks the patient about chest pain before examination",
+        "breathing",
+    ]
+    reference = model.encode(sentences, convert_to_numpy=True)
+
+    wrapped_model = wrap_sentence_transformer(model, f"minilm-{backend}", backend)
+
+    assert_parity(reference, wrapped_model.encode(sentences, batch_size=2))
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from core.utils.keyframe_selection import (
+    closest_to_centroids,
+    select_by_kmeans,
+    select_by_temporal_segmentation,
+    select_keyframe_indices_with_selector
+)
+
+def make_blobs(num_blobs: int, frames_per_blob: int, dim: int = 16, seed: int = 0):
+    """Time-ordered embeddings: `num_blobs` well-separated shots of `frames_per_blob` frames each."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(num_blobs, dim)) * 10
+    return np.repeat(centers, frames_per_blob, axis=0) + rng.normal(scale=0.1, size=(num_blobs * frames_per_blob, dim))
+
+def test_closest_to_centroids_picks_the_closest_member_of_each_cluster():
+    distances = np.array([
+        [0.5, 9.0, 9.0],
+        [0.1, 9.0, 9.0],
+        [9.0, 0.2, 0.3],
+        [9.0, 0.4, 0.1],
+    ])
+    labels = np.array([0, 0, 1, 1])
+
+    # Frame 3 is closer to centroid 2, but it is not a member of cluster 2: cluster 2 is empty and skipped
+    assert closest_to_centroids(distances, labels) == [1, 2]
+
+def test_closest_to_centroids_matches_a_per_cluster_loop():
+    rng = np.random.default_rng(1)
+    distances = rng.random((200, 12))
+    labels = rng.integers(0, 12, 200)
+
+    expected = sorted({
+        int(np.flatnonzero(labels == k)[np.argmin(distances[labels == k, k])])
+        for k in range(12) if (labels == k).any()
+    })
+    assert closest_to_centroids(distances, labels) == expected
+
+@pytest.mark.parametrize("use_minibatch", [False, True])
+def test_kmeans_selects_one_frame_per_shot(use_minibatch):
+    embeddings = make_blobs(num_blobs=5, frames_per_blob=40)
+
+    selected = select_by_kmeans(embeddings, 5, use_minibatch=use_minibatch, pca_components=8)
+
+    assert selected == sorted(selected)
+    assert sorted(index // 40 for index in selected) == [0, 1, 2, 3, 4]
+
+def test_temporal_segmentation_selects_one_frame_per_contiguous_shot():
+    embeddings = make_blobs(num_blobs=4, frames_per_blob=25)
+
+    selected = select_by_temporal_segmentation(embeddings, 4)
+
+    assert [index // 25 for index in selected] == [0, 1, 2, 3]
+
+def test_temporal_segmentation_with_a_single_segment():
+    embeddings = make_blobs(num_blobs=1, frames_per_blob=10)
+
+    assert len(select_by_temporal_segmentation(embeddings, 1)) == 1
+
+@pytest.mark.parametrize("selector", ["auto", "kmeans", "minibatch_kmeans", "temporal_segmentation"])
+def test_every_selector_returns_sorted_unique_indices(selector):
+    embeddings = make_blobs(num_blobs=6, frames_per_blob=20)
+
+    selected = select_keyframe_indices_with_selector(embeddings, 6, selector)
+
+    assert selected == sorted(set(selected))
+    assert len(selected) == 6
+    assert all(0 <= index < len(embeddings) for index in selected)
+
+def test_unknown_selector_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported keyframe selector"):
+        select_keyframe_indices_with_selector(make_blobs(2, 5), 2, "dbscan")
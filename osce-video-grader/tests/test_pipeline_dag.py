@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from core.pipeline.dag import PipelineDAG, Stage, StageSkipped, StageStatus, StageTimeoutError
+
+class DictCheckpoint:
+    def __init__(self):
+        self.values = {}
+
+    def has(self, key):
+        return key in self.values
+
+    def load(self, key):
+        return self.values[key]
+
+    def save(self, key, value):
+        self.values[key] = value
+
+def test_stages_run_after_their_dependencies():
+    order = []
+    lock = threading.Lock()
+
+    def record(name, value):
+        with lock:
+            order.append(name)
+        return value
+
+    dag = PipelineDAG([
+        Stage("combine", lambda left, right: record("combine", left + right), inputs=["left", "right"], outputs=["total"]),
+        Stage("left", lambda x: record("left", x + 1), inputs=["x"], outputs=["left"]),
+        Stage("right", lambda x: record("right", x * 10), inputs=["x"], outputs=["right"]),
+    ])
+
+    values = dag.run({"x": 2})
+
+    assert values["total"] == 23
+    assert order[-1] == "combine"
+    assert set(order[:2]) == {"left", "right"}
+
+def test_independent_branches_run_concurrently():
+    # Each branch waits for the other one to start: this only completes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(x):
+        barrier.wait()
+        return x
+
+    dag = PipelineDAG([
+        Stage("a", branch, inputs=["x"], outputs=["a"]),
+        Stage("b", branch, inputs=["x"], outputs=["b"]),
+    ])
+
+    assert dag.run({"x": 1}) == {"x": 1, "a": 1, "b": 1}
+
+def test_skipped_stage_skips_its_dependents_only():
+    def skip(x):
+        raise StageSkipped("nothing to do")
+
+    updates = []
+    dag = PipelineDAG([
+        Stage("skipped", skip, inputs=["x"], outputs=["y"]),
+        Stage("dependent", lambda y: y, inputs=["y"], outputs=["z"]),
+        Stage("optional", lambda x, y: (x, y), inputs=["x"], optional_inputs=["y"], outputs=["w"]),
+    ])
+
+    values = dag.run({"x": 1}, on_stage_update=lambda stage, stage_status: updates.append((stage, stage_status)))
+
+    assert values["y"] is None and values["z"] is None
+    assert values["w"] == (1, None)
+    assert ("dependent", StageStatus.SKIPPED) in updates
+    assert ("optional", StageStatus.COMPLETED) in updates
+
+def test_failed_attempts_are_retried():
+    calls = []
+
+    def flaky(x):
+        calls.append(x)
+        if len(calls) < 3:
+            raise RuntimeError("transient")
+        return x
+
+    dag = PipelineDAG([Stage("flaky", flaky, inputs=["x"], outputs=["y"], max_retries=2, retry_backoff_seconds=0.0)])
+
+    assert dag.run({"x": 1})["y"] == 1
+    assert len(calls) == 3
+
+def test_failure_after_the_last_retry_is_raised():
+    def failing(x):
+        raise RuntimeError("permanent")
+
+    dag = PipelineDAG([
+        Stage("failing", failing, inputs=["x"], outputs=["y"], max_retries=1, retry_backoff_seconds=0.0),
+        Stage("dependent", lambda y: y, inputs=["y"], outputs=["z"]),
+    ])
+
+    with pytest.raises(RuntimeError, match="permanent"):
+        dag.run({"x": 1})
+
+def test_timed_out_attempt_is_not_retried():
+    release = threading.Event()
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        release.wait(5)
+        return x
+
+    dag = PipelineDAG([
+        Stage("slow", slow, inputs=["x"], outputs=["y"], timeout_seconds=0.1, max_retries=2, retry_backoff_seconds=0.0)
+    ])
+
+    try:
+        with pytest.raises(StageTimeoutError):
+            dag.run({"x": 1})
+        assert len(calls) == 1
+    finally:
+        release.set()
+
+def test_timed_out_attempt_holds_its_concurrency_slot_until_it_returns():
+    release = threading.Event()
+    dag = PipelineDAG([Stage("slow", lambda x: release.wait(5), inputs=["x"], outputs=["y"], max_concurrency=1, timeout_seconds=0.1)])
+    stage = dag.stages["slow"]
+
+    with pytest.raises(StageTimeoutError) as exc_info:
+        dag.run({"x": 1})
+
+    assert not stage._semaphore.acquire(blocking=False)
+
+    release.set()
+    exc_info.value.attempt.result(timeout=5)
+    deadline = time.time() + 5
+    while not stage._semaphore.acquire(blocking=False):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    stage._semaphore.release()
+
+def test_checkpointed_outputs_are_loaded_instead_of_recomputed():
+    calls = []
+
+    def compute(x):
+        calls.append(x)
+        return x * 2
+
+    dag = PipelineDAG([Stage("double", compute, inputs=["x"], outputs=["y"])])
+    checkpoint = DictCheckpoint()
+
+    assert dag.run({"x": 3}, checkpoint=checkpoint)["y"] == 6
+    assert dag.run({"x": 3}, checkpoint=checkpoint)["y"] == 6
+    assert len(calls) == 1
+
+def test_invalid_pipelines_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineDAG([
+            Stage("a", lambda b: b, inputs=["b"], outputs=["a"]),
+            Stage("b", lambda a: a, inputs=["a"], outputs=["b"]),
+        ])
+
+    with pytest.raises(ValueError, match="produced by both"):
+        PipelineDAG([
+            Stage("a", lambda: 1, outputs=["x"]),
+            Stage("b", lambda: 2, outputs=["x"]),
+        ])
+
+    with pytest.raises(ValueError, match="Missing pipeline inputs"):
+        PipelineDAG([Stage("a", lambda x: x, inputs=["x"], outputs=["y"])]).run({})